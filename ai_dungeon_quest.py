@@ -6,6 +6,12 @@ AI Dungeon Quest - Text-based adventure game with branching choices
 import pygame
 import sys
 import textwrap
+from array import array
+
+from dungeon_save import RunHistory, decode_inventory, encode_inventory, load_run, save_run, slot_path
+from dungeon_story import DEFAULT_STORY, Scene, load_story
+from story_generator import ScenePrefetcher, TemplateGenerator
+from text_cache import render_text
 
 pygame.init()
 
@@ -20,124 +26,191 @@ RED = (200, 0, 0)
 GRAY = (100, 100, 100)
 LIGHT_GRAY = (230, 230, 230)
 
+SAVE_SLOTS = 3
+
+# Shown while a generated scene is still being written
+PLACEHOLDER_SCENE = Scene(-1, "__generating__", "The path ahead is still taking shape...", [], array("i"))
+
 class AIDungeonQuest:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None, story_path=DEFAULT_STORY, generator=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("AI Dungeon Quest")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 36)
         self.font_medium = pygame.font.Font(None, 24)
         self.font_small = pygame.font.Font(None, 20)
         
-        self.current_scene = "start"
+        # Story content lives in stories/*.json, compiled to integer scene indices
+        self.story = load_story(story_path)
+        self.current_scene = self.story.start
         self.selected_choice = 0
         self.game_over = False
         self.inventory = []
         self.health = 100
         self.score = 0
         
-        # Game story data
-        self.scenes = {
-            "start": {
-                "text": "You wake up in a mysterious forest clearing. Ancient ruins loom ahead, partially covered by twisted vines. A strange blue glow emanates from within the ruins. You hear distant howling in the darkness behind you.",
-                "choices": [
-                    ("Enter the glowing ruins", "ruins_entrance"),
-                    ("Investigate the howling sounds", "forest_path"),
-                    ("Search the clearing for supplies", "clearing_search")
-                ]
-            },
-            "ruins_entrance": {
-                "text": "The ruins are filled with ancient technology humming with energy. Holographic symbols float in the air. You see three passages: one leads down into darkness, another glows with warm light, and the third crackles with electrical energy.",
-                "choices": [
-                    ("Descend into the dark passage", "dark_passage"),
-                    ("Follow the warm, glowing passage", "light_passage"),
-                    ("Enter the electrical passage", "electric_passage")
-                ]
-            },
-            "forest_path": {
-                "text": "Following the howls, you discover a pack of robotic wolves with glowing red eyes. They seem to be guarding something. Behind them, you spot a crashed spaceship with its cargo bay open.",
-                "choices": [
-                    ("Try to sneak past the robot wolves", "sneak_attempt"),
-                    ("Attempt to communicate with them", "communicate_wolves"),
-                    ("Look for another way around", "alternate_route")
-                ]
-            },
-            "clearing_search": {
-                "text": "Searching the clearing, you find an old backpack containing a energy scanner, some rations, and a mysterious crystal that pulses with inner light. The scanner beeps, detecting multiple energy signatures nearby.",
-                "choices": [
-                    ("Use the scanner to track the strongest signal", "scanner_track"),
-                    ("Examine the crystal more closely", "crystal_examine"),
-                    ("Head toward the ruins with your new equipment", "equipped_ruins")
-                ]
-            },
-            "dark_passage": {
-                "text": "The passage leads to an underground chamber filled with sleeping pods. Most are empty, but one contains a figure in a strange suit. A control panel nearby shows various readings. Suddenly, alarms start blaring!",
-                "choices": [
-                    ("Try to wake the figure in the pod", "wake_figure"),
-                    ("Examine the control panel", "control_panel"),
-                    ("Flee back to the surface", "flee_surface")
-                ]
-            },
-            "light_passage": {
-                "text": "You enter a beautiful garden chamber with bioluminescent plants and a clear pool of water. An AI hologram appears, speaking in an ancient language. It gestures toward three glowing orbs on pedestals.",
-                "choices": [
-                    ("Touch the blue orb", "blue_orb"),
-                    ("Touch the green orb", "green_orb"),
-                    ("Try to communicate with the AI", "ai_communicate")
-                ]
-            },
-            "electric_passage": {
-                "text": "The electrical energy courses through your body, but instead of harm, it grants you enhanced abilities! You can now interface with the ancient technology. A massive door opens, revealing a control room.",
-                "choices": [
-                    ("Access the main computer", "main_computer"),
-                    ("Check the security systems", "security_systems"),
-                    ("Look for the power source", "power_source")
-                ]
-            },
-            "main_computer": {
-                "text": "The computer reveals this is an ancient research station studying interdimensional travel. A portal is nearly complete, but it needs a power crystal to activate. You realize the crystal from the clearing might work!",
-                "choices": [
-                    ("Activate the portal (if you have crystal)", "portal_activate"),
-                    ("Study the research data first", "research_data"),
-                    ("Look for alternative power sources", "alt_power")
-                ]
-            },
-            "portal_activate": {
-                "text": "The portal springs to life! You can see three different dimensions through swirling energy: a peaceful world of floating islands, a high-tech cyberpunk city, and a realm of pure energy beings.",
-                "choices": [
-                    ("Enter the floating islands dimension", "floating_islands"),
-                    ("Step into the cyberpunk city", "cyberpunk_city"),
-                    ("Merge with the energy beings", "energy_beings")
-                ]
-            },
-            "floating_islands": {
-                "text": "You emerge on a beautiful floating island where friendly beings welcome you as a prophesied traveler. They offer to teach you their ancient wisdom and make you a guardian of their realm.",
-                "choices": [
-                    ("Accept their offer and stay", "peaceful_ending"),
-                    ("Ask to return home with their knowledge", "wisdom_return"),
-                    ("Request to explore more dimensions", "dimension_explorer")
-                ]
-            },
-            "peaceful_ending": {
-                "text": "You become a guardian of the floating islands, spending your days learning ancient wisdom and protecting this peaceful realm. Your adventure ends in harmony and enlightenment. VICTORY!",
-                "choices": [("Play again", "start")]
-            }
-        }
+        # Rendered scene layout, rebuilt when layout_key changes
+        self.layout = None
+        self.layout_key = None
+        
+        # Optional generator for choices that lead to missing scenes
+        self.prefetcher = ScenePrefetcher(generator) if generator is not None else None
+        self.pending_choice = None  # (scene index, choice number, target id) while generating
+        self.prefetch_choices()
         
-        # Add inventory tracking
-        if self.current_scene == "clearing_search":
-            self.inventory.extend(["Energy Scanner", "Rations", "Crystal"])
+        # Undo history and save slots
+        self.item_names = list(self.story.items)  # Bit order of the inventory bitset
+        self.history = RunHistory()
+        self.save_slot = 1
+        self.message = None
+        self.message_until = 0
     
     def get_current_scene(self):
-        return self.scenes.get(self.current_scene, self.scenes["start"])
+        if self.pending_choice is not None:
+            return PLACEHOLDER_SCENE
+        return self.story.scene(self.current_scene)
     
-    def draw_game(self):
-        self.screen.fill(WHITE)
+    def add_item(self, item):
+        """Add an item once; inventory keeps pickup order for display"""
+        if item not in self.inventory:
+            self.inventory.append(item)
+    
+    def remove_item(self, item):
+        if item in self.inventory:
+            self.inventory.remove(item)
+    
+    def snapshot(self):
+        """Current run state as a compact (scene, health, score, inventory bits) record"""
+        return (self.current_scene, self.health, self.score,
+                encode_inventory(self.inventory, self.item_names))
+    
+    def restore(self, snapshot):
+        scene_index, health, score, inventory_bits = snapshot
+        self.current_scene = scene_index
+        self.health = health
+        self.score = score
+        self.inventory = decode_inventory(inventory_bits, self.item_names)
+        self.selected_choice = 0
+        self.pending_choice = None
+        self.prefetch_choices()
+    
+    def undo(self, steps=1):
+        """Go back to the state before the last steps choices"""
+        snapshot = self.history.rewind(steps)
+        if snapshot is None:
+            self.show_message("Nothing to undo")
+            return
+        self.restore(snapshot)
+    
+    def save_game(self):
+        metadata = {
+            "title": self.story.title,
+            "scene_id": self.story.scene(self.current_scene).id,
+            "items": self.item_names
+        }
+        try:
+            save_run(slot_path(self.save_slot), metadata, self.snapshot(), self.history)
+        except OSError as e:
+            print(f"Error saving game: {e}")
+            self.show_message("Save failed")
+            return
+        self.show_message(f"Saved to slot {self.save_slot}")
+    
+    def load_game(self):
+        try:
+            metadata, snapshot, history = load_run(slot_path(self.save_slot))
+        except FileNotFoundError:
+            self.show_message(f"Slot {self.save_slot} is empty")
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading game: {e}")
+            self.show_message("Load failed")
+            return
+        if metadata.get("title") != self.story.title:
+            self.show_message(f"Slot {self.save_slot} is from another story")
+            return
+        
+        # Saves made on generated scenes fall back to the start scene
+        scene_index = snapshot[0]
+        if self.story.scene(scene_index).id != metadata["scene_id"]:
+            scene_index = self.story.index_of(metadata["scene_id"])
+            if scene_index is None:
+                scene_index = self.story.start
+        
+        self.item_names = metadata["items"]
+        self.history = history
+        self.restore((scene_index,) + tuple(snapshot[1:]))
+        self.show_message(f"Loaded slot {self.save_slot}")
+    
+    def show_message(self, text, duration=2000):
+        self.message = text
+        self.message_until = pygame.time.get_ticks() + duration
+    
+    def prefetch_choices(self):
+        """Start generating every missing scene the current scene links to"""
+        if self.prefetcher is None:
+            return
+        scene = self.story.scene(self.current_scene)
+        for choice_number, target_id in self.story.dangling.get(scene.index, []):
+            self.prefetcher.prefetch(target_id, scene.text, scene.choice_labels[choice_number])
+    
+    def missing_target(self, scene, choice_number):
+        """Id of the missing scene a choice points at, or None"""
+        for number, target_id in self.story.dangling.get(scene.index, []):
+            if number == choice_number:
+                return target_id
+        return None
+    
+    def resolve_generated(self, scene, choice_number, target_id, count=True):
+        """Index of the generated scene for a choice, or None if it isn't ready
+        
+        If generation failed, the choice keeps its compiled target (the
+        start scene) so the player is never stuck waiting.
+        """
+        added = self.story.added_index or {}
+        index = added.get(target_id)
+        if index is None:
+            label = scene.choice_labels[choice_number]
+            data = self.prefetcher.take(target_id, scene.text, label, count)
+            if data is None:
+                if self.prefetcher.has_failed(target_id):
+                    self.show_message("The path ahead collapses...")
+                    return scene.targets[choice_number]
+                return None
+            index = self.story.add_scene(target_id, data["text"],
+                                         [choice["text"] for choice in data["choices"]],
+                                         [choice["target"] for choice in data["choices"]])
+        self.story.link(scene.index, choice_number, index)
+        return index
+    
+    def update(self):
+        """Expire status messages and finish a choice waiting on the generator"""
+        if self.message and pygame.time.get_ticks() >= self.message_until:
+            self.message = None
+        
+        if self.pending_choice is None:
+            return
+        scene_index, choice_number, target_id = self.pending_choice
+        scene = self.story.scene(scene_index)
+        next_scene = self.resolve_generated(scene, choice_number, target_id, count=False)
+        if next_scene is not None:
+            self.pending_choice = None
+            self.enter_scene(scene, choice_number, next_scene)
+    
+    def build_layout(self):
+        """Render everything that only changes with the scene or player stats
+        
+        Returns (blits, choice_rows): (surface, position) pairs and the y
+        position of each choice for the selection highlight.
+        """
+        blits = []
         
         # Title
-        title_text = self.font_large.render("AI Dungeon Quest", True, BLUE)
-        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 30))
-        self.screen.blit(title_text, title_rect)
+        title_text = render_text(self.font_large, "AI Dungeon Quest", True, BLUE)
+        blits.append((title_text, title_text.get_rect(center=(SCREEN_WIDTH//2, 30))))
         
         # Status bar
         status_y = 70
@@ -145,45 +218,67 @@ class AIDungeonQuest:
         score_text = f"Score: {self.score}"
         inventory_text = f"Inventory: {', '.join(self.inventory) if self.inventory else 'Empty'}"
         
-        health_surface = self.font_small.render(health_text, True, RED if self.health < 50 else BLACK)
-        score_surface = self.font_small.render(score_text, True, BLACK)
-        inventory_surface = self.font_small.render(inventory_text, True, GRAY)
+        health_surface = render_text(self.font_small, health_text, True, RED if self.health < 50 else BLACK)
+        score_surface = render_text(self.font_small, score_text, True, BLACK)
+        inventory_surface = render_text(self.font_small, inventory_text, True, GRAY)
+        
+        blits.append((health_surface, (20, status_y)))
+        blits.append((score_surface, (150, status_y)))
+        blits.append((inventory_surface, (20, status_y + 25)))
         
-        self.screen.blit(health_surface, (20, status_y))
-        self.screen.blit(score_surface, (150, status_y))
-        self.screen.blit(inventory_surface, (20, status_y + 25))
+        slot_text = f"Slot {self.save_slot}" + (f" - {self.message}" if self.message else "")
+        slot_surface = render_text(self.font_small, slot_text, True, BLUE if self.message else GRAY)
+        blits.append((slot_surface, slot_surface.get_rect(topright=(SCREEN_WIDTH - 20, status_y))))
         
         # Main story text
         scene = self.get_current_scene()
         story_y = 120
         
         # Wrap text to fit screen
-        wrapped_text = textwrap.wrap(scene["text"], width=80)
+        wrapped_text = textwrap.wrap(scene.text, width=80)
         for i, line in enumerate(wrapped_text):
-            text_surface = self.font_medium.render(line, True, BLACK)
-            self.screen.blit(text_surface, (50, story_y + i * 30))
+            text_surface = render_text(self.font_medium, line, True, BLACK)
+            blits.append((text_surface, (50, story_y + i * 30)))
         
         # Choices
         choices_y = story_y + len(wrapped_text) * 30 + 50
-        choice_text = self.font_medium.render("Choose your action:", True, BLUE)
-        self.screen.blit(choice_text, (50, choices_y))
+        choice_text = render_text(self.font_medium, "Choose your action:", True, BLUE)
+        blits.append((choice_text, (50, choices_y)))
         
-        for i, (choice_text, _) in enumerate(scene["choices"]):
+        choice_rows = []
+        for i, choice_text in enumerate(scene.choice_labels):
             y_pos = choices_y + 40 + i * 40
-            
-            # Highlight selected choice
-            if i == self.selected_choice:
-                pygame.draw.rect(self.screen, LIGHT_GRAY, (40, y_pos - 5, SCREEN_WIDTH - 80, 35))
+            choice_rows.append(y_pos)
             
             choice_num = f"{i + 1}. {choice_text}"
-            choice_surface = self.font_medium.render(choice_num, True, BLACK)
-            self.screen.blit(choice_surface, (50, y_pos))
+            color = BLACK if scene.available(self, i) else GRAY  # Locked choices are grayed out
+            choice_surface = render_text(self.font_medium, choice_num, True, color)
+            blits.append((choice_surface, (50, y_pos)))
         
         # Instructions
-        instruction_text = "Use UP/DOWN arrows to select, ENTER to choose, ESC to quit"
-        instruction_surface = self.font_small.render(instruction_text, True, GRAY)
-        instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 30))
-        self.screen.blit(instruction_surface, instruction_rect)
+        instruction_text = "UP/DOWN select, ENTER choose, BACKSPACE undo, F5 save, F9 load, TAB slot, ESC quit"
+        instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
+        blits.append((instruction_surface, instruction_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 30))))
+        
+        return blits, choice_rows
+    
+    def draw_game(self):
+        # Rebuild the layout only when the scene or player stats change
+        layout_key = (self.get_current_scene().index, self.health, self.score, tuple(self.inventory),
+                      self.save_slot, self.message)
+        if layout_key != self.layout_key:
+            self.layout = self.build_layout()
+            self.layout_key = layout_key
+        blits, choice_rows = self.layout
+        
+        self.screen.fill(WHITE)
+        
+        # Highlight selected choice
+        if self.selected_choice < len(choice_rows):
+            y_pos = choice_rows[self.selected_choice]
+            pygame.draw.rect(self.screen, LIGHT_GRAY, (40, y_pos - 5, SCREEN_WIDTH - 80, 35))
+        
+        self.screen.blits(blits, doreturn=False)
         
         pygame.display.flip()
     
@@ -194,54 +289,92 @@ class AIDungeonQuest:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
+                elif event.key == pygame.K_BACKSPACE:
+                    self.undo()
+                elif event.key == pygame.K_F5:
+                    self.save_game()
+                elif event.key == pygame.K_F9:
+                    self.load_game()
+                elif event.key == pygame.K_TAB:
+                    self.save_slot = self.save_slot % SAVE_SLOTS + 1
+                elif self.pending_choice is not None:
+                    continue  # No choices until the next scene is ready
+                elif not self.get_current_scene().choice_labels:
+                    continue  # A scene without choices has nothing to select
                 elif event.key == pygame.K_UP:
                     scene = self.get_current_scene()
-                    self.selected_choice = (self.selected_choice - 1) % len(scene["choices"])
+                    self.selected_choice = (self.selected_choice - 1) % len(scene.choice_labels)
                 elif event.key == pygame.K_DOWN:
                     scene = self.get_current_scene()
-                    self.selected_choice = (self.selected_choice + 1) % len(scene["choices"])
+                    self.selected_choice = (self.selected_choice + 1) % len(scene.choice_labels)
                 elif event.key == pygame.K_RETURN:
                     self.make_choice()
                 elif event.key >= pygame.K_1 and event.key <= pygame.K_9:
                     # Direct number selection
                     choice_num = event.key - pygame.K_1
                     scene = self.get_current_scene()
-                    if choice_num < len(scene["choices"]):
+                    if choice_num < len(scene.choice_labels):
                         self.selected_choice = choice_num
                         self.make_choice()
         return True
     
     def make_choice(self):
         scene = self.get_current_scene()
-        if self.selected_choice < len(scene["choices"]):
-            _, next_scene = scene["choices"][self.selected_choice]
-            
-            # Handle special conditions
-            if next_scene == "portal_activate" and "Crystal" not in self.inventory:
-                # Can't activate portal without crystal
+        if self.selected_choice < len(scene.choice_labels):
+            if not scene.available(self, self.selected_choice):
                 return
+            next_scene = scene.targets[self.selected_choice]
             
-            # Update inventory and stats based on choices
-            if self.current_scene == "clearing_search":
-                self.inventory.extend(["Energy Scanner", "Rations", "Crystal"])
-                self.score += 10
-            elif self.current_scene == "electric_passage":
-                self.score += 20
-            elif next_scene == "peaceful_ending":
-                self.score += 100
+            if self.prefetcher is not None:
+                target_id = self.missing_target(scene, self.selected_choice)
+                if target_id is not None:
+                    next_scene = self.resolve_generated(scene, self.selected_choice, target_id)
+                    if next_scene is None:
+                        # Show a placeholder and finish the move in update()
+                        self.pending_choice = (scene.index, self.selected_choice, target_id)
+                        return
             
-            self.current_scene = next_scene
-            self.selected_choice = 0
+            self.enter_scene(scene, self.selected_choice, next_scene)
+    
+    def enter_scene(self, scene, choice_number, next_scene):
+        """Apply a choice's conditions and effects and move to next_scene"""
+        # Conditions and effects come from the story file (e.g. the portal needs the crystal)
+        if not scene.available(self, choice_number):
+            return
+        self.history.push(self.snapshot())
+        scene.apply(self, choice_number)
+        
+        self.current_scene = next_scene
+        self.selected_choice = 0
+        self.prefetch_choices()
+    
+    def close(self):
+        """Stop the scene prefetcher's workers"""
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
     
     def run(self):
         running = True
         while running:
             running = self.handle_events()
+            self.update()
             self.draw_game()
             self.clock.tick(60)
         
+        if self.prefetcher is not None:
+            print(f"Scene prefetch metrics: {self.prefetcher.metrics()}")
+        self.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = AIDungeonQuest()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AI Dungeon Quest")
+    parser.add_argument("--story", default=DEFAULT_STORY, help="story JSON file or compiled story directory")
+    parser.add_argument("--generate", action="store_true",
+                        help="generate scenes for choices that lead to missing scenes")
+    args = parser.parse_args()
+    
+    generator = TemplateGenerator() if args.generate else None
+    game = AIDungeonQuest(story_path=args.story, generator=generator)
     game.run()
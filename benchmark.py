@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Headless frame-time benchmark for the ThinkVerse games
+Drives each game's event/update/draw loop under SDL's dummy video driver
+with a scripted input sequence and reports frame-time percentiles per state
+"""
+
+import os
+
+# Must be set before pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import sys
+import json
+import time
+import argparse
+import importlib
+
+import pygame
+
+from stats import percentile
+from text_cache import text_cache
+
+
+def key(key_code, char=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key_code, mod=0, unicode=char)
+
+
+def text(string):
+    """Key events that type a string (pygame key codes match ASCII here)"""
+    return [key(ord(char.lower()), char) for char in string]
+
+
+def characters(string):
+    """Typed characters without a key code, for letters a game also binds"""
+    return [key(pygame.K_UNKNOWN, char) for char in string]
+
+
+def click(pos, button=1):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+
+
+def network_path(game):
+    """Clicks along a path through Escape 404's network grid, from the game's own layout"""
+    return [click(game.network_geometry.cell_center(x, y)) for x, y in
+            [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (4, 1), (4, 2), (4, 3), (4, 4)]]
+
+
+# Each script is a list of (frames to wait, events to post) steps and loops
+# until the frame budget is spent. Events can also be a function of the game
+# for input that depends on its layout.
+SCRIPTS = {
+    "code_breaker": [
+        (20, [key(pygame.K_1, "1"), key(pygame.K_2, "2"), key(pygame.K_3, "3"), key(pygame.K_4, "4")]),
+        (20, [key(pygame.K_RETURN)]),
+        (20, [key(pygame.K_r, "r")])
+    ],
+    "ai_dungeon_quest": [
+        (30, [key(pygame.K_DOWN)]),
+        (30, [key(pygame.K_RETURN)])
+    ],
+    "memory_matrix": [
+        (30, [key(pygame.K_SPACE, " ")]),
+        (200, [key(pygame.K_RETURN), key(pygame.K_RIGHT)]),
+        (10, [key(pygame.K_RETURN), key(pygame.K_DOWN)]),
+        (10, [key(pygame.K_RETURN), key(pygame.K_RIGHT)]),
+        (10, [key(pygame.K_RETURN), key(pygame.K_DOWN)]),
+        (30, [key(pygame.K_r, "r")])
+    ],
+    "mystery_sound": [
+        (30, [key(pygame.K_SPACE, " ")]),
+        (30, [key(pygame.K_SPACE, " ")]),
+        (30, [key(pygame.K_SPACE, " ")]),
+        (30, [key(pygame.K_g, "g")]),
+        (30, text("RAIN") + [key(pygame.K_RETURN)]),
+        (30, [key(pygame.K_SPACE, " "), key(pygame.K_r, "r")])
+    ],
+    "escape_404": [
+        (30, text("start") + [key(pygame.K_RETURN)]),
+        # H is also Room 1's hint key, so the answer is typed as bare characters
+        (30, characters("HELP") + [key(pygame.K_RETURN)]),
+        (30, network_path),
+        (30, [key(pygame.K_RETURN)]),
+        (30, text("tiger2023") + [key(pygame.K_RETURN)]),
+        (30, [key(pygame.K_r, "r")])
+    ],
+    "quantum_dice": [
+        (30, [key(pygame.K_SPACE, " ")]),
+        (30, [key(pygame.K_RETURN)]),
+        (70, [key(pygame.K_SPACE, " ")]),
+        (10, [key(pygame.K_r, "r")])
+    ],
+    "quiz_master": [
+        (30, [key(pygame.K_SPACE, " ")]),
+        (30, [key(pygame.K_a, "a")]),
+        (30, [key(pygame.K_SPACE, " ")]),
+        (10, [key(pygame.K_r, "r")])
+    ],
+    "snake_classic": [
+        (30, [key(pygame.K_RETURN)]),
+        (20, [key(pygame.K_UP)]),
+        (20, [key(pygame.K_RIGHT)]),
+        (20, [key(pygame.K_DOWN)]),
+        (20, [key(pygame.K_RIGHT)]),
+        (10, [key(pygame.K_r, "r")])
+    ]
+}
+
+GAMES = [
+    ("code_breaker", "CodeBreaker"),
+    ("ai_dungeon_quest", "AIDungeonQuest"),
+    ("memory_matrix", "MemoryMatrix"),
+    ("mystery_sound", "MysterySound"),
+    ("escape_404", "Escape404"),
+    ("quantum_dice", "QuantumDice"),
+    ("quiz_master", "QuizMaster"),
+    ("snake_classic", "SnakeClassic")
+]
+
+
+def game_state(game):
+    """Name of the state a game is in, for games without a game_state"""
+    state = getattr(game, "game_state", None)
+    if state is not None:
+        return state
+    if getattr(game, "game_over", False):
+        return "result"
+    return "playing"
+
+
+def summarize(frame_times):
+    """p50/p95/p99/max in milliseconds for a list of frame times in seconds"""
+    ordered = sorted(frame_times)
+    return {
+        "frames": len(ordered),
+        "p50_ms": round(percentile(ordered, 50, 0.0) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95, 0.0) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99, 0.0) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0
+    }
+
+
+def benchmark_game(module_name, class_name, frames, pace):
+    """Run one game for a number of frames and collect frame times per state"""
+    module = importlib.import_module(module_name)
+    game = getattr(module, class_name)()
+    script = SCRIPTS.get(module_name, [])
+    clock = pygame.time.Clock()
+
+    frame_times = {}
+    step = 0
+    next_step_frame = script[0][0] if script else None
+
+    for frame in range(frames):
+        if next_step_frame is not None and frame >= next_step_frame:
+            events = script[step][1]
+            for event in events(game) if callable(events) else events:
+                pygame.event.post(event)
+            step = (step + 1) % len(script)
+            next_step_frame = frame + script[step][0]
+
+        state = game_state(game)
+        start = time.perf_counter()
+        game.handle_events()
+        if hasattr(game, "update"):
+            game.update()
+        if hasattr(game, "draw"):
+            game.draw()
+        else:
+            game.draw_game()
+        elapsed = time.perf_counter() - start
+
+        frame_times.setdefault(state, []).append(elapsed)
+
+        # Pacing keeps timer-driven states (show phases, snake moves) realistic
+        if pace:
+            clock.tick(60)
+
+    # Stop worker threads and pools before the next game starts
+    if hasattr(game, "close"):
+        game.close()
+
+    states = {state: summarize(times) for state, times in frame_times.items()}
+    all_times = [t for times in frame_times.values() for t in times]
+    return {"overall": summarize(all_times), "states": states}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless ThinkVerse frame-time benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="frames to run per game")
+    parser.add_argument("--games", nargs="*", help="module names to run (default: all)")
+    parser.add_argument("--no-pace", action="store_true",
+                        help="run frames back to back instead of at 60 FPS")
+    parser.add_argument("--output", help="optional JSON results file")
+    args = parser.parse_args()
+
+    pygame.init()
+
+    results = {
+        "frames_per_game": args.frames,
+        "paced": not args.no_pace,
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "games": {}
+    }
+
+    for module_name, class_name in GAMES:
+        if args.games and module_name not in args.games:
+            continue
+
+        text_cache.clear()
+        result = benchmark_game(module_name, class_name, args.frames, not args.no_pace)
+        result["text_cache"] = text_cache.stats()
+        results["games"][module_name] = result
+
+        overall = result["overall"]
+        print(f"{module_name:18} p50 {overall['p50_ms']:7.3f} ms  "
+              f"p95 {overall['p95_ms']:7.3f} ms  p99 {overall['p99_ms']:7.3f} ms")
+        for state, summary in sorted(result["states"].items()):
+            print(f"    {state:16} {summary['frames']:5} frames  "
+                  f"p50 {summary['p50_ms']:7.3f}  p95 {summary['p95_ms']:7.3f}  p99 {summary['p99_ms']:7.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """
 Code Breaker - Logic puzzle game
-Guess the secret 4-digit code with color-coded hints
+Guess the secret code (4 pegs / 6 colours by default, up to 8 / 10)
+with color-coded hints
 """
 
 import pygame
 import random
 import sys
 
+from code_breaker_solver import (HAS_NUMPY, HINT_MAX_CODES, PEGS, COLOURS, MAX_PEGS, MAX_COLOURS,
+                                 CandidateSet, HintEngine, score_guess)
+from text_cache import render_text
+
 pygame.init()
 
 # Constants
@@ -22,127 +27,180 @@ YELLOW = (255, 255, 0)
 GRAY = (128, 128, 128)
 LIGHT_GRAY = (200, 200, 200)
 
+ATTEMPT_ROW_X = 150  # Left edge of the attempt history rows
+
+def digit_label(digit):
+    """Colour 10 is entered and shown as 0"""
+    return "0" if digit == 10 else str(digit)
+
+def format_code(code):
+    return "".join(digit_label(digit) for digit in code)
+
 class CodeBreaker:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None, pegs=PEGS, colours=COLOURS):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Code Breaker")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
         
-        self.secret_code = [random.randint(1, 6) for _ in range(4)]
-        self.current_guess = [0, 0, 0, 0]
+        self.pegs = min(max(2, pegs), MAX_PEGS)
+        self.colours = min(max(2, colours), MAX_COLOURS)
+        self.secret_code = [random.randint(1, self.colours) for _ in range(self.pegs)]
+        self.current_guess = [0] * self.pegs
         self.current_position = 0
         self.attempts = []
+        self.attempt_rows = []  # Rendered row surface per attempt
         self.max_attempts = 10
         self.game_won = False
         self.game_over = False
         
+        # Hint engine is created on the first hint request (needs numpy)
+        self.hint_engine = None
+        self.hint = None
+        # Remaining-code count, pruned in the background (needs numpy)
+        self.candidates = CandidateSet(self.pegs, self.colours) if HAS_NUMPY else None
+        
         print(f"Secret code (for testing): {self.secret_code}")
     
     def check_guess(self, guess):
         """Return (correct_position, correct_number) counts"""
-        correct_position = 0
-        correct_number = 0
-        
-        secret_copy = self.secret_code.copy()
-        guess_copy = guess.copy()
-        
-        # Check for correct positions first
-        for i in range(4):
-            if guess[i] == self.secret_code[i]:
-                correct_position += 1
-                secret_copy[i] = -1  # Mark as used
-                guess_copy[i] = -1   # Mark as used
-        
-        # Check for correct numbers in wrong positions
-        for i in range(4):
-            if guess_copy[i] != -1:  # Not already matched
-                if guess_copy[i] in secret_copy:
-                    correct_number += 1
-                    secret_copy[secret_copy.index(guess_copy[i])] = -1
-        
-        return correct_position, correct_number
+        return score_guess(self.secret_code, guess)
+    
+    def show_hint(self):
+        """Suggest the next guess from the codes still consistent with the attempts"""
+        if not HAS_NUMPY:
+            self.hint = "Hints need numpy (pip install numpy)"
+            return
+        if self.colours ** self.pegs > HINT_MAX_CODES:
+            self.hint = f"Hints are available for up to {HINT_MAX_CODES} possible codes"
+            return
+        
+        if self.hint_engine is None:
+            self.hint_engine = HintEngine(pegs=self.pegs, colours=self.colours)
+            self.hint_engine.sync(self.attempts)
+        
+        guess = self.hint_engine.suggest()
+        remaining = self.hint_engine.remaining()
+        codes = "code" if remaining == 1 else "codes"
+        self.hint = f"Hint: {format_code(guess)} ({remaining} {codes} left)"
+    
+    def change_settings(self, pegs=None, colours=None):
+        """Switch peg/colour counts and start a new game"""
+        if pegs is not None:
+            self.pegs = pegs
+        if colours is not None:
+            self.colours = colours
+        self.hint_engine = None
+        self.restart_game()
+    
+    def render_attempt_row(self, guess, correct_pos, correct_num):
+        """Draw a submitted attempt once; rows never change afterwards"""
+        row = pygame.Surface((SCREEN_WIDTH - ATTEMPT_ROW_X, 30)).convert()
+        row.fill(WHITE)
+        
+        # Guess digits
+        for j in range(self.pegs):
+            x = j * 50
+            pygame.draw.rect(row, BLACK, (x, 0, 40, 30), 1)
+            
+            num_text = render_text(self.font_small, digit_label(guess[j]), True, BLACK)
+            num_rect = num_text.get_rect(center=(x + 20, 15))
+            row.blit(num_text, num_rect)
+        
+        # Feedback
+        feedback_x = 200 + self.pegs * 50 - ATTEMPT_ROW_X
+        # Correct positions (green circles)
+        for k in range(correct_pos):
+            pygame.draw.circle(row, GREEN, (feedback_x + k * 20, 15), 8)
+        
+        # Correct numbers (yellow circles)
+        for k in range(correct_num):
+            pygame.draw.circle(row, YELLOW, (feedback_x + (correct_pos + k) * 20, 15), 8)
+        
+        return row
     
     def draw_game(self):
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Code Breaker", True, BLUE)
+        title_text = render_text(self.font_large, "Code Breaker", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 40))
         self.screen.blit(title_text, title_rect)
         
+        settings_text = f"{self.pegs} pegs, {self.colours} colours (P/C)"
+        settings_surface = render_text(self.font_small, settings_text, True, GRAY)
+        settings_rect = settings_surface.get_rect(topright=(SCREEN_WIDTH - 20, 15))
+        self.screen.blit(settings_surface, settings_rect)
+        
         # Instructions
         if not self.game_over:
-            inst_text = "Guess the 4-digit code (1-6). Use number keys and ENTER to submit."
-            instruction = self.font_small.render(inst_text, True, BLACK)
+            digits = "1-9, 0 = 10" if self.colours == 10 else f"1-{self.colours}"
+            inst_text = f"Guess the {self.pegs}-digit code ({digits}). Number keys, ENTER to submit, H for a hint."
+            instruction = render_text(self.font_small, inst_text, True, BLACK)
             self.screen.blit(instruction, (50, 80))
         
         # Current guess input
         if not self.game_over:
             guess_y = 120
-            for i in range(4):
-                x = 250 + i * 80
+            guess_x = SCREEN_WIDTH//2 - (self.pegs * 80 - 20) // 2
+            for i in range(self.pegs):
+                x = guess_x + i * 80
                 color = LIGHT_GRAY if i == self.current_position else WHITE
                 pygame.draw.rect(self.screen, color, (x, guess_y, 60, 60))
                 pygame.draw.rect(self.screen, BLACK, (x, guess_y, 60, 60), 2)
                 
                 if self.current_guess[i] > 0:
-                    num_text = self.font_medium.render(str(self.current_guess[i]), True, BLACK)
+                    num_text = render_text(self.font_medium, digit_label(self.current_guess[i]), True, BLACK)
                     num_rect = num_text.get_rect(center=(x + 30, guess_y + 30))
                     self.screen.blit(num_text, num_rect)
+            
+            if self.hint:
+                hint_surface = render_text(self.font_small, self.hint, True, BLUE)
+                hint_rect = hint_surface.get_rect(center=(SCREEN_WIDTH//2, 188))
+                self.screen.blit(hint_surface, hint_rect)
         
         # Previous attempts
         attempts_y = 200
-        for i, (guess, correct_pos, correct_num) in enumerate(self.attempts):
-            y = attempts_y + i * 40
-            
-            # Draw guess
-            for j in range(4):
-                x = 150 + j * 50
-                pygame.draw.rect(self.screen, WHITE, (x, y, 40, 30))
-                pygame.draw.rect(self.screen, BLACK, (x, y, 40, 30), 1)
-                
-                num_text = self.font_small.render(str(guess[j]), True, BLACK)
-                num_rect = num_text.get_rect(center=(x + 20, y + 15))
-                self.screen.blit(num_text, num_rect)
-            
-            # Draw feedback
-            feedback_x = 400
-            # Correct positions (green circles)
-            for k in range(correct_pos):
-                pygame.draw.circle(self.screen, GREEN, (feedback_x + k * 20, y + 15), 8)
-            
-            # Correct numbers (yellow circles)
-            for k in range(correct_num):
-                pygame.draw.circle(self.screen, YELLOW, (feedback_x + (correct_pos + k) * 20, y + 15), 8)
+        for i, row in enumerate(self.attempt_rows):
+            self.screen.blit(row, (ATTEMPT_ROW_X, attempts_y + i * 40))
         
         # Game status
         if self.game_won:
-            win_text = self.font_large.render("Congratulations! You broke the code!", True, GREEN)
+            win_text = render_text(self.font_large, "Congratulations! You broke the code!", True, GREEN)
             win_rect = win_text.get_rect(center=(SCREEN_WIDTH//2, 500))
             self.screen.blit(win_text, win_rect)
         elif self.game_over:
-            lose_text = self.font_large.render("Game Over! Code was: " + "".join(map(str, self.secret_code)), True, RED)
+            lose_text = render_text(self.font_large, "Game Over! Code was: " + format_code(self.secret_code), True, RED)
             lose_rect = lose_text.get_rect(center=(SCREEN_WIDTH//2, 500))
             self.screen.blit(lose_text, lose_rect)
         
         # Attempts remaining
         if not self.game_over:
             attempts_text = f"Attempts remaining: {self.max_attempts - len(self.attempts)}"
-            attempts_surface = self.font_small.render(attempts_text, True, BLACK)
+            attempts_surface = render_text(self.font_small, attempts_text, True, BLACK)
             self.screen.blit(attempts_surface, (50, 550))
+            
+            if self.candidates is not None:
+                pruning = "..." if self.candidates.is_pruning() else ""
+                count_text = f"Possible codes: {self.candidates.count:,}{pruning}"
+                count_surface = render_text(self.font_small, count_text, True, BLACK)
+                count_rect = count_surface.get_rect(topright=(SCREEN_WIDTH - 50, 550))
+                self.screen.blit(count_surface, count_rect)
         
         # Legend
         legend_y = 520
         legend_text = "Legend: Green = Correct position, Yellow = Correct number wrong position"
-        legend_surface = self.font_small.render(legend_text, True, GRAY)
+        legend_surface = render_text(self.font_small, legend_text, True, GRAY)
         self.screen.blit(legend_surface, (50, legend_y))
         
         if self.game_over:
             restart_text = "Press R to restart or ESC to quit"
-            restart_surface = self.font_small.render(restart_text, True, BLACK)
+            restart_surface = render_text(self.font_small, restart_text, True, BLACK)
             restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, 550))
             self.screen.blit(restart_surface, restart_rect)
         
@@ -157,42 +215,69 @@ class CodeBreaker:
                     return False
                 elif event.key == pygame.K_r and self.game_over:
                     self.restart_game()
+                elif event.key in (pygame.K_p, pygame.K_c) and (self.game_over or not self.attempts):
+                    # Settings only change between games
+                    if event.key == pygame.K_p:
+                        self.change_settings(pegs=self.pegs + 1 if self.pegs < MAX_PEGS else PEGS)
+                    else:
+                        self.change_settings(colours=self.colours + 1 if self.colours < MAX_COLOURS else COLOURS)
                 elif not self.game_over:
-                    if event.key >= pygame.K_1 and event.key <= pygame.K_6:
-                        digit = event.key - pygame.K_0
-                        self.current_guess[self.current_position] = digit
-                        self.current_position = (self.current_position + 1) % 4
+                    if pygame.K_0 <= event.key <= pygame.K_9:
+                        digit = event.key - pygame.K_0 or 10
+                        if digit <= self.colours:
+                            self.current_guess[self.current_position] = digit
+                            self.current_position = (self.current_position + 1) % self.pegs
                     elif event.key == pygame.K_BACKSPACE:
-                        self.current_position = (self.current_position - 1) % 4
+                        self.current_position = (self.current_position - 1) % self.pegs
                         self.current_guess[self.current_position] = 0
                     elif event.key == pygame.K_RETURN:
                         self.submit_guess()
+                    elif event.key == pygame.K_h:
+                        self.show_hint()
         return True
     
     def submit_guess(self):
         if 0 not in self.current_guess:  # All positions filled
             correct_pos, correct_num = self.check_guess(self.current_guess)
             self.attempts.append((self.current_guess.copy(), correct_pos, correct_num))
+            self.attempt_rows.append(self.render_attempt_row(self.current_guess, correct_pos, correct_num))
+            if self.hint_engine is not None:
+                self.hint_engine.add_attempt(self.current_guess, correct_pos, correct_num)
+            if self.candidates is not None:
+                self.candidates.add_attempt(self.current_guess, correct_pos, correct_num)
+            self.hint = None
             
-            if correct_pos == 4:
+            if correct_pos == self.pegs:
                 self.game_won = True
                 self.game_over = True
             elif len(self.attempts) >= self.max_attempts:
                 self.game_over = True
             
             # Reset current guess
-            self.current_guess = [0, 0, 0, 0]
+            self.current_guess = [0] * self.pegs
             self.current_position = 0
     
     def restart_game(self):
-        self.secret_code = [random.randint(1, 6) for _ in range(4)]
-        self.current_guess = [0, 0, 0, 0]
+        self.secret_code = [random.randint(1, self.colours) for _ in range(self.pegs)]
+        self.current_guess = [0] * self.pegs
         self.current_position = 0
         self.attempts = []
+        self.attempt_rows = []
         self.game_won = False
         self.game_over = False
+        self.hint = None
+        if self.hint_engine is not None:
+            self.hint_engine.reset()
+        if self.candidates is not None:
+            self.candidates.cancel()
+            self.candidates = CandidateSet(self.pegs, self.colours)
         print(f"New secret code (for testing): {self.secret_code}")
     
+    def close(self):
+        """Stop the background candidate pruning"""
+        if self.candidates is not None:
+            self.candidates.cancel()
+    
     def run(self):
         running = True
         while running:
@@ -200,8 +285,16 @@ class CodeBreaker:
             self.draw_game()
             self.clock.tick(60)
         
+        self.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = CodeBreaker()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Code Breaker")
+    parser.add_argument("--pegs", type=int, default=PEGS, help=f"code length (2-{MAX_PEGS})")
+    parser.add_argument("--colours", type=int, default=COLOURS, help=f"digits per peg (2-{MAX_COLOURS})")
+    args = parser.parse_args()
+    
+    game = CodeBreaker(pegs=args.pegs, colours=args.colours)
     game.run()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Code Breaker Solver - Feedback scoring, feedback table and hint engine
+score_guess() is the single definition of Code Breaker's peg feedback. The
+NumPy parts precompute the feedback of every guess against every secret,
+keep it memory-mapped on disk, and use it to suggest the next guess.
+"""
+
+import os
+import time
+import queue
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+PEGS = 4
+COLOURS = 6
+MAX_PEGS = 8
+MAX_COLOURS = 10
+
+# Largest code space that gets a full feedback table and hints (16 MB table)
+HINT_MAX_CODES = 4096
+
+# Codes scored per candidate-set chunk
+CHUNK_CODES = 1 << 20
+
+# Knuth's opening for 4 pegs / 6 colours
+KNUTH_OPENING = [1, 1, 2, 2]
+
+CACHE_DIR = os.environ.get("THINKVERSE_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "thinkverse"))
+
+
+def score_guess(secret, guess):
+    """Return (correct_position, correct_number) for a guess against a secret"""
+    correct_position = 0
+    secret_left = {}
+    guess_left = {}
+
+    for s, g in zip(secret, guess):
+        if s == g:
+            correct_position += 1
+        else:
+            secret_left[s] = secret_left.get(s, 0) + 1
+            guess_left[g] = guess_left.get(g, 0) + 1
+
+    correct_number = sum(min(count, secret_left.get(digit, 0))
+                         for digit, count in guess_left.items())
+    return correct_position, correct_number
+
+
+def feedback_code(correct_position, correct_number, pegs=PEGS):
+    """Pack a (correct_position, correct_number) pair into one small int"""
+    return correct_position * (pegs + 1) + correct_number
+
+
+def code_index(code, colours=COLOURS):
+    """Index of a code (digits 1..colours) in lexicographic order"""
+    index = 0
+    for digit in code:
+        index = index * colours + (digit - 1)
+    return index
+
+
+def index_code(index, pegs=PEGS, colours=COLOURS):
+    """Inverse of code_index"""
+    code = []
+    for _ in range(pegs):
+        index, digit = divmod(index, colours)
+        code.append(digit + 1)
+    return code[::-1]
+
+
+def all_codes(pegs=PEGS, colours=COLOURS):
+    """Every code as an (colours**pegs, pegs) array, in code_index order"""
+    indices = np.arange(colours ** pegs)
+    powers = colours ** np.arange(pegs - 1, -1, -1)
+    return (indices[:, None] // powers % colours + 1).astype(np.uint8)
+
+
+def build_feedback_table(pegs=PEGS, colours=COLOURS):
+    """Feedback of every guess (row) against every secret (column) as uint8"""
+    codes = all_codes(pegs, colours)
+    count = len(codes)
+    # Per-code colour histograms; total matches is the sum of per-colour minimums
+    histograms = np.zeros((count, colours), dtype=np.uint8)
+    for colour in range(colours):
+        histograms[:, colour] = (codes == colour + 1).sum(axis=1)
+
+    table = np.empty((count, count), dtype=np.uint8)
+    for start in range(0, count, 256):
+        rows = slice(start, start + 256)
+        black = (codes[rows, None, :] == codes[None, :, :]).sum(axis=2)
+        total = np.minimum(histograms[rows, None, :], histograms[None, :, :]).sum(axis=2)
+        table[rows] = black * (pegs + 1) + (total - black)
+    return table
+
+
+def load_feedback_table(pegs=PEGS, colours=COLOURS, cache_dir=CACHE_DIR):
+    """Memory-map the feedback table from disk, building it on first use"""
+    path = os.path.join(cache_dir, f"code_breaker_feedback_{pegs}x{colours}.npy")
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    table = build_feedback_table(pegs, colours)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, table)
+        os.replace(temp_path, path)  # Atomic, so readers never see a partial file
+        return np.load(path, mmap_mode="r")
+    except OSError as e:
+        print(f"Could not cache feedback table: {e}")
+        return table
+
+
+class HintEngine:
+    """Tracks the codes consistent with the attempts so far and suggests guesses
+
+    strategy is "minimax" (Knuth: smallest worst-case remaining set) or
+    "entropy" (most informative feedback split).
+    """
+
+    def __init__(self, strategy="minimax", pegs=PEGS, colours=COLOURS, table=None):
+        self.strategy = strategy
+        self.pegs = pegs
+        self.colours = colours
+        self.table = table if table is not None else load_feedback_table(pegs, colours)
+        self.feedback_count = (pegs + 1) ** 2
+        # First guess per strategy; it only depends on the board size
+        self.openings = {"minimax": KNUTH_OPENING} if (pegs, colours) == (PEGS, COLOURS) else {}
+        self.reset()
+
+    def reset(self):
+        self.candidates = np.arange(len(self.table))
+        self.attempt_count = 0
+
+    def add_attempt(self, guess, correct_position, correct_number):
+        """Keep only codes that would have produced the same feedback"""
+        row = self.table[code_index(guess, self.colours)]
+        feedback = feedback_code(correct_position, correct_number, self.pegs)
+        self.candidates = self.candidates[row[self.candidates] == feedback]
+        self.attempt_count += 1
+
+    def sync(self, attempts):
+        """Rebuild the candidate set from a list of (guess, pos, num) attempts"""
+        self.reset()
+        for guess, correct_position, correct_number in attempts:
+            self.add_attempt(guess, correct_position, correct_number)
+
+    def remaining(self):
+        return len(self.candidates)
+
+    def score_guesses(self, guesses):
+        """Lower-is-better score of each guess index against the candidates"""
+        feedback = self.table[guesses][:, self.candidates].astype(np.int64)
+        feedback += np.arange(len(guesses))[:, None] * self.feedback_count
+        partitions = np.bincount(feedback.ravel(), minlength=len(guesses) * self.feedback_count)
+        partitions = partitions.reshape(len(guesses), self.feedback_count)
+
+        if self.strategy == "entropy":
+            p = partitions / len(self.candidates)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                entropy = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+            return -entropy
+        return partitions.max(axis=1)
+
+    def suggest(self, budget_ms=40):
+        """Return the best guess found within the time budget, or None
+
+        Consistent codes are scored first so a guess that could win is always
+        available; the remaining codes are scored while time allows. A budget
+        of None scores every code.
+        """
+        if len(self.candidates) == 0:
+            return None
+        if len(self.candidates) <= 2:
+            return index_code(int(self.candidates[0]), self.pegs, self.colours)
+        if self.attempt_count == 0 and self.strategy in self.openings:
+            return list(self.openings[self.strategy])
+
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        is_candidate = np.zeros(len(self.table), dtype=bool)
+        is_candidate[self.candidates] = True
+        order = np.concatenate([self.candidates, np.flatnonzero(~is_candidate)])
+
+        # Chunks are sized so one chunk is a small slice of the budget
+        chunk = max(1, 200000 // len(self.candidates))
+        best_index, best_score = None, None
+        for start in range(0, len(order), chunk):
+            guesses = order[start:start + chunk]
+            scores = self.score_guesses(guesses)
+            # Ties keep the earlier guess, so consistent codes win ties
+            i = int(np.argmin(scores))
+            if best_score is None or scores[i] < best_score:
+                best_index, best_score = int(guesses[i]), scores[i]
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        else:
+            if self.attempt_count == 0:
+                self.openings[self.strategy] = index_code(best_index, self.pegs, self.colours)
+
+        return index_code(best_index, self.pegs, self.colours)
+
+
+class CandidateSet:
+    """Codes still consistent with the attempts, for any pegs/colours
+
+    The code space is split into chunks of colours**k codes that share
+    their leading digits, so the trailing digits of every chunk come from
+    one precomputed table. Each chunk keeps a bit-packed alive mask (8
+    codes per byte: 12.5 MB for 8 pegs x 10 colours). Attempts are pruned
+    chunk by chunk on a background thread; count is updated as it goes.
+    """
+
+    def __init__(self, pegs=PEGS, colours=COLOURS):
+        self.pegs = pegs
+        self.colours = colours
+        self.total = colours ** pegs
+
+        # Trailing digits per chunk: as many as fit in CHUNK_CODES
+        self.chunk_pegs = pegs
+        while self.chunk_pegs > 1 and colours ** self.chunk_pegs > CHUNK_CODES:
+            self.chunk_pegs -= 1
+        self.chunk_size = colours ** self.chunk_pegs
+        self.num_chunks = colours ** (pegs - self.chunk_pegs)
+
+        offsets = np.arange(self.chunk_size)
+        self.trailing_digits = [
+            (offsets // colours ** (self.chunk_pegs - 1 - p) % colours + 1).astype(np.uint8)
+            for p in range(self.chunk_pegs)
+        ]
+
+        alive = np.ones(self.chunk_size, dtype=bool)
+        self.bits = np.tile(np.packbits(alive), (self.num_chunks, 1))
+        self.count = self.total
+        self.pending = 0
+        self.lock = threading.Lock()  # Guards pending, changed by both threads
+        self.cancelled = False
+
+        self.attempts = queue.Queue()
+        self.worker = threading.Thread(target=self.prune_attempts, daemon=True)
+        self.worker.start()
+
+    def add_attempt(self, guess, correct_position, correct_number):
+        """Queue an attempt; pruning happens in the background"""
+        with self.lock:
+            self.pending += 1
+        self.attempts.put((list(guess), feedback_code(correct_position, correct_number, self.pegs)))
+
+    def is_pruning(self):
+        with self.lock:
+            return self.pending > 0
+
+    def wait(self):
+        """Block until every queued attempt has been applied"""
+        self.attempts.join()
+
+    def cancel(self):
+        """Stop the background thread; the set is unusable afterwards"""
+        self.cancelled = True
+        self.attempts.put(None)
+
+    def prune_attempts(self):
+        while True:
+            attempt = self.attempts.get()
+            try:
+                if attempt is None or self.cancelled:
+                    return
+                self.prune(*attempt)
+            finally:
+                if attempt is not None:
+                    with self.lock:
+                        self.pending -= 1
+                self.attempts.task_done()
+
+    def chunk_feedback(self, chunk, guess, offsets=None):
+        """Feedback codes of guess against the codes at offsets in a chunk"""
+        leading = index_code(chunk, self.pegs - self.chunk_pegs, self.colours)
+        trailing = self.trailing_digits
+        if offsets is not None:
+            trailing = [digits[offsets] for digits in trailing]
+        size = len(trailing[0])
+        lead_guess, trail_guess = guess[:len(leading)], guess[len(leading):]
+
+        black = np.full(size, sum(s == g for s, g in zip(leading, lead_guess)), dtype=np.uint8)
+        for digits, g in zip(trailing, trail_guess):
+            black += digits == g
+
+        # Matches per colour are min(count in code, count in guess)
+        total = np.zeros(size, dtype=np.uint8)
+        for colour in set(guess):
+            in_code = np.full(size, leading.count(colour), dtype=np.uint8)
+            for digits in trailing:
+                in_code += digits == colour
+            total += np.minimum(in_code, guess.count(colour))
+
+        return black * (self.pegs + 1) + (total - black)
+
+    def prune(self, guess, feedback):
+        for chunk in range(self.num_chunks):
+            if self.cancelled:
+                return
+            packed = self.bits[chunk]
+            if not packed.any():
+                continue
+
+            alive = np.unpackbits(packed, count=self.chunk_size).view(bool)
+            if alive.all():
+                keep = self.chunk_feedback(chunk, guess) == feedback
+            else:
+                offsets = np.flatnonzero(alive)
+                keep = np.zeros(self.chunk_size, dtype=bool)
+                keep[offsets] = self.chunk_feedback(chunk, guess, offsets) == feedback
+                keep &= alive
+
+            self.bits[chunk] = np.packbits(keep)
+            self.count -= int(alive.sum()) - int(keep.sum())
+
+    def codes(self, limit=None):
+        """Indices of the remaining codes (call wait() first for a final answer)"""
+        found = []
+        for chunk in range(self.num_chunks):
+            alive = np.unpackbits(self.bits[chunk], count=self.chunk_size)
+            found.append(np.flatnonzero(alive) + chunk * self.chunk_size)
+            if limit is not None and sum(len(f) for f in found) >= limit:
+                break
+        indices = np.concatenate(found)
+        return indices if limit is None else indices[:limit]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the Code Breaker feedback table and time hints")
+    parser.add_argument("--strategy", default="minimax", choices=["minimax", "entropy"])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = load_feedback_table()
+    print(f"Feedback table {table.shape} loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    engine = HintEngine(args.strategy, table=table)
+    secret = [3, 6, 2, 5]
+    while True:
+        start = time.perf_counter()
+        guess = engine.suggest()
+        elapsed = (time.perf_counter() - start) * 1000
+        feedback = score_guess(secret, guess)
+        print(f"{guess} -> {feedback} ({engine.remaining()} candidates, {elapsed:.1f} ms)")
+        if feedback[0] == PEGS:
+            break
+        engine.add_attempt(guess, *feedback)
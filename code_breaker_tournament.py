@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Code Breaker Tournament - Play every secret code against solver strategies
+Secrets are split across a process pool; feedback comes from score_guess,
+the same function CodeBreaker.check_guess uses, so results match the game.
+Requires numpy.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from code_breaker_solver import (HAS_NUMPY, HINT_MAX_CODES, PEGS, COLOURS,
+                                 HintEngine, index_code, load_feedback_table, score_guess)
+
+MAX_ATTEMPTS = 10  # CodeBreaker.max_attempts
+GUESS_LIMIT = 30   # Safety stop for strategies that never converge
+
+
+def random_consistent(engine, rng):
+    """Any code that is still possible"""
+    index = int(engine.candidates[rng.randrange(engine.remaining())])
+    return index_code(index, engine.pegs, engine.colours)
+
+
+def knuth(engine, rng):
+    """Minimax: smallest worst-case set of remaining codes"""
+    engine.strategy = "minimax"
+    return engine.suggest(budget_ms=None)
+
+
+def entropy(engine, rng):
+    """Guess whose feedback splits the remaining codes most evenly"""
+    engine.strategy = "entropy"
+    return engine.suggest(budget_ms=None)
+
+
+# Strategies take (HintEngine, random.Random) and return the next guess
+STRATEGIES = {
+    "random": random_consistent,
+    "knuth": knuth,
+    "entropy": entropy
+}
+
+# Per-process solver state, set up once by init_worker
+worker_engine = None
+
+
+def init_worker(pegs, colours):
+    global worker_engine
+    worker_engine = HintEngine(pegs=pegs, colours=colours, table=load_feedback_table(pegs, colours))
+
+
+def play_secrets(strategy_name, secrets, seed):
+    """Play a batch of secret indices; returns the number of guesses for each
+
+    A game still unsolved after GUESS_LIMIT guesses counts as None.
+    """
+    strategy = STRATEGIES[strategy_name]
+    engine = worker_engine
+    results = []
+
+    for secret_index in secrets:
+        secret = index_code(secret_index, engine.pegs, engine.colours)
+        rng = random.Random(seed * 1000003 + secret_index)
+        engine.reset()
+
+        for guesses in range(1, GUESS_LIMIT + 1):
+            guess = strategy(engine, rng)
+            correct_position, correct_number = score_guess(secret, guess)
+            if correct_position == engine.pegs:
+                break
+            engine.add_attempt(guess, correct_position, correct_number)
+        else:
+            guesses = None
+        results.append(guesses)
+
+    return results
+
+
+def run_tournament(strategies, pegs=PEGS, colours=COLOURS, workers=None, seed=0, batch_size=32):
+    """Play every secret against each strategy and summarize guesses and time"""
+    # Build the table once up front so workers only memory-map it
+    load_feedback_table(pegs, colours)
+    secrets = list(range(colours ** pegs))
+    batches = [secrets[i:i + batch_size] for i in range(0, len(secrets), batch_size)]
+    workers = workers or os.cpu_count() or 1
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(pegs, colours)) as pool:
+        for name in strategies:
+            start = time.perf_counter()
+            futures = [pool.submit(play_secrets, name, batch, seed) for batch in batches]
+            counts = [count for future in futures for count in future.result()]
+            elapsed = time.perf_counter() - start
+
+            # Guess statistics only cover solved games
+            solved = [count for count in counts if count is not None]
+            histogram = {}
+            for count in solved:
+                histogram[count] = histogram.get(count, 0) + 1
+            results[name] = {
+                "games": len(counts),
+                "unsolved": len(counts) - len(solved),
+                "mean_guesses": sum(solved) / len(solved) if solved else None,
+                "max_guesses": max(solved, default=None),
+                "solved_within_max_attempts": sum(1 for c in solved if c <= MAX_ATTEMPTS),
+                "histogram": dict(sorted(histogram.items())),
+                "wall_time_s": elapsed
+            }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Code Breaker solver tournament")
+    parser.add_argument("--strategies", nargs="*", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--pegs", type=int, default=PEGS)
+    parser.add_argument("--colours", type=int, default=COLOURS)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random strategy")
+    parser.add_argument("--output", help="optional JSON results file")
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("The tournament needs numpy: pip install numpy")
+        sys.exit(1)
+    if args.colours ** args.pegs > HINT_MAX_CODES:
+        print(f"Tournaments are limited to {HINT_MAX_CODES} possible codes")
+        sys.exit(1)
+
+    results = run_tournament(args.strategies, args.pegs, args.colours, args.workers, args.seed)
+
+    for name, stats in results.items():
+        mean = f"{stats['mean_guesses']:.3f}" if stats["mean_guesses"] is not None else "-"
+        print(f"{name:8} mean {mean}  max {stats['max_guesses']}  "
+              f"solved {stats['solved_within_max_attempts']}/{stats['games']}  "
+              f"unsolved {stats['unsolved']}  {stats['wall_time_s']:.2f} s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
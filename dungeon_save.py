@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Dungeon Save - Compact save slots and undo history for AI Dungeon Quest
+A run state is one fixed-size record: scene index, health, score and an
+inventory bitset. The undo history is a byte log of these records, so
+saving, loading and rewinding any number of steps are a few byte copies.
+"""
+
+import os
+import json
+import struct
+
+SAVE_DIR = os.environ.get("THINKVERSE_SAVE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".thinkverse", "saves"))
+
+MAGIC = b"TVDQ"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")  # magic, version, metadata length
+SNAPSHOT = struct.Struct("<iiiQ")  # scene index, health, score, inventory bits
+MAX_ITEMS = 64
+
+
+def encode_inventory(inventory, item_names):
+    """Inventory as a bitset over item_names; unknown items are interned"""
+    bits = 0
+    for item in inventory:
+        if item not in item_names:
+            if len(item_names) >= MAX_ITEMS:
+                raise ValueError(f"more than {MAX_ITEMS} distinct items")
+            item_names.append(item)
+        bits |= 1 << item_names.index(item)
+    return bits
+
+
+def decode_inventory(bits, item_names):
+    return [name for i, name in enumerate(item_names) if bits >> i & 1]
+
+
+class RunHistory:
+    """Log of packed snapshots, one per choice made
+
+    Entries are only ever appended; rewinding cuts the log back to the
+    restored entry so a new choice starts a new branch.
+    """
+
+    def __init__(self, data=b""):
+        self.log = bytearray(data)
+
+    def __len__(self):
+        return len(self.log) // SNAPSHOT.size
+
+    def push(self, snapshot):
+        self.log += SNAPSHOT.pack(*snapshot)
+
+    def rewind(self, steps=1):
+        """Drop the last steps entries and return the oldest one dropped
+
+        Returns None (and changes nothing) if there are fewer entries.
+        """
+        if steps < 1 or steps > len(self):
+            return None
+        offset = (len(self) - steps) * SNAPSHOT.size
+        snapshot = SNAPSHOT.unpack_from(self.log, offset)
+        del self.log[offset:]
+        return snapshot
+
+
+def slot_path(slot):
+    return os.path.join(SAVE_DIR, f"dungeon_slot{slot}.sav")
+
+
+def save_run(path, metadata, snapshot, history):
+    """Write metadata (JSON), the current snapshot and the history log"""
+    meta = json.dumps(metadata).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(meta)))
+        f.write(meta)
+        f.write(SNAPSHOT.pack(*snapshot))
+        f.write(history.log)
+    os.replace(temp_path, path)
+
+
+def load_run(path):
+    """Read a save file; returns (metadata, snapshot, RunHistory)"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, meta_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an AI Dungeon Quest save file")
+    offset = HEADER.size
+    metadata = json.loads(data[offset:offset + meta_length].decode("utf-8"))
+    offset += meta_length
+    snapshot = SNAPSHOT.unpack_from(data, offset)
+    offset += SNAPSHOT.size
+    return metadata, snapshot, RunHistory(data[offset:])
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Dungeon Story - Story loading and compilation for AI Dungeon Quest
+Stories are authored as JSON (scene id -> text and choices) and compiled at
+load time into an integer index: scenes live in a list and choice targets
+are int arrays. Choice conditions and effects are compiled into closures.
+Large stories can be precompiled into a directory of chunk files that are
+only read when one of their scenes is visited.
+"""
+
+import os
+import sys
+import json
+from array import array
+
+STORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stories")
+DEFAULT_STORY = os.path.join(STORY_DIR, "default.json")
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Scene:
+    """One compiled scene: text plus parallel per-choice lists
+
+    conditions and effects hold a compiled closure per choice (None when
+    the choice has no rule); rules keeps the authored specs for tools.
+    """
+
+    __slots__ = ("index", "id", "text", "choice_labels", "targets", "conditions", "effects", "rules")
+
+    def __init__(self, index, scene_id, text, choice_labels, targets, rules=None):
+        self.index = index
+        self.id = scene_id
+        self.text = text
+        self.choice_labels = choice_labels
+        self.targets = targets  # array("i") of scene indices
+        self.rules = rules if rules is not None else [None] * len(choice_labels)
+        if any(self.rules):
+            self.conditions = [compile_condition(rule.get("requires")) if rule else None for rule in self.rules]
+            self.effects = [compile_effect(rule.get("effects")) if rule else None for rule in self.rules]
+        else:
+            self.conditions = self.effects = self.rules  # All None; never mutated
+
+    def available(self, player, choice_number):
+        """Whether the player meets a choice's conditions"""
+        condition = self.conditions[choice_number]
+        return condition is None or condition(player)
+
+    def apply(self, player, choice_number):
+        """Run a choice's effects on the player"""
+        effect = self.effects[choice_number]
+        if effect is not None:
+            effect(player)
+
+
+def choice_rule_spec(choice):
+    """The requires/effects part of an authored choice, or None"""
+    if "requires" not in choice and "effects" not in choice:
+        return None
+    return {key: choice[key] for key in ("requires", "effects") if key in choice}
+
+
+def compile_condition(spec):
+    """Compile a requires spec into a predicate on the player, or None
+
+    spec: {"items": [...], "min_health": n, "min_score": n}; a bare string
+    is shorthand for one required item.
+    """
+    if not spec:
+        return None
+    if isinstance(spec, str):
+        spec = {"items": [spec]}
+
+    checks = []
+    items = tuple(spec.get("items", ()))
+    if len(items) == 1:
+        item = items[0]
+        checks.append(lambda player: item in player.inventory)
+    elif items:
+        checks.append(lambda player: all(item in player.inventory for item in items))
+    if "min_health" in spec:
+        min_health = spec["min_health"]
+        checks.append(lambda player: player.health >= min_health)
+    if "min_score" in spec:
+        min_score = spec["min_score"]
+        checks.append(lambda player: player.score >= min_score)
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda player: all(check(player) for check in checks)
+
+
+def compile_effect(spec):
+    """Compile an effects spec into a function that updates the player, or None
+
+    spec: {"add_items": [...], "remove_items": [...], "score": n, "health": n}
+    """
+    if not spec:
+        return None
+
+    steps = []
+    add_items = tuple(spec.get("add_items", ()))
+    if add_items:
+        def add(player):
+            for item in add_items:
+                player.add_item(item)
+        steps.append(add)
+    remove_items = tuple(spec.get("remove_items", ()))
+    if remove_items:
+        def remove(player):
+            for item in remove_items:
+                player.remove_item(item)
+        steps.append(remove)
+    score = spec.get("score", 0)
+    if score:
+        def add_score(player):
+            player.score += score
+        steps.append(add_score)
+    health = spec.get("health", 0)
+    if health:
+        def change_health(player):
+            player.health = max(0, min(100, player.health + health))
+        steps.append(change_health)
+
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def run_all(player):
+        for step in steps:
+            step(player)
+    return run_all
+
+
+class Story:
+    """A compiled story; scenes are addressed by integer index
+
+    Scenes are stored in chunks of chunk_size consecutive indices. A story
+    compiled from a single JSON file has every chunk loaded up front; a
+    chunked story directory loads each chunk on first access.
+    """
+
+    def __init__(self, title, start, scene_count, chunk_size, load_chunk=None, dangling=None, items=None):
+        self.title = title
+        self.start = start
+        self.scene_count = scene_count
+        self.chunk_size = max(1, chunk_size)
+        self.load_chunk = load_chunk
+        self.chunks = {}
+        self.scene_index = None  # scene id -> index, built on demand
+        self.added_index = None  # scene id -> index for add_scene targets
+        # scene index -> [(choice number, missing target id)]
+        self.dangling = dangling if dangling is not None else {}
+        self.items = items if items is not None else []  # Every item named by a rule
+
+    def __len__(self):
+        return self.scene_count
+
+    def scene(self, index):
+        """Return the Scene at an index, falling back to the start scene"""
+        if not 0 <= index < self.scene_count:
+            index = self.start
+        chunk_number, offset = divmod(index, self.chunk_size)
+        chunk = self.chunks.get(chunk_number)
+        if chunk is None:
+            chunk = self.load_chunk(chunk_number)
+            self.chunks[chunk_number] = chunk
+        return chunk[offset]
+
+    def scenes(self):
+        """Iterate over every scene in index order (loads every chunk)"""
+        for first in range(0, self.scene_count, self.chunk_size):
+            self.scene(first)  # Make sure the chunk is loaded
+            yield from self.chunks[first // self.chunk_size]
+
+    def add_scene(self, scene_id, text, choice_labels, target_ids):
+        """Append a scene (e.g. a generated one) and return its index
+
+        Targets resolve to the start scene or to scenes added this way;
+        any other target is recorded as dangling, like at compile time.
+        """
+        index = self.scene_count
+        chunk_number, offset = divmod(index, self.chunk_size)
+        if offset == 0:
+            self.chunks[chunk_number] = []
+        else:
+            self.scene(index - 1)  # Load the partly filled last chunk
+
+        if self.added_index is None:
+            self.added_index = {self.scene(self.start).id: self.start}
+        targets = array("i")
+        for choice_number, target_id in enumerate(target_ids):
+            target = self.added_index.get(target_id)
+            if target is None:
+                self.dangling.setdefault(index, []).append((choice_number, target_id))
+                target = self.start
+            targets.append(target)
+
+        self.chunks[chunk_number].append(Scene(index, scene_id, text, list(choice_labels), targets))
+        self.scene_count += 1
+        self.added_index[scene_id] = index
+        if self.scene_index is not None:
+            self.scene_index[scene_id] = index
+        return index
+
+    def link(self, scene_index, choice_number, target):
+        """Point a dangling choice at an existing scene"""
+        self.scene(scene_index).targets[choice_number] = target
+        links = [link for link in self.dangling.get(scene_index, []) if link[0] != choice_number]
+        if links:
+            self.dangling[scene_index] = links
+        else:
+            self.dangling.pop(scene_index, None)
+
+    def index_of(self, scene_id):
+        """Index of a scene id, or None if the story has no such scene"""
+        if self.scene_index is None:
+            self.scene_index = {scene.id: scene.index for scene in self.scenes()}
+        return self.scene_index.get(scene_id)
+
+
+def compile_scenes(data, source="story", warn=True):
+    """Compile authored story data into (title, start index, [Scene], dangling)
+
+    Choices that point at missing scenes are reported once and redirected
+    to the start scene, which is what the game used to do at runtime.
+    dangling maps scene index -> [(choice number, missing target id)].
+    """
+    raw_scenes = data["scenes"]
+    scene_ids = list(raw_scenes)
+    scene_index = {scene_id: i for i, scene_id in enumerate(scene_ids)}
+
+    start_id = data.get("start", "start")
+    if start_id not in scene_index:
+        raise ValueError(f"{source}: start scene '{start_id}' does not exist")
+    start = scene_index[start_id]
+
+    dangling = {}
+    scenes = []
+    for i, scene_id in enumerate(scene_ids):
+        raw = raw_scenes[scene_id]
+        choices = raw.get("choices", [])
+        labels = [choice["text"] for choice in choices]
+        targets = array("i", [scene_index.get(choice["target"], -1) for choice in choices])
+        if -1 in targets:
+            for choice_number, target in enumerate(targets):
+                if target == -1:
+                    dangling.setdefault(i, []).append((choice_number, choices[choice_number]["target"]))
+                    targets[choice_number] = start
+        rules = [choice_rule_spec(choice) for choice in choices]
+        scenes.append(Scene(i, scene_id, raw["text"], labels, targets, rules))
+
+    if dangling and warn:
+        missing = sorted({target_id for links in dangling.values() for _, target_id in links})
+        print(f"Warning: {source} has {len(missing)} missing scene(s), "
+              f"redirected to '{start_id}': {', '.join(missing)}")
+
+    return data.get("title", ""), start, scenes, dangling
+
+
+def story_items(scenes):
+    """Sorted names of every item a choice requires, adds or removes"""
+    items = set()
+    for scene in scenes:
+        for rule in scene.rules:
+            if not rule:
+                continue
+            requires = rule.get("requires") or {}
+            if isinstance(requires, str):
+                requires = {"items": [requires]}
+            effects = rule.get("effects") or {}
+            items.update(requires.get("items", ()))
+            items.update(effects.get("add_items", ()))
+            items.update(effects.get("remove_items", ()))
+    return sorted(items)
+
+
+def load_story(path=DEFAULT_STORY, warn=True):
+    """Load a story JSON file or a compiled chunk directory"""
+    if os.path.isdir(path):
+        return load_chunked_story(path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    title, start, scenes, dangling = compile_scenes(data, os.path.basename(path), warn)
+
+    story = Story(title, start, len(scenes), len(scenes), dangling=dangling, items=story_items(scenes))
+    story.chunks[0] = scenes
+    return story
+
+
+def chunk_path(directory, chunk_number):
+    return os.path.join(directory, f"chunk_{chunk_number:05d}.json")
+
+
+def load_chunked_story(directory):
+    """Open a compiled story directory; only the manifest is read up front"""
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    def load_chunk(chunk_number):
+        with open(chunk_path(directory, chunk_number), "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        first = chunk_number * manifest["chunk_size"]
+        return [Scene(first + i, row["id"], row["text"], row["labels"], array("i", row["targets"]),
+                      row.get("rules"))
+                for i, row in enumerate(rows)]
+
+    dangling = {}
+    for scene_index, choice_number, target_id in manifest.get("dangling", []):
+        dangling.setdefault(scene_index, []).append((choice_number, target_id))
+
+    return Story(manifest.get("title", ""), manifest["start"], manifest["scene_count"],
+                 manifest["chunk_size"], load_chunk, dangling, manifest.get("items"))
+
+
+def write_chunked_story(source_path, directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compile a story JSON file into a manifest plus chunk files"""
+    with open(source_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    title, start, scenes, dangling = compile_scenes(data, os.path.basename(source_path))
+
+    os.makedirs(directory, exist_ok=True)
+    for chunk_number, first in enumerate(range(0, len(scenes), chunk_size)):
+        rows = [{"id": scene.id, "text": scene.text, "labels": scene.choice_labels,
+                 "targets": list(scene.targets), "rules": scene.rules}
+                for scene in scenes[first:first + chunk_size]]
+        with open(chunk_path(directory, chunk_number), "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+
+    manifest = {
+        "title": title,
+        "start": start,
+        "scene_count": len(scenes),
+        "chunk_size": chunk_size,
+        "items": story_items(scenes),
+        "dangling": [[scene_index, choice_number, target_id]
+                     for scene_index, links in sorted(dangling.items())
+                     for choice_number, target_id in links]
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile an AI Dungeon Quest story into chunk files")
+    parser.add_argument("source", help="story JSON file")
+    parser.add_argument("output", help="directory for the manifest and chunk files")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        manifest = write_chunked_story(args.source, args.output, args.chunk_size)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not compile story: {e}")
+        sys.exit(1)
+    chunks = (manifest["scene_count"] + args.chunk_size - 1) // args.chunk_size
+    print(f"Compiled {manifest['scene_count']} scenes into {chunks} chunk(s) in {args.output}")
@@ -8,6 +8,9 @@ import random
 import sys
 import time
 
+from text_cache import render_text
+from grid_geometry import GridGeometry
+
 pygame.init()
 
 # Constants
@@ -26,10 +29,13 @@ CYAN = (0, 255, 255)
 PURPLE = (128, 0, 128)
 
 class Escape404:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Escape 404 - Digital Escape Room")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 36)
         self.font_medium = pygame.font.Font(None, 24)
         self.font_small = pygame.font.Font(None, 18)
@@ -51,6 +57,8 @@ class Escape404:
         self.network_path = []
         self.network_start = (0, 0)
         self.network_end = (4, 4)
+        # Shared by drawing and click handling
+        self.network_geometry = GridGeometry(200, 150, 5, 5, 60, 58)
         
         # Room 3: Password Cracking
         self.password_clues = [
@@ -95,7 +103,7 @@ class Escape404:
             if "404" in line:
                 color = YELLOW
             
-            text_surface = self.font_mono.render(line, True, color)
+            text_surface = render_text(self.font_mono, line, True, color)
             self.screen.blit(text_surface, (50, y_offset + i * 25))
         
         # Blinking cursor
@@ -105,12 +113,12 @@ class Escape404:
         else:
             cursor_text = "> " + self.terminal_input + " "
         
-        cursor_surface = self.font_mono.render(cursor_text, True, GREEN)
+        cursor_surface = render_text(self.font_mono, cursor_text, True, GREEN)
         self.screen.blit(cursor_surface, (50, y_offset + len(self.terminal_lines) * 25 + 20))
         
         # Instructions
         instruction_text = "Type 'start' to begin the escape sequence"
-        instruction_surface = self.font_small.render(instruction_text, True, GRAY)
+        instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
         self.screen.blit(instruction_surface, (50, SCREEN_HEIGHT - 50))
     
     def draw_room1_binary(self):
@@ -118,7 +126,7 @@ class Escape404:
         
         # Room title
         title_text = "ROOM 1: BINARY DECODER"
-        title_surface = self.font_large.render(title_text, True, CYAN)
+        title_surface = render_text(self.font_large, title_text, True, CYAN)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 50))
         self.screen.blit(title_surface, title_rect)
         
@@ -140,23 +148,23 @@ class Escape404:
             elif line == self.binary_code:
                 color = GREEN
             
-            text_surface = self.font_medium.render(line, True, color)
+            text_surface = render_text(self.font_medium, line, True, color)
             self.screen.blit(text_surface, (100, 120 + i * 30))
         
         # Input field
         input_text = "Decoded: " + self.binary_input + "_"
-        input_surface = self.font_medium.render(input_text, True, WHITE)
+        input_surface = render_text(self.font_medium, input_text, True, WHITE)
         self.screen.blit(input_surface, (100, 350))
         
         # Hint
         if self.hints_used == 0:
             hint_text = "HINT: Each 8-bit sequence represents one ASCII character (Press H for hint)"
-            hint_surface = self.font_small.render(hint_text, True, GRAY)
+            hint_surface = render_text(self.font_small, hint_text, True, GRAY)
             self.screen.blit(hint_surface, (100, 400))
         
         # Progress
         progress_text = f"Puzzles Solved: {len(self.puzzles_solved)}/3"
-        progress_surface = self.font_small.render(progress_text, True, BLUE)
+        progress_surface = render_text(self.font_small, progress_text, True, BLUE)
         self.screen.blit(progress_surface, (100, SCREEN_HEIGHT - 50))
     
     def draw_room2_network(self):
@@ -164,24 +172,21 @@ class Escape404:
         
         # Room title
         title_text = "ROOM 2: NETWORK ROUTING"
-        title_surface = self.font_large.render(title_text, True, CYAN)
+        title_surface = render_text(self.font_large, title_text, True, CYAN)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 50))
         self.screen.blit(title_surface, title_rect)
         
         # Description
         desc_text = "Route data packets from START to END avoiding firewalls (red blocks)"
-        desc_surface = self.font_medium.render(desc_text, True, WHITE)
+        desc_surface = render_text(self.font_medium, desc_text, True, WHITE)
         self.screen.blit(desc_surface, (100, 100))
         
         # Draw network grid
-        grid_start_x = 200
-        grid_start_y = 150
-        cell_size = 60
-        
-        for y in range(5):
-            for x in range(5):
-                rect_x = grid_start_x + x * cell_size
-                rect_y = grid_start_y + y * cell_size
+        geometry = self.network_geometry
+        
+        for y in range(geometry.rows):
+            for x in range(geometry.columns):
+                rect = geometry.cell_rect(x, y)
                 
                 # Determine cell color
                 if (x, y) == self.network_start:
@@ -195,8 +200,8 @@ class Escape404:
                 else:
                     color = WHITE  # Free space
                 
-                pygame.draw.rect(self.screen, color, (rect_x, rect_y, cell_size-2, cell_size-2))
-                pygame.draw.rect(self.screen, BLACK, (rect_x, rect_y, cell_size-2, cell_size-2), 2)
+                pygame.draw.rect(self.screen, color, rect)
+                pygame.draw.rect(self.screen, BLACK, rect, 2)
                 
                 # Labels
                 if (x, y) == self.network_start:
@@ -209,8 +214,8 @@ class Escape404:
                     label = ""
                 
                 if label:
-                    label_surface = self.font_medium.render(label, True, BLACK)
-                    label_rect = label_surface.get_rect(center=(rect_x + cell_size//2, rect_y + cell_size//2))
+                    label_surface = render_text(self.font_medium, label, True, BLACK)
+                    label_rect = label_surface.get_rect(center=geometry.cell_center(x, y))
                     self.screen.blit(label_surface, label_rect)
         
         # Instructions
@@ -221,13 +226,13 @@ class Escape404:
         ]
         
         for i, line in enumerate(instruction_lines):
-            text_surface = self.font_small.render(line, True, WHITE)
+            text_surface = render_text(self.font_small, line, True, WHITE)
             self.screen.blit(text_surface, (100, 500 + i * 20))
         
         # Check if path is valid
         if self.is_valid_path():
             success_text = "Valid path found! Press ENTER to proceed."
-            success_surface = self.font_medium.render(success_text, True, GREEN)
+            success_surface = render_text(self.font_medium, success_text, True, GREEN)
             self.screen.blit(success_surface, (100, 580))
     
     def draw_room3_password(self):
@@ -235,18 +240,18 @@ class Escape404:
         
         # Room title
         title_text = "ROOM 3: PASSWORD AUTHENTICATION"
-        title_surface = self.font_large.render(title_text, True, CYAN)
+        title_surface = render_text(self.font_large, title_text, True, CYAN)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 50))
         self.screen.blit(title_surface, title_rect)
         
         # Description
         desc_text = "Final security layer: Crack the admin password using the clues"
-        desc_surface = self.font_medium.render(desc_text, True, WHITE)
+        desc_surface = render_text(self.font_medium, desc_text, True, WHITE)
         self.screen.blit(desc_surface, (100, 100))
         
         # Password clues
         clue_title = "RECOVERED DATA FRAGMENTS:"
-        clue_title_surface = self.font_medium.render(clue_title, True, YELLOW)
+        clue_title_surface = render_text(self.font_medium, clue_title, True, YELLOW)
         self.screen.blit(clue_title_surface, (100, 150))
         
         clues = [
@@ -256,29 +261,29 @@ class Escape404:
         ]
         
         for i, clue in enumerate(clues):
-            clue_surface = self.font_small.render(clue, True, WHITE)
+            clue_surface = render_text(self.font_small, clue, True, WHITE)
             self.screen.blit(clue_surface, (120, 180 + i * 25))
         
         # Password input
         input_y = 300
         input_label = "ADMIN PASSWORD: "
         input_text = input_label + "*" * len(self.password_input) + "_"
-        input_surface = self.font_medium.render(input_text, True, GREEN)
+        input_surface = render_text(self.font_medium, input_text, True, GREEN)
         self.screen.blit(input_surface, (100, input_y))
         
         # Actual input (for debugging - remove in production)
         debug_text = f"Debug: {self.password_input}"
-        debug_surface = self.font_small.render(debug_text, True, GRAY)
+        debug_surface = render_text(self.font_small, debug_text, True, GRAY)
         self.screen.blit(debug_surface, (100, input_y + 30))
         
         # Hint
         hint_text = "HINT: Look for patterns in the personal information"
-        hint_surface = self.font_small.render(hint_text, True, GRAY)
+        hint_surface = render_text(self.font_small, hint_text, True, GRAY)
         self.screen.blit(hint_surface, (100, 400))
         
         # Instructions
         instruction_text = "Type the password and press ENTER"
-        instruction_surface = self.font_small.render(instruction_text, True, WHITE)
+        instruction_surface = render_text(self.font_small, instruction_text, True, WHITE)
         self.screen.blit(instruction_surface, (100, 450))
     
     def draw_victory(self):
@@ -310,7 +315,7 @@ class Escape404:
             elif line.startswith("Time") or line.startswith("Hints") or line.startswith("Puzzles"):
                 color = WHITE
             
-            text_surface = self.font_medium.render(line, True, color)
+            text_surface = render_text(self.font_medium, line, True, color)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, 100 + i * 30))
             self.screen.blit(text_surface, text_rect)
     
@@ -400,17 +405,10 @@ class Escape404:
             
             elif event.type == pygame.MOUSEBUTTONDOWN and self.game_state == "room2":
                 # Handle network grid clicking
-                mouse_x, mouse_y = event.pos
-                grid_start_x = 200
-                grid_start_y = 150
-                cell_size = 60
-                
-                # Calculate grid position
-                grid_x = (mouse_x - grid_start_x) // cell_size
-                grid_y = (mouse_y - grid_start_y) // cell_size
+                pos = self.network_geometry.cell_at(*event.pos)
                 
-                if 0 <= grid_x < 5 and 0 <= grid_y < 5:
-                    pos = (grid_x, grid_y)
+                if pos is not None:
+                    grid_x, grid_y = pos
                     
                     if event.button == 1:  # Left click
                         if self.network_grid[grid_y][grid_x] == 0:  # Not an obstacle
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Grid Geometry - Pixel layout of on-screen cell grids
+One object answers both "where do I draw cell (col, row)" and "which cell
+is under this pixel", so drawing and mouse handling share the same numbers.
+Hit-testing is plain arithmetic, independent of the number of cells.
+"""
+
+
+class GridGeometry:
+    """A grid of square cells laid out on a fixed pitch
+
+    Cells are addressed as (col, row). Each cell is cell pixels wide and
+    cells start every pitch pixels; the remainder is the gap between them.
+    """
+
+    def __init__(self, x, y, columns, rows, pitch, cell=None):
+        self.x = x
+        self.y = y
+        self.columns = columns
+        self.rows = rows
+        self.pitch = pitch
+        self.cell = cell if cell is not None else pitch
+
+    @property
+    def size(self):
+        """Pixel size of the whole grid, gaps included"""
+        return self.columns * self.pitch, self.rows * self.pitch
+
+    def cell_offset(self, col, row):
+        """Top-left corner of a cell relative to the grid's own corner"""
+        return col * self.pitch, row * self.pitch
+
+    def cell_rect(self, col, row):
+        return (self.x + col * self.pitch, self.y + row * self.pitch, self.cell, self.cell)
+
+    def cell_center(self, col, row):
+        return (self.x + col * self.pitch + self.cell // 2,
+                self.y + row * self.pitch + self.cell // 2)
+
+    def cell_at(self, x, y):
+        """(col, row) of the cell under a pixel, or None for gaps and outside"""
+        dx = x - self.x
+        dy = y - self.y
+        if dx < 0 or dy < 0:
+            return None
+        col, col_offset = divmod(dx, self.pitch)
+        row, row_offset = divmod(dy, self.pitch)
+        if col >= self.columns or row >= self.rows:
+            return None
+        if col_offset >= self.cell or row_offset >= self.cell:
+            return None
+        return col, row
@@ -7,6 +7,11 @@ import pygame
 import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from text_cache import render_text
+from grid_geometry import GridGeometry
+from reaction_log import REACTION_LOG, ReactionLogger
 
 pygame.init()
 
@@ -23,56 +28,194 @@ GRAY = (128, 128, 128)
 LIGHT_GRAY = (200, 200, 200)
 LIGHT_BLUE = (173, 216, 230)
 
+MAX_GRID_SIZE = 5         # Classic mode
+LARGE_MAX_GRID_SIZE = 40  # Large-board mode
+SEQUENCE_PREVIEW = 12     # Positions listed on the result screen
+
+
+def grid_size_for_level(level, large=False):
+    """Board size for a level: classic grows every 3 levels, large every level"""
+    if large:
+        return min(LARGE_MAX_GRID_SIZE, 6 + 2 * level)
+    return min(MAX_GRID_SIZE, 3 + level // 3)
+
+
+def pattern_length_for_level(level, grid_size, large=False):
+    """Numbers to memorize; large boards reach hundreds of cells"""
+    length = level * level + 2 if large else level + 2
+    return min(length, grid_size * grid_size)
+
+
+def level_pattern(seed, level, attempt, large=False):
+    """Pattern for one attempt at a level as (row, col, number) tuples
+    
+    The cells are drawn in a single random.sample over the flattened
+    board, so even near-full boards take one pass. The same seed, level
+    and attempt always give the same pattern.
+    """
+    rng = random.Random(f"{seed}:{level}:{attempt}")
+    grid_size = grid_size_for_level(level, large)
+    cells = rng.sample(range(grid_size * grid_size),
+                       pattern_length_for_level(level, grid_size, large))
+    return [(cell // grid_size, cell % grid_size, i + 1) for i, cell in enumerate(cells)]
+
+
+class PatternPool:
+    """Generates upcoming patterns on a worker thread
+    
+    After each round starts, the pattern for the next level and for a
+    retry of the current one are queued, so advancing never waits on
+    generation.
+    """
+    
+    def __init__(self, seed, large=False):
+        self.seed = seed
+        self.large = large
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-patterns")
+        self.futures = {}
+    
+    def prefetch(self, keys):
+        """Queue (level, attempt) keys and drop any other queued patterns"""
+        for key in list(self.futures):
+            if key not in keys:
+                self.futures.pop(key).cancel()
+        for level, attempt in keys:
+            if (level, attempt) not in self.futures:
+                self.futures[(level, attempt)] = self.executor.submit(
+                    level_pattern, self.seed, level, attempt, self.large)
+    
+    def take(self, level, attempt):
+        """Pattern for (level, attempt), generated here if it was not queued"""
+        future = self.futures.pop((level, attempt), None)
+        if future is None:
+            return level_pattern(self.seed, level, attempt, self.large)
+        return future.result()
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 class MemoryMatrix:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None, large=False, level=1, seed=None, log_path=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Memory Matrix")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
         
-        self.grid_size = 3  # Start with 3x3 grid
-        self.level = 1
+        self.large = large
+        self.start_level = level
+        self.level = level
+        self.grid_size = grid_size_for_level(level, large)
         self.score = 0
         self.lives = 3
         
+        # Patterns depend only on (seed, level, attempt), so a seed replays a session
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.attempts = {}  # level -> patterns generated for it so far
+        self.pattern_pool = PatternPool(self.seed, large)
+        
         self.game_state = "menu"  # menu, showing, input, result
         self.pattern = []
         self.user_input = []
+        self.pattern_at = {}  # (row, col) -> number in the pattern
+        self.input_at = {}    # (row, col) -> order it was selected in
         self.show_start_time = 0
         self.show_duration = 3000  # 3 seconds
         
+        # Reaction times in ns after the pattern is hidden, one per user_input entry;
+        # rounds are only logged when a log_path is given
+        self.input_start_ns = 0
+        self.input_times = []
+        self.undos = 0
+        self.reaction_log = ReactionLogger(log_path) if log_path else None
+        
         self.selected_row = 0
         self.selected_col = 0
         
+        # Outcome of the last round, set once by finish_round
+        self.last_correct = False
+        self.correct_sequence_text = ""
+        
+        # Rendered once per level, see grid_layers
+        self.cell_fonts = {}
+        self.grid_surface = None
+        self.pattern_layer = None
+        self.input_surface = None
+        
         self.generate_pattern()
     
     def generate_pattern(self):
-        """Generate a random pattern for the current level"""
-        self.pattern = []
-        pattern_length = min(self.level + 2, self.grid_size * self.grid_size)
-        
-        # Generate unique positions
-        positions = []
-        for _ in range(pattern_length):
-            while True:
-                pos = (random.randint(0, self.grid_size - 1), random.randint(0, self.grid_size - 1))
-                if pos not in positions:
-                    positions.append(pos)
-                    break
-        
-        # Assign numbers to positions
-        for i, pos in enumerate(positions):
-            self.pattern.append((pos[0], pos[1], i + 1))
-        
+        """Take the pattern for the current level and queue the likely next ones"""
+        attempt = self.attempts.get(self.level, 0)
+        self.attempts[self.level] = attempt + 1
+        self.pattern = self.pattern_pool.take(self.level, attempt)
+        self.pattern_pool.prefetch([(self.level + 1, self.attempts.get(self.level + 1, 0)),
+                                    (self.level, attempt + 1)])
+        
+        self.pattern_at = {(row, col): number for row, col, number in self.pattern}
         self.user_input = []
+        self.input_at = {}
+        self.input_times = []
+        self.undos = 0
+        self.selected_row = min(self.selected_row, self.grid_size - 1)
+        self.selected_col = min(self.selected_col, self.grid_size - 1)
+        self.geometry = self.grid_geometry_for(self.grid_size)
+        self.grid_surface = self.pattern_layer = self.input_surface = None
+    
+    def start_showing(self):
+        self.game_state = "showing"
+        self.show_start_time = pygame.time.get_ticks()
+        # Input timing starts when the pattern is due to disappear
+        self.input_start_ns = time.monotonic_ns() + self.show_duration * 1_000_000
+    
+    def finish_round(self):
+        """Score the completed input; runs exactly once per round"""
+        self.last_correct = self.check_answer()
+        sequence = sorted(self.pattern, key=lambda x: x[2])
+        self.correct_sequence_text = "Correct sequence was: " + " → ".join(
+            [f"({r+1},{c+1})" for r, c, n in sequence[:SEQUENCE_PREVIEW]])
+        if len(sequence) > SEQUENCE_PREVIEW:
+            self.correct_sequence_text += f" → ... ({len(sequence) - SEQUENCE_PREVIEW} more)"
+        
+        if self.reaction_log is not None:
+            self.reaction_log.log({
+                "time": time.time(),
+                "seed": self.seed,
+                "level": self.level,
+                "attempt": self.attempts[self.level] - 1,
+                "large": self.large,
+                "grid_size": self.grid_size,
+                "pattern_length": len(self.pattern),
+                "show_duration_ms": self.show_duration,
+                "correct": self.last_correct,
+                "undos": self.undos,
+                "selection_ns": self.input_times
+            })
+        
+        if self.last_correct:
+            self.score += self.level * 10
+            self.level += 1
+            self.grid_size = grid_size_for_level(self.level, self.large)
+        else:
+            self.lives -= 1
+        self.game_state = "result"
+    
+    def update(self):
+        """Advance timer-driven state; drawing never changes the game"""
+        if self.game_state == "showing":
+            if pygame.time.get_ticks() - self.show_start_time >= self.show_duration:
+                self.game_state = "input"
     
     def draw_menu(self):
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Memory Matrix", True, BLUE)
+        title_text = render_text(self.font_large, "Memory Matrix", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
@@ -83,66 +226,137 @@ class MemoryMatrix:
             "Then click on the positions in the correct order.",
             "",
             "Press SPACE to start",
-            "Use arrow keys and ENTER to select positions",
+            "Click positions, or use arrow keys and ENTER",
             "Press ESC to quit"
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.font_small.render(instruction, True, BLACK)
+            text = render_text(self.font_small, instruction, True, BLACK)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 200 + i * 30))
             self.screen.blit(text, text_rect)
         
         # Level and score info
         level_text = f"Level: {self.level} | Score: {self.score} | Lives: {self.lives}"
-        level_surface = self.font_medium.render(level_text, True, BLUE)
+        level_surface = render_text(self.font_medium, level_text, True, BLUE)
         level_rect = level_surface.get_rect(center=(SCREEN_WIDTH//2, 450))
         self.screen.blit(level_surface, level_rect)
     
+    def grid_geometry_for(self, grid_size):
+        """Layout of a grid_size board
+        
+        Small grids keep the classic 80 px pitch; large boards shrink the
+        cells to fit the space under the header.
+        """
+        if grid_size <= MAX_GRID_SIZE:
+            grid_start_y, pitch, cell = 200, 80, 70
+        else:
+            grid_start_y = 170
+            pitch = min(80, (SCREEN_WIDTH - 40) // grid_size,
+                        (SCREEN_HEIGHT - 30 - grid_start_y) // grid_size)
+            cell = pitch - max(1, pitch // 8)
+        grid_start_x = (SCREEN_WIDTH - grid_size * pitch) // 2
+        return GridGeometry(grid_start_x, grid_start_y, grid_size, grid_size, pitch, cell)
+    
+    def cell_font(self, size):
+        """Font scaled to the cell size, created once per size"""
+        size = max(8, size)
+        if size not in self.cell_fonts:
+            self.cell_fonts[size] = pygame.font.Font(None, size)
+        return self.cell_fonts[size]
+    
+    def draw_number(self, surface, row, col, number, font, color):
+        """Draw a number centred in a cell of a grid-sized layer"""
+        x, y = self.geometry.cell_offset(col, row)
+        num_text = render_text(font, str(number), True, color)
+        num_rect = num_text.get_rect(center=(x + self.geometry.cell // 2, y + self.geometry.cell // 2))
+        surface.blit(num_text, num_rect)
+    
+    def grid_layers(self):
+        """Cached surfaces for the current level: (empty grid, pattern numbers)
+        
+        Both only change when a new pattern is generated, so they are
+        rendered once per level instead of cell by cell every frame.
+        """
+        if self.grid_surface is None:
+            cell = self.geometry.cell
+            border = 2 if cell >= 20 else 1
+            
+            self.grid_surface = pygame.Surface(self.geometry.size, pygame.SRCALPHA)
+            for row in range(self.grid_size):
+                for col in range(self.grid_size):
+                    rect = (*self.geometry.cell_offset(col, row), cell, cell)
+                    pygame.draw.rect(self.grid_surface, WHITE, rect)
+                    pygame.draw.rect(self.grid_surface, BLACK, rect, border)
+            
+            self.pattern_layer = pygame.Surface(self.geometry.size, pygame.SRCALPHA)
+            font = self.cell_font(cell * 48 // 70)
+            for (row, col), number in self.pattern_at.items():
+                self.draw_number(self.pattern_layer, row, col, number, font, RED)
+        return self.grid_surface, self.pattern_layer
+    
+    def input_layer(self):
+        """Surface holding the numbers the player has placed so far"""
+        if self.input_surface is None:
+            self.input_surface = pygame.Surface(self.geometry.size, pygame.SRCALPHA)
+            for pos, number in self.input_at.items():
+                self.draw_input_number(pos, number)
+        return self.input_surface
+    
+    def draw_input_number(self, pos, number):
+        self.draw_number(self.input_surface, pos[0], pos[1], number,
+                         self.cell_font(self.geometry.cell * 32 // 70), GREEN)
+    
+    def select_cell(self, pos):
+        """Select a (row, col) cell unless it is already taken"""
+        if pos not in self.input_at:
+            self.place_input(pos)
+            if len(self.user_input) == len(self.pattern):
+                self.finish_round()
+    
+    def place_input(self, pos):
+        """Add a selection; only that cell of the input layer is redrawn"""
+        self.input_times.append(time.monotonic_ns() - self.input_start_ns)
+        self.user_input.append(pos)
+        self.input_at[pos] = len(self.user_input)
+        if self.input_surface is not None:
+            self.draw_input_number(pos, len(self.user_input))
+    
+    def undo_input(self):
+        pos = self.user_input.pop()
+        self.input_times.pop()
+        self.undos += 1
+        del self.input_at[pos]
+        if self.input_surface is not None:
+            pitch = self.geometry.pitch
+            self.input_surface.fill((0, 0, 0, 0), (*self.geometry.cell_offset(pos[1], pos[0]), pitch, pitch))
+    
     def draw_grid(self, show_pattern=False):
         """Draw the game grid"""
-        grid_start_x = (SCREEN_WIDTH - self.grid_size * 80) // 2
-        grid_start_y = 200
-        
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                x = grid_start_x + col * 80
-                y = grid_start_y + row * 80
-                
-                # Determine cell color
-                cell_color = WHITE
-                if self.game_state == "input" and row == self.selected_row and col == self.selected_col:
-                    cell_color = LIGHT_BLUE
-                
-                # Draw cell
-                pygame.draw.rect(self.screen, cell_color, (x, y, 70, 70))
-                pygame.draw.rect(self.screen, BLACK, (x, y, 70, 70), 2)
-                
-                # Show pattern numbers if in showing phase
-                if show_pattern:
-                    for pattern_row, pattern_col, number in self.pattern:
-                        if pattern_row == row and pattern_col == col:
-                            num_text = self.font_large.render(str(number), True, RED)
-                            num_rect = num_text.get_rect(center=(x + 35, y + 35))
-                            self.screen.blit(num_text, num_rect)
-                
-                # Show user input
-                if self.game_state == "input":
-                    for i, (input_row, input_col) in enumerate(self.user_input):
-                        if input_row == row and input_col == col:
-                            num_text = self.font_medium.render(str(i + 1), True, GREEN)
-                            num_rect = num_text.get_rect(center=(x + 35, y + 35))
-                            self.screen.blit(num_text, num_rect)
+        origin = (self.geometry.x, self.geometry.y)
+        grid_surface, pattern_layer = self.grid_layers()
+        self.screen.blit(grid_surface, origin)
+        
+        # Show pattern numbers if in showing phase
+        if show_pattern:
+            self.screen.blit(pattern_layer, origin)
+        
+        # Highlight the cursor and show user input
+        if self.game_state == "input":
+            rect = self.geometry.cell_rect(self.selected_col, self.selected_row)
+            pygame.draw.rect(self.screen, LIGHT_BLUE, rect)
+            pygame.draw.rect(self.screen, BLACK, rect, 2 if self.geometry.cell >= 20 else 1)
+            self.screen.blit(self.input_layer(), origin)
     
     def draw_showing_phase(self):
         self.screen.fill(WHITE)
         
         # Title and level info
-        title_text = self.font_large.render("Memory Matrix", True, BLUE)
+        title_text = render_text(self.font_large, "Memory Matrix", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 50))
         self.screen.blit(title_text, title_rect)
         
         level_text = f"Level {self.level} - Memorize the sequence!"
-        level_surface = self.font_medium.render(level_text, True, BLACK)
+        level_surface = render_text(self.font_medium, level_text, True, BLACK)
         level_rect = level_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(level_surface, level_rect)
         
@@ -150,33 +364,29 @@ class MemoryMatrix:
         elapsed = pygame.time.get_ticks() - self.show_start_time
         remaining = max(0, self.show_duration - elapsed) / 1000
         timer_text = f"Time remaining: {remaining:.1f}s"
-        timer_surface = self.font_small.render(timer_text, True, RED)
+        timer_surface = render_text(self.font_small, timer_text, True, RED)
         timer_rect = timer_surface.get_rect(center=(SCREEN_WIDTH//2, 150))
         self.screen.blit(timer_surface, timer_rect)
         
         # Draw grid with pattern
         self.draw_grid(show_pattern=True)
-        
-        # Check if time is up
-        if elapsed >= self.show_duration:
-            self.game_state = "input"
     
     def draw_input_phase(self):
         self.screen.fill(WHITE)
         
         # Title and instructions
-        title_text = self.font_large.render("Memory Matrix", True, BLUE)
+        title_text = render_text(self.font_large, "Memory Matrix", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 50))
         self.screen.blit(title_text, title_rect)
         
         instruction_text = "Click the positions in the correct order (1, 2, 3...)"
-        instruction_surface = self.font_small.render(instruction_text, True, BLACK)
+        instruction_surface = render_text(self.font_small, instruction_text, True, BLACK)
         instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(instruction_surface, instruction_rect)
         
         # Progress
         progress_text = f"Progress: {len(self.user_input)}/{len(self.pattern)}"
-        progress_surface = self.font_medium.render(progress_text, True, BLUE)
+        progress_surface = render_text(self.font_medium, progress_text, True, BLUE)
         progress_rect = progress_surface.get_rect(center=(SCREEN_WIDTH//2, 150))
         self.screen.blit(progress_surface, progress_rect)
         
@@ -184,64 +394,56 @@ class MemoryMatrix:
         self.draw_grid(show_pattern=False)
         
         # Navigation instructions
-        nav_text = "Use arrow keys to move, ENTER to select, BACKSPACE to undo"
-        nav_surface = self.font_small.render(nav_text, True, GRAY)
-        nav_rect = nav_surface.get_rect(center=(SCREEN_WIDTH//2, 500))
+        nav_text = "Click or use arrow keys and ENTER to select, BACKSPACE to undo"
+        nav_surface = render_text(self.font_small, nav_text, True, GRAY)
+        nav_y = 500 if self.grid_size <= MAX_GRID_SIZE else SCREEN_HEIGHT - 15  # Below large boards
+        nav_rect = nav_surface.get_rect(center=(SCREEN_WIDTH//2, nav_y))
         self.screen.blit(nav_surface, nav_rect)
     
     def draw_result_phase(self):
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Memory Matrix", True, BLUE)
+        title_text = render_text(self.font_large, "Memory Matrix", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
-        # Check if user got it right
-        correct = self.check_answer()
-        
-        if correct:
+        if self.last_correct:
             result_text = "Correct! Well done!"
             result_color = GREEN
-            self.score += self.level * 10
-            self.level += 1
-            if self.level % 3 == 0:  # Increase grid size every 3 levels
-                self.grid_size = min(5, self.grid_size + 1)
         else:
             result_text = "Incorrect! Try again."
             result_color = RED
-            self.lives -= 1
         
-        result_surface = self.font_large.render(result_text, True, result_color)
+        result_surface = render_text(self.font_large, result_text, True, result_color)
         result_rect = result_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
         self.screen.blit(result_surface, result_rect)
         
         # Show correct pattern
-        pattern_text = "Correct sequence was: " + " → ".join([f"({r+1},{c+1})" for r, c, n in sorted(self.pattern, key=lambda x: x[2])])
-        pattern_surface = self.font_small.render(pattern_text, True, BLACK)
+        pattern_surface = render_text(self.font_small, self.correct_sequence_text, True, BLACK)
         pattern_rect = pattern_surface.get_rect(center=(SCREEN_WIDTH//2, 250))
         self.screen.blit(pattern_surface, pattern_rect)
         
         # Score and level info
         info_text = f"Score: {self.score} | Level: {self.level} | Lives: {self.lives}"
-        info_surface = self.font_medium.render(info_text, True, BLUE)
+        info_surface = render_text(self.font_medium, info_text, True, BLUE)
         info_rect = info_surface.get_rect(center=(SCREEN_WIDTH//2, 300))
         self.screen.blit(info_surface, info_rect)
         
         # Game over check
         if self.lives <= 0:
             game_over_text = "Game Over! Final Score: " + str(self.score)
-            game_over_surface = self.font_large.render(game_over_text, True, RED)
+            game_over_surface = render_text(self.font_large, game_over_text, True, RED)
             game_over_rect = game_over_surface.get_rect(center=(SCREEN_WIDTH//2, 350))
             self.screen.blit(game_over_surface, game_over_rect)
             
             restart_text = "Press R to restart or ESC to quit"
-            restart_surface = self.font_small.render(restart_text, True, BLACK)
+            restart_surface = render_text(self.font_small, restart_text, True, BLACK)
             restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
             self.screen.blit(restart_surface, restart_rect)
         else:
             continue_text = "Press SPACE to continue"
-            continue_surface = self.font_small.render(continue_text, True, BLACK)
+            continue_surface = render_text(self.font_small, continue_text, True, BLACK)
             continue_rect = continue_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
             self.screen.blit(continue_surface, continue_rect)
     
@@ -250,14 +452,9 @@ class MemoryMatrix:
         if len(self.user_input) != len(self.pattern):
             return False
         
-        # Sort pattern by number order
-        sorted_pattern = sorted(self.pattern, key=lambda x: x[2])
-        
-        for i, (pattern_row, pattern_col, _) in enumerate(sorted_pattern):
-            if i >= len(self.user_input):
-                return False
-            user_row, user_col = self.user_input[i]
-            if user_row != pattern_row or user_col != pattern_col:
+        # The i-th selection must be the cell numbered i + 1
+        for i, pos in enumerate(self.user_input):
+            if self.pattern_at.get(pos) != i + 1:
                 return False
         
         return True
@@ -271,8 +468,7 @@ class MemoryMatrix:
                     return False
                 elif self.game_state == "menu":
                     if event.key == pygame.K_SPACE:
-                        self.game_state = "showing"
-                        self.show_start_time = pygame.time.get_ticks()
+                        self.start_showing()
                 elif self.game_state == "input":
                     if event.key == pygame.K_UP:
                         self.selected_row = (self.selected_row - 1) % self.grid_size
@@ -283,13 +479,9 @@ class MemoryMatrix:
                     elif event.key == pygame.K_RIGHT:
                         self.selected_col = (self.selected_col + 1) % self.grid_size
                     elif event.key == pygame.K_RETURN:
-                        pos = (self.selected_row, self.selected_col)
-                        if pos not in self.user_input:
-                            self.user_input.append(pos)
-                            if len(self.user_input) == len(self.pattern):
-                                self.game_state = "result"
+                        self.select_cell((self.selected_row, self.selected_col))
                     elif event.key == pygame.K_BACKSPACE and self.user_input:
-                        self.user_input.pop()
+                        self.undo_input()
                 elif self.game_state == "result":
                     if self.lives <= 0:
                         if event.key == pygame.K_r:
@@ -297,13 +489,19 @@ class MemoryMatrix:
                     else:
                         if event.key == pygame.K_SPACE:
                             self.generate_pattern()
-                            self.game_state = "showing"
-                            self.show_start_time = pygame.time.get_ticks()
+                            self.start_showing()
+            elif self.game_state == "input" and event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+                cell = self.geometry.cell_at(*event.pos)
+                if cell is not None:
+                    # The cursor follows the mouse so keys and clicks can be mixed
+                    self.selected_col, self.selected_row = cell
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        self.select_cell((self.selected_row, self.selected_col))
         return True
     
     def restart_game(self):
-        self.grid_size = 3
-        self.level = 1
+        self.level = self.start_level
+        self.grid_size = grid_size_for_level(self.level, self.large)
         self.score = 0
         self.lives = 3
         self.game_state = "menu"
@@ -321,15 +519,36 @@ class MemoryMatrix:
         
         pygame.display.flip()
     
+    def close(self):
+        """Stop the pattern worker and flush the reaction log"""
+        self.pattern_pool.shutdown()
+        if self.reaction_log is not None:
+            self.reaction_log.close()
+            self.reaction_log = None
+    
     def run(self):
         running = True
         while running:
             running = self.handle_events()
+            self.update()
             self.draw()
             self.clock.tick(60)
         
+        self.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = MemoryMatrix()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Memory Matrix")
+    parser.add_argument("--large", action="store_true",
+                        help=f"large-board mode (boards up to {LARGE_MAX_GRID_SIZE}x{LARGE_MAX_GRID_SIZE})")
+    parser.add_argument("--level", type=int, default=1, help="level to start at")
+    parser.add_argument("--seed", type=int, default=None, help="replay the same pattern sequence")
+    parser.add_argument("--log", default=REACTION_LOG, help="reaction-time log (JSONL)")
+    parser.add_argument("--no-log", action="store_true", help="do not record reaction times")
+    args = parser.parse_args()
+    
+    game = MemoryMatrix(large=args.large, level=max(1, args.level), seed=args.seed,
+                        log_path=None if args.no_log else args.log)
     game.run()
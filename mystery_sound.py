@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Mystery Sound - Play sound-based clues and let player guess the object
-Note: This version uses visual representations of sounds since actual audio files aren't available
+Sounds are synthesized by sound_synth.py when numpy and an audio device are
+available; the visual representations are always shown.
 """
 
 import pygame
@@ -9,6 +10,9 @@ import random
 import sys
 import math
 
+from text_cache import render_text
+from sound_synth import SampleBank, mixer_format
+
 pygame.init()
 
 # Constants
@@ -25,10 +29,13 @@ LIGHT_GRAY = (200, 200, 200)
 PURPLE = (128, 0, 128)
 
 class MysterySound:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Mystery Sound")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
@@ -104,6 +111,14 @@ class MysterySound:
         self.clues_revealed = 0
         self.max_clues = 3
         
+        # Samples are prepared in the background; None means visuals only
+        audio = mixer_format()
+        self.sound_bank = None
+        if audio is not None:
+            frequency, channels = audio
+            self.sound_bank = SampleBank([obj["pattern"] for obj in self.sound_objects], frequency, channels)
+        self.playing_sound = None
+        
         self.start_new_round()
     
     def start_new_round(self):
@@ -119,6 +134,23 @@ class MysterySound:
         else:
             self.game_state = "game_over"
     
+    def update(self):
+        """Loop the current object's sound while the player is listening or guessing"""
+        listening = self.game_state in ("playing", "guessing")
+        if not listening:
+            self.stop_sound()
+        elif self.sound_bank is not None and self.playing_sound is None:
+            # Starts as soon as the sample is ready
+            sound = self.sound_bank.sound(self.current_object["pattern"])
+            if sound is not None:
+                sound.play(loops=-1)
+                self.playing_sound = sound
+    
+    def stop_sound(self):
+        if self.playing_sound is not None:
+            self.playing_sound.stop()
+            self.playing_sound = None
+    
     def draw_visual_sound(self):
         """Draw visual representation of the current sound"""
         if not self.current_object:
@@ -198,13 +230,13 @@ class MysterySound:
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Mystery Sound", True, BLUE)
+        title_text = render_text(self.font_large, "Mystery Sound", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
         # Instructions
         instructions = [
-            "Listen to the visual sound clues!",
+            "Listen to the sound and watch its animation!",
             "Watch the animation and read the hints.",
             "Type your guess for what makes this sound.",
             "",
@@ -216,7 +248,7 @@ class MysterySound:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.font_small.render(instruction, True, BLACK)
+            text = render_text(self.font_small, instruction, True, BLACK)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 200 + i * 25))
             self.screen.blit(text, text_rect)
     
@@ -224,12 +256,12 @@ class MysterySound:
         self.screen.fill(WHITE)
         
         # Title and round info
-        title_text = self.font_large.render("Mystery Sound", True, BLUE)
+        title_text = render_text(self.font_large, "Mystery Sound", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 40))
         self.screen.blit(title_text, title_rect)
         
         round_text = f"Round {self.round_number}/{self.max_rounds} | Score: {self.score}"
-        round_surface = self.font_medium.render(round_text, True, BLACK)
+        round_surface = render_text(self.font_medium, round_text, True, BLACK)
         round_rect = round_surface.get_rect(center=(SCREEN_WIDTH//2, 80))
         self.screen.blit(round_surface, round_rect)
         
@@ -238,31 +270,31 @@ class MysterySound:
         
         # Clues section
         clues_y = 350
-        clue_title = self.font_medium.render("Sound Clues:", True, PURPLE)
+        clue_title = render_text(self.font_medium, "Sound Clues:", True, PURPLE)
         self.screen.blit(clue_title, (50, clues_y))
         
         # Show revealed clues
         for i in range(self.clues_revealed):
             if i < len(self.current_object["clues"]):
                 clue_text = f"{i+1}. {self.current_object['clues'][i]}"
-                clue_surface = self.font_small.render(clue_text, True, BLACK)
+                clue_surface = render_text(self.font_small, clue_text, True, BLACK)
                 self.screen.blit(clue_surface, (70, clues_y + 30 + i * 25))
         
         # Instructions
         if self.clues_revealed < self.max_clues:
             instruction_text = f"Press SPACE for next clue ({self.clues_revealed}/{self.max_clues} revealed)"
-            instruction_surface = self.font_small.render(instruction_text, True, GRAY)
+            instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
             self.screen.blit(instruction_surface, (50, clues_y + 120))
         
         guess_instruction = "Press G to make your guess"
-        guess_surface = self.font_small.render(guess_instruction, True, BLUE)
+        guess_surface = render_text(self.font_small, guess_instruction, True, BLUE)
         self.screen.blit(guess_surface, (50, clues_y + 145))
     
     def draw_guessing(self):
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Make Your Guess!", True, BLUE)
+        title_text = render_text(self.font_large, "Make Your Guess!", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
@@ -270,19 +302,19 @@ class MysterySound:
         clues_y = 150
         for i, clue in enumerate(self.current_object["clues"]):
             clue_text = f"{i+1}. {clue}"
-            clue_surface = self.font_small.render(clue_text, True, BLACK)
+            clue_surface = render_text(self.font_small, clue_text, True, BLACK)
             self.screen.blit(clue_surface, (100, clues_y + i * 25))
         
         # Input field
         input_y = 300
         input_text = "Your guess: " + self.user_guess + "_"
-        input_surface = self.font_medium.render(input_text, True, BLACK)
+        input_surface = render_text(self.font_medium, input_text, True, BLACK)
         input_rect = input_surface.get_rect(center=(SCREEN_WIDTH//2, input_y))
         self.screen.blit(input_surface, input_rect)
         
         # Instructions
         instruction_text = "Type your answer and press ENTER to submit"
-        instruction_surface = self.font_small.render(instruction_text, True, GRAY)
+        instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
         instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, 350))
         self.screen.blit(instruction_surface, instruction_rect)
     
@@ -304,24 +336,24 @@ class MysterySound:
             score_text = "No points this round."
         
         # Display result
-        result_surface = self.font_large.render(result_text, True, result_color)
+        result_surface = render_text(self.font_large, result_text, True, result_color)
         result_rect = result_surface.get_rect(center=(SCREEN_WIDTH//2, 150))
         self.screen.blit(result_surface, result_rect)
         
         # Show correct answer
         answer_text = f"The answer was: {self.current_object['name']}"
-        answer_surface = self.font_medium.render(answer_text, True, BLACK)
+        answer_surface = render_text(self.font_medium, answer_text, True, BLACK)
         answer_rect = answer_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
         self.screen.blit(answer_surface, answer_rect)
         
         # Show score
-        score_surface = self.font_medium.render(score_text, True, BLUE)
+        score_surface = render_text(self.font_medium, score_text, True, BLUE)
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH//2, 250))
         self.screen.blit(score_surface, score_rect)
         
         # Total score
         total_text = f"Total Score: {self.score}"
-        total_surface = self.font_medium.render(total_text, True, BLACK)
+        total_surface = render_text(self.font_medium, total_text, True, BLACK)
         total_rect = total_surface.get_rect(center=(SCREEN_WIDTH//2, 300))
         self.screen.blit(total_surface, total_rect)
         
@@ -331,7 +363,7 @@ class MysterySound:
         else:
             continue_text = "Press SPACE to see final results"
         
-        continue_surface = self.font_small.render(continue_text, True, GRAY)
+        continue_surface = render_text(self.font_small, continue_text, True, GRAY)
         continue_rect = continue_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
         self.screen.blit(continue_surface, continue_rect)
     
@@ -339,13 +371,13 @@ class MysterySound:
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_large.render("Game Complete!", True, BLUE)
+        title_text = render_text(self.font_large, "Game Complete!", True, BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 150))
         self.screen.blit(title_text, title_rect)
         
         # Final score
         final_score_text = f"Final Score: {self.score}/{self.max_rounds * 30}"
-        final_score_surface = self.font_large.render(final_score_text, True, GREEN)
+        final_score_surface = render_text(self.font_large, final_score_text, True, GREEN)
         final_score_rect = final_score_surface.get_rect(center=(SCREEN_WIDTH//2, 250))
         self.screen.blit(final_score_surface, final_score_rect)
         
@@ -360,22 +392,24 @@ class MysterySound:
         else:
             rating = "Keep trying! Sound recognition takes practice."
         
-        rating_surface = self.font_medium.render(rating, True, BLACK)
+        rating_surface = render_text(self.font_medium, rating, True, BLACK)
         rating_rect = rating_surface.get_rect(center=(SCREEN_WIDTH//2, 320))
         self.screen.blit(rating_surface, rating_rect)
         
         # Restart option
         restart_text = "Press R to play again or ESC to quit"
-        restart_surface = self.font_small.render(restart_text, True, GRAY)
+        restart_surface = render_text(self.font_small, restart_text, True, GRAY)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
         self.screen.blit(restart_surface, restart_rect)
     
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                self.stop_sound()
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
+                    self.stop_sound()  # A host may keep running after we leave
                     return False
                 elif self.game_state == "menu":
                     if event.key == pygame.K_SPACE:
@@ -424,13 +458,21 @@ class MysterySound:
         
         pygame.display.flip()
     
+    def close(self):
+        """Stop any playing sound and the sample synthesis workers"""
+        self.stop_sound()
+        if self.sound_bank is not None:
+            self.sound_bank.shutdown()
+    
     def run(self):
         running = True
         while running:
             running = self.handle_events()
+            self.update()
             self.draw()
             self.clock.tick(60)
         
+        self.close()
         pygame.quit()
 
 if __name__ == "__main__":
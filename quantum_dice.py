@@ -8,6 +8,8 @@ import random
 import sys
 import math
 
+from text_cache import render_text
+
 pygame.init()
 
 # Constants
@@ -26,10 +28,13 @@ CYAN = (0, 255, 255)
 ORANGE = (255, 165, 0)
 
 class QuantumDice:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Quantum Dice")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
@@ -129,13 +134,13 @@ class QuantumDice:
         
         # Title with quantum effect
         title_text = "QUANTUM DICE"
-        title_surface = self.font_large.render(title_text, True, PURPLE)
+        title_surface = render_text(self.font_large, title_text, True, PURPLE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_surface, title_rect)
         
         # Subtitle
         subtitle_text = "Strategic Dice Game with Probability Manipulation"
-        subtitle_surface = self.font_medium.render(subtitle_text, True, BLUE)
+        subtitle_surface = render_text(self.font_medium, subtitle_text, True, BLUE)
         subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH//2, 140))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
@@ -161,12 +166,12 @@ class QuantumDice:
             if rule.startswith("GAME RULES:") or rule.startswith("SCORING BONUSES:"):
                 color = PURPLE
             
-            text_surface = self.font_small.render(rule, True, color)
+            text_surface = render_text(self.font_small, rule, True, color)
             self.screen.blit(text_surface, (100, 200 + i * 25))
         
         # Start instruction
         start_text = "Press SPACE to start playing"
-        start_surface = self.font_medium.render(start_text, True, GREEN)
+        start_surface = render_text(self.font_medium, start_text, True, GREEN)
         start_rect = start_surface.get_rect(center=(SCREEN_WIDTH//2, 600))
         self.screen.blit(start_surface, start_rect)
     
@@ -212,7 +217,7 @@ class QuantumDice:
         
         # Title and round info
         title_text = f"Quantum Dice - Round {self.round_number}/{self.max_rounds}"
-        title_surface = self.font_large.render(title_text, True, PURPLE)
+        title_surface = render_text(self.font_large, title_text, True, PURPLE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 40))
         self.screen.blit(title_surface, title_rect)
         
@@ -221,22 +226,22 @@ class QuantumDice:
         player_score_text = f"Your Score: {self.player_score}"
         ai_score_text = f"AI Score: {self.ai_score}"
         
-        player_score_surface = self.font_medium.render(player_score_text, True, BLUE)
-        ai_score_surface = self.font_medium.render(ai_score_text, True, RED)
+        player_score_surface = render_text(self.font_medium, player_score_text, True, BLUE)
+        ai_score_surface = render_text(self.font_medium, ai_score_text, True, RED)
         
         self.screen.blit(player_score_surface, (100, score_y))
         self.screen.blit(ai_score_surface, (SCREEN_WIDTH - 200, score_y))
         
         # Quantum energy
         energy_text = f"Quantum Energy: {self.quantum_energy}"
-        energy_surface = self.font_medium.render(energy_text, True, PURPLE)
+        energy_surface = render_text(self.font_medium, energy_text, True, PURPLE)
         energy_rect = energy_surface.get_rect(center=(SCREEN_WIDTH//2, score_y))
         self.screen.blit(energy_surface, energy_rect)
         
         # Player dice
         if self.player_dice:
             player_label = "Your Dice:"
-            player_label_surface = self.font_medium.render(player_label, True, BLUE)
+            player_label_surface = render_text(self.font_medium, player_label, True, BLUE)
             self.screen.blit(player_label_surface, (100, 150))
             
             if self.rolling:
@@ -249,13 +254,13 @@ class QuantumDice:
             # Show player score for this round
             round_score = self.calculate_score(self.player_dice)
             score_text = f"Round Score: {round_score}"
-            score_surface = self.font_small.render(score_text, True, BLUE)
+            score_surface = render_text(self.font_small, score_text, True, BLUE)
             self.screen.blit(score_surface, (100, 260))
         
         # AI dice
         if self.ai_dice:
             ai_label = "AI Dice:"
-            ai_label_surface = self.font_medium.render(ai_label, True, RED)
+            ai_label_surface = render_text(self.font_medium, ai_label, True, RED)
             self.screen.blit(ai_label_surface, (500, 150))
             
             self.draw_dice(self.ai_dice, 500, 180)
@@ -263,14 +268,14 @@ class QuantumDice:
             # Show AI score for this round
             ai_round_score = self.calculate_score(self.ai_dice)
             ai_score_text = f"Round Score: {ai_round_score}"
-            ai_score_surface = self.font_small.render(ai_score_text, True, RED)
+            ai_score_surface = render_text(self.font_small, ai_score_text, True, RED)
             self.screen.blit(ai_score_surface, (500, 260))
         
         # Quantum choices
         if not self.rolling and not self.player_dice:
             choice_y = 350
             choice_title = "Choose Your Strategy:"
-            choice_title_surface = self.font_medium.render(choice_title, True, BLACK)
+            choice_title_surface = render_text(self.font_medium, choice_title, True, BLACK)
             self.screen.blit(choice_title_surface, (100, choice_y))
             
             for i, choice in enumerate(self.choices):
@@ -290,18 +295,18 @@ class QuantumDice:
                 if choice["cost"] > 0:
                     choice_text += f" (Cost: {choice['cost']} energy)"
                 
-                choice_surface = self.font_small.render(choice_text, True, text_color)
+                choice_surface = render_text(self.font_small, choice_text, True, text_color)
                 self.screen.blit(choice_surface, (100, y_pos))
             
             # Instructions
             instruction_text = "Use UP/DOWN to select, ENTER to choose, or press 1-4 for direct selection"
-            instruction_surface = self.font_small.render(instruction_text, True, GRAY)
+            instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
             self.screen.blit(instruction_surface, (100, 600))
         
         elif self.rolling:
             # Show rolling animation
             rolling_text = "Rolling dice..."
-            rolling_surface = self.font_large.render(rolling_text, True, PURPLE)
+            rolling_surface = render_text(self.font_large, rolling_text, True, PURPLE)
             rolling_rect = rolling_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
             self.screen.blit(rolling_surface, rolling_rect)
         
@@ -320,12 +325,12 @@ class QuantumDice:
                 result_text = "Round tied!"
                 result_color = YELLOW
             
-            result_surface = self.font_large.render(result_text, True, result_color)
+            result_surface = render_text(self.font_large, result_text, True, result_color)
             result_rect = result_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
             self.screen.blit(result_surface, result_rect)
             
             continue_text = "Press SPACE to continue"
-            continue_surface = self.font_medium.render(continue_text, True, BLACK)
+            continue_surface = render_text(self.font_medium, continue_text, True, BLACK)
             continue_rect = continue_surface.get_rect(center=(SCREEN_WIDTH//2, 450))
             self.screen.blit(continue_surface, continue_rect)
     
@@ -347,29 +352,29 @@ class QuantumDice:
             result_text = "It's a perfect tie!"
         
         # Display results
-        winner_surface = self.font_large.render(winner_text, True, winner_color)
+        winner_surface = render_text(self.font_large, winner_text, True, winner_color)
         winner_rect = winner_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
         self.screen.blit(winner_surface, winner_rect)
         
-        result_surface = self.font_medium.render(result_text, True, BLACK)
+        result_surface = render_text(self.font_medium, result_text, True, BLACK)
         result_rect = result_surface.get_rect(center=(SCREEN_WIDTH//2, 250))
         self.screen.blit(result_surface, result_rect)
         
         # Final scores
         final_scores = f"Final Score - You: {self.player_score}, AI: {self.ai_score}"
-        scores_surface = self.font_medium.render(final_scores, True, BLUE)
+        scores_surface = render_text(self.font_medium, final_scores, True, BLUE)
         scores_rect = scores_surface.get_rect(center=(SCREEN_WIDTH//2, 300))
         self.screen.blit(scores_surface, scores_rect)
         
         # Game stats
         rounds_text = f"Rounds played: {self.round_number - 1}"
-        rounds_surface = self.font_small.render(rounds_text, True, BLACK)
+        rounds_surface = render_text(self.font_small, rounds_text, True, BLACK)
         rounds_rect = rounds_surface.get_rect(center=(SCREEN_WIDTH//2, 350))
         self.screen.blit(rounds_surface, rounds_rect)
         
         # Restart option
         restart_text = "Press R to play again or ESC to quit"
-        restart_surface = self.font_medium.render(restart_text, True, GRAY)
+        restart_surface = render_text(self.font_medium, restart_text, True, GRAY)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, 450))
         self.screen.blit(restart_surface, restart_rect)
     
@@ -8,6 +8,8 @@ import random
 import sys
 import textwrap
 
+from text_cache import render_text
+
 pygame.init()
 
 # Constants
@@ -25,10 +27,13 @@ PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 
 class QuizMaster:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, screen=None, clock=None):
+        # A host can pass in a shared display surface and clock
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = screen
         pygame.display.set_caption("Quiz Master")
-        self.clock = pygame.time.Clock()
+        self.clock = clock if clock is not None else pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
@@ -244,13 +249,13 @@ class QuizMaster:
         
         # Title
         title_text = "Quiz Master"
-        title_surface = self.font_large.render(title_text, True, PURPLE)
+        title_surface = render_text(self.font_large, title_text, True, PURPLE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 80))
         self.screen.blit(title_surface, title_rect)
         
         # Subtitle
         subtitle_text = "Test Your Knowledge!"
-        subtitle_surface = self.font_medium.render(subtitle_text, True, BLUE)
+        subtitle_surface = render_text(self.font_medium, subtitle_text, True, BLUE)
         subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH//2, 120))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
@@ -264,12 +269,12 @@ class QuizMaster:
         ]
         
         for i, line in enumerate(info_lines):
-            text_surface = self.font_small.render(line, True, BLACK)
+            text_surface = render_text(self.font_small, line, True, BLACK)
             self.screen.blit(text_surface, (200, 200 + i * 30))
         
         # Category selection
         category_title = "Select Category:"
-        category_title_surface = self.font_medium.render(category_title, True, BLUE)
+        category_title_surface = render_text(self.font_medium, category_title, True, BLUE)
         self.screen.blit(category_title_surface, (200, 350))
         
         categories = ["Mixed"] + self.categories
@@ -278,7 +283,7 @@ class QuizMaster:
             x_pos = 200 + (i // 4) * 200
             
             color = GREEN if category == self.current_category else BLACK
-            category_surface = self.font_small.render(f"{i+1}. {category}", True, color)
+            category_surface = render_text(self.font_small, f"{i+1}. {category}", True, color)
             self.screen.blit(category_surface, (x_pos, y_pos))
         
         # Instructions
@@ -289,7 +294,7 @@ class QuizMaster:
         ]
         
         for i, instruction in enumerate(instruction_lines):
-            text_surface = self.font_small.render(instruction, True, GRAY)
+            text_surface = render_text(self.font_small, instruction, True, GRAY)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, 550 + i * 25))
             self.screen.blit(text_surface, text_rect)
     
@@ -311,10 +316,10 @@ class QuizMaster:
         category_text = f"Category: {question_data['category']}"
         difficulty_text = f"Difficulty: {question_data['difficulty']}"
         
-        question_num_surface = self.font_medium.render(question_num_text, True, BLUE)
-        score_surface = self.font_medium.render(score_text, True, GREEN)
-        category_surface = self.font_small.render(category_text, True, PURPLE)
-        difficulty_surface = self.font_small.render(difficulty_text, True, ORANGE)
+        question_num_surface = render_text(self.font_medium, question_num_text, True, BLUE)
+        score_surface = render_text(self.font_medium, score_text, True, GREEN)
+        category_surface = render_text(self.font_small, category_text, True, PURPLE)
+        difficulty_surface = render_text(self.font_small, difficulty_text, True, ORANGE)
         
         self.screen.blit(question_num_surface, (50, header_y))
         self.screen.blit(score_surface, (SCREEN_WIDTH - 150, header_y))
@@ -325,7 +330,7 @@ class QuizMaster:
         timer_y = 80
         timer_text = f"Time: {int(self.time_remaining)}s"
         timer_color = RED if self.time_remaining < 10 else BLACK
-        timer_surface = self.font_medium.render(timer_text, True, timer_color)
+        timer_surface = render_text(self.font_medium, timer_text, True, timer_color)
         timer_rect = timer_surface.get_rect(center=(SCREEN_WIDTH//2, timer_y))
         self.screen.blit(timer_surface, timer_rect)
         
@@ -347,7 +352,7 @@ class QuizMaster:
         wrapped_question = textwrap.wrap(question_data["question"], width=70)
         
         for i, line in enumerate(wrapped_question):
-            question_surface = self.font_medium.render(line, True, BLACK)
+            question_surface = render_text(self.font_medium, line, True, BLACK)
             question_rect = question_surface.get_rect(center=(SCREEN_WIDTH//2, question_y + i * 35))
             self.screen.blit(question_surface, question_rect)
         
@@ -364,30 +369,30 @@ class QuizMaster:
             # Answer letter and text
             letter = chr(ord('A') + i)
             answer_text = f"{letter}. {answer}"
-            answer_surface = self.font_medium.render(answer_text, True, BLACK)
+            answer_surface = render_text(self.font_medium, answer_text, True, BLACK)
             self.screen.blit(answer_surface, (120, y_pos))
         
         # Lifelines
         lifeline_y = answers_y + 4 * 60 + 30
         lifeline_title = "Lifelines:"
-        lifeline_title_surface = self.font_small.render(lifeline_title, True, BLUE)
+        lifeline_title_surface = render_text(self.font_small, lifeline_title, True, BLUE)
         self.screen.blit(lifeline_title_surface, (50, lifeline_y))
         
         lifeline_x = 150
         if self.lifelines["50_50"]:
             fifty_text = "Press F for 50/50"
-            fifty_surface = self.font_small.render(fifty_text, True, GREEN)
+            fifty_surface = render_text(self.font_small, fifty_text, True, GREEN)
             self.screen.blit(fifty_surface, (lifeline_x, lifeline_y))
             lifeline_x += 150
         
         if self.lifelines["skip"]:
             skip_text = "Press S to Skip"
-            skip_surface = self.font_small.render(skip_text, True, GREEN)
+            skip_surface = render_text(self.font_small, skip_text, True, GREEN)
             self.screen.blit(skip_surface, (lifeline_x, lifeline_y))
         
         # Instructions
         instruction_text = "Use UP/DOWN arrows to select, ENTER to answer, or A/B/C/D keys"
-        instruction_surface = self.font_small.render(instruction_text, True, GRAY)
+        instruction_surface = render_text(self.font_small, instruction_text, True, GRAY)
         instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 30))
         self.screen.blit(instruction_surface, instruction_rect)
         
@@ -418,17 +423,17 @@ class QuizMaster:
                 result_color = RED
                 points_text = "No points"
             
-            result_surface = self.font_large.render(result_text, True, result_color)
+            result_surface = render_text(self.font_large, result_text, True, result_color)
             result_rect = result_surface.get_rect(center=(SCREEN_WIDTH//2, 150))
             self.screen.blit(result_surface, result_rect)
             
-            points_surface = self.font_medium.render(points_text, True, BLUE)
+            points_surface = render_text(self.font_medium, points_text, True, BLUE)
             points_rect = points_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
             self.screen.blit(points_surface, points_rect)
             
             # Show correct answer
             correct_answer_text = f"Correct answer: {chr(ord('A') + question_data['correct'])}. {question_data['answers'][question_data['correct']]}"
-            correct_surface = self.font_medium.render(correct_answer_text, True, BLACK)
+            correct_surface = render_text(self.font_medium, correct_answer_text, True, BLACK)
             correct_rect = correct_surface.get_rect(center=(SCREEN_WIDTH//2, 280))
             self.screen.blit(correct_surface, correct_rect)
             
@@ -436,13 +441,13 @@ class QuizMaster:
             if "explanation" in question_data:
                 explanation_lines = textwrap.wrap(question_data["explanation"], width=60)
                 for i, line in enumerate(explanation_lines):
-                    exp_surface = self.font_small.render(line, True, GRAY)
+                    exp_surface = render_text(self.font_small, line, True, GRAY)
                     exp_rect = exp_surface.get_rect(center=(SCREEN_WIDTH//2, 320 + i * 25))
                     self.screen.blit(exp_surface, exp_rect)
         
         # Current score
         score_text = f"Current Score: {self.score}"
-        score_surface = self.font_medium.render(score_text, True, PURPLE)
+        score_surface = render_text(self.font_medium, score_text, True, PURPLE)
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH//2, 450))
         self.screen.blit(score_surface, score_rect)
         
@@ -452,7 +457,7 @@ class QuizMaster:
         else:
             continue_text = "Press SPACE to see final results"
         
-        continue_surface = self.font_small.render(continue_text, True, GRAY)
+        continue_surface = render_text(self.font_small, continue_text, True, GRAY)
         continue_rect = continue_surface.get_rect(center=(SCREEN_WIDTH//2, 550))
         self.screen.blit(continue_surface, continue_rect)
     
@@ -461,13 +466,13 @@ class QuizMaster:
         
         # Title
         title_text = "Quiz Complete!"
-        title_surface = self.font_large.render(title_text, True, PURPLE)
+        title_surface = render_text(self.font_large, title_text, True, PURPLE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_surface, title_rect)
         
         # Final score
         final_score_text = f"Final Score: {self.score}"
-        final_score_surface = self.font_large.render(final_score_text, True, GREEN)
+        final_score_surface = render_text(self.font_large, final_score_text, True, GREEN)
         final_score_rect = final_score_surface.get_rect(center=(SCREEN_WIDTH//2, 180))
         self.screen.blit(final_score_surface, final_score_rect)
         
@@ -483,7 +488,7 @@ class QuizMaster:
         ]
         
         for i, line in enumerate(stats_lines):
-            stats_surface = self.font_medium.render(line, True, BLACK)
+            stats_surface = render_text(self.font_medium, line, True, BLACK)
             stats_rect = stats_surface.get_rect(center=(SCREEN_WIDTH//2, 250 + i * 35))
             self.screen.blit(stats_surface, stats_rect)
         
@@ -499,13 +504,13 @@ class QuizMaster:
         else:
             rating = "Keep studying and try again!"
         
-        rating_surface = self.font_medium.render(rating, True, BLUE)
+        rating_surface = render_text(self.font_medium, rating, True, BLUE)
         rating_rect = rating_surface.get_rect(center=(SCREEN_WIDTH//2, 400))
         self.screen.blit(rating_surface, rating_rect)
         
         # Options
         options_text = "Press R to play again or ESC to quit"
-        options_surface = self.font_small.render(options_text, True, GRAY)
+        options_surface = render_text(self.font_small, options_text, True, GRAY)
         options_rect = options_surface.get_rect(center=(SCREEN_WIDTH//2, 500))
         self.screen.blit(options_surface, options_rect)
     
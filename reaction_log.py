@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Reaction Log - Memory Matrix reaction-time recording and summaries
+Each finished round is one JSON line: the level, the outcome and the time of
+every selection in nanoseconds after the pattern was hidden. Lines are
+written by a background thread so the game loop never waits on disk.
+"""
+
+import os
+import json
+import queue
+import argparse
+import threading
+
+from stats import percentile
+
+LOG_DIR = os.environ.get("THINKVERSE_LOG_DIR",
+                         os.path.join(os.path.expanduser("~"), ".thinkverse", "logs"))
+REACTION_LOG = os.path.join(LOG_DIR, "memory_matrix.jsonl")
+
+PERCENTILES = (50, 90, 99)
+
+
+class ReactionLogger:
+    """Appends round records to a JSONL file from a writer thread"""
+
+    def __init__(self, path=REACTION_LOG):
+        self.path = path
+        self.records = queue.Queue()
+        self.thread = threading.Thread(target=self.write_records, name="reaction-log", daemon=True)
+        self.thread.start()
+
+    def log(self, record):
+        """Queue a record; returns immediately"""
+        self.records.put(record)
+
+    def write_records(self):
+        stopping = False
+        while not stopping:
+            batch = [self.records.get()]
+            # Write whatever else has queued up in the same open
+            while True:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = batch[:batch.index(None)]
+            if not batch:
+                continue
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in batch)
+            except OSError as e:
+                print(f"Could not write reaction log {self.path}: {e}")
+
+    def close(self, timeout=2.0):
+        """Flush queued records and stop the writer"""
+        self.records.put(None)
+        self.thread.join(timeout)
+
+
+def load_records(path=REACTION_LOG):
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def level_summary(records, percentiles=PERCENTILES):
+    """Per-level reaction times in milliseconds
+
+    The first_* values time the pattern disappearing to the first
+    selection; interval_* values time consecutive selections.
+    """
+    levels = {}
+    for record in records:
+        times = record["selection_ns"]
+        stats = levels.setdefault(record["level"], {"rounds": 0, "correct": 0, "first": [], "interval": []})
+        stats["rounds"] += 1
+        stats["correct"] += 1 if record["correct"] else 0
+        if times:
+            stats["first"].append(times[0] / 1e6)
+            stats["interval"].extend((b - a) / 1e6 for a, b in zip(times, times[1:]))
+
+    summary = {}
+    for level, stats in sorted(levels.items()):
+        entry = {"rounds": stats["rounds"], "accuracy": stats["correct"] / stats["rounds"]}
+        for name in ("first", "interval"):
+            values = sorted(stats[name])
+            for p in percentiles:
+                entry[f"{name}_p{p}_ms"] = percentile(values, p)
+        summary[level] = entry
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize Memory Matrix reaction times per level")
+    parser.add_argument("log", nargs="?", default=REACTION_LOG, help="reaction log (JSONL)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    try:
+        records = load_records(args.log)
+    except (OSError, ValueError) as e:
+        print(f"Could not read reaction log: {e}")
+        return
+    summary = level_summary(records)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    def ms(value):
+        return f"{value:8.0f}" if value is not None else "       -"
+
+    print(f"{'level':>5} {'rounds':>6} {'acc':>5} " +
+          " ".join(f"{'first p' + str(p):>8}" for p in PERCENTILES) + " " +
+          " ".join(f"{'gap p' + str(p):>8}" for p in PERCENTILES))
+    for level, entry in summary.items():
+        print(f"{level:>5} {entry['rounds']:>6} {entry['accuracy']:>5.0%} " +
+              " ".join(ms(entry[f'first_p{p}_ms']) for p in PERCENTILES) + " " +
+              " ".join(ms(entry[f'interval_p{p}_ms']) for p in PERCENTILES))
+
+
+if __name__ == "__main__":
+    main()
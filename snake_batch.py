@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Snake Batch - Vectorized Snake environment running many boards in NumPy
+Every board follows Snake Classic's movement, food, obstacle, lives and
+wrap-while-invincible rules; one step moves every snake by one cell.
+Requires numpy.
+"""
+
+import numpy as np
+
+from snake_engine import GRID_WIDTH, GRID_HEIGHT, DIFFICULTY_SETTINGS, MODE_LIVES
+
+# Action indices, in the same order as snake_engine.DIRECTIONS
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+KEEP = -1  # Keep the current direction
+DIRECTION_VECTORS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int64)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int64)
+
+
+class SnakeBatch:
+    """N independent Snake boards stepped with array operations
+
+    The body of each snake is stored as a lifetime grid: a cell holds the
+    number of moves until the tail leaves it (0 = empty, head = length).
+    Moving decrements every body cell of the board, growing skips the
+    decrement, so no per-segment bookkeeping is needed. Power-ups and
+    special food are not simulated; invincibility comes from respawns.
+    """
+
+    def __init__(self, num_boards, width=GRID_WIDTH, height=GRID_HEIGHT,
+                 difficulty="Normal", game_mode="Classic", seed=None):
+        self.num_boards = num_boards
+        self.width = width
+        self.height = height
+        self.difficulty = difficulty
+        self.game_mode = game_mode
+        self.rng = np.random.default_rng(seed)
+
+        settings = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["Normal"])
+        self.use_obstacles = settings["obstacles"] and game_mode != "Classic"
+        self.regenerate_obstacles = difficulty in ["Hard", "Extreme"]
+        # Snake Classic grants 3 seconds (180 frames) after a respawn
+        self.respawn_invincibility = max(1, 3 * settings["speed"])
+
+        shape = (num_boards, height, width)
+        self.body = np.zeros(shape, dtype=np.int16)
+        self.obstacles = np.zeros(shape, dtype=bool)
+        self.heads = np.zeros((num_boards, 2), dtype=np.int64)  # (x, y)
+        self.food = np.zeros((num_boards, 2), dtype=np.int64)
+        self.directions = np.full(num_boards, RIGHT, dtype=np.int64)
+        self.lengths = np.ones(num_boards, dtype=np.int64)
+        self.scores = np.zeros(num_boards, dtype=np.int64)
+        self.levels = np.ones(num_boards, dtype=np.int64)
+        self.lives = np.zeros(num_boards, dtype=np.int64)
+        self.invincible = np.zeros(num_boards, dtype=np.int64)  # Moves left
+        self.done = np.zeros(num_boards, dtype=bool)
+        self.board_index = np.arange(num_boards)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games on the selected boards (all by default)"""
+        if mask is None:
+            mask = np.ones(self.num_boards, dtype=bool)
+        boards = np.flatnonzero(mask)
+        if boards.size == 0:
+            return
+
+        self.scores[boards] = 0
+        self.levels[boards] = 1
+        self.lives[boards] = MODE_LIVES.get(self.game_mode, 3)
+        self.invincible[boards] = 0
+        self.done[boards] = False
+        self.obstacles[boards] = False
+        self.respawn(boards)
+
+        if self.use_obstacles:
+            self.place_obstacles(boards)
+        self.place_food(boards)
+
+    def respawn(self, boards):
+        """Put a one-segment snake in the middle of the given boards"""
+        self.body[boards] = 0
+        self.heads[boards] = (self.width // 2, self.height // 2)
+        self.directions[boards] = RIGHT
+        self.lengths[boards] = 1
+        self.body[boards, self.height // 2, self.width // 2] = 1
+
+    def free_cells(self, boards):
+        """Flattened mask of cells with no snake, obstacle or food"""
+        free = (self.body[boards] == 0) & ~self.obstacles[boards]
+        free = free.reshape(len(boards), -1)
+        food_flat = self.food[boards, 1] * self.width + self.food[boards, 0]
+        has_food = food_flat >= 0
+        free[np.flatnonzero(has_food), food_flat[has_food]] = False
+        return free
+
+    def random_cells(self, free):
+        """Pick one uniformly random True cell per row; -1 where none"""
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        picks = keys.argmax(axis=1)
+        picks[~free.any(axis=1)] = -1
+        return picks
+
+    def place_food(self, boards):
+        self.food[boards] = -1
+        picks = self.random_cells(self.free_cells(boards))
+        placed = picks >= 0
+        self.food[boards[placed], 0] = picks[placed] % self.width
+        self.food[boards[placed], 1] = picks[placed] // self.width
+
+    def place_obstacles(self, boards):
+        """Place min(5, level) obstacles away from the border"""
+        self.obstacles[boards] = False
+        interior = np.zeros((self.height, self.width), dtype=bool)
+        interior[1:-1, 1:-1] = True
+        interior = interior.ravel()
+        counts = np.minimum(5, np.maximum(1, self.levels[boards]))
+
+        for k in range(5):
+            needing = boards[counts > k]
+            if needing.size == 0:
+                break
+            picks = self.random_cells(self.free_cells(needing) & interior)
+            placed = picks >= 0
+            self.obstacles.reshape(self.num_boards, -1)[needing[placed], picks[placed]] = True
+
+    def step(self, actions=None):
+        """Move every live snake one cell
+
+        actions is an int array of UP/DOWN/LEFT/RIGHT or KEEP per board;
+        reversing onto the body is ignored. Returns (rewards, done).
+        """
+        live = ~self.done
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int64)
+            turning = (actions >= 0) & (actions != OPPOSITE[self.directions]) & live
+            self.directions = np.where(turning, actions, self.directions)
+
+        invincible = self.invincible > 0
+        new_heads = self.heads + DIRECTION_VECTORS[self.directions]
+        x, y = new_heads[:, 0], new_heads[:, 1]
+        off_board = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        x = x % self.width  # Wrap; only invincible snakes survive the wall
+        y = y % self.height
+
+        hit_body = self.body[self.board_index, y, x] > 0
+        hit_obstacle = self.obstacles[self.board_index, y, x]
+        crashed = live & ((off_board | hit_body | hit_obstacle) & ~invincible)
+        moving = live & ~crashed
+        ate = moving & (x == self.food[:, 0]) & (y == self.food[:, 1])
+
+        # Advance bodies: everyone but eaters loses a tick of tail lifetime
+        shrinking = moving & ~ate
+        self.body -= (self.body > 0) & shrinking[:, None, None]
+        self.lengths += ate
+        movers = np.flatnonzero(moving)
+        self.body[movers, y[movers], x[movers]] = self.lengths[movers]
+        self.heads[movers, 0] = x[movers]
+        self.heads[movers, 1] = y[movers]
+        self.invincible = np.maximum(0, self.invincible - moving)
+
+        rewards = np.where(ate, 10, 0)
+        self.scores += rewards
+
+        if ate.any():
+            eaters = np.flatnonzero(ate)
+            new_levels = self.scores[eaters] // 100 + 1
+            leveled = eaters[new_levels > self.levels[eaters]]
+            self.levels[eaters] = np.maximum(self.levels[eaters], new_levels)
+            if self.regenerate_obstacles and leveled.size:
+                self.place_obstacles(leveled)
+            self.place_food(eaters)
+
+        if crashed.any():
+            crashers = np.flatnonzero(crashed)
+            self.lives[crashers] -= 1
+            out = crashers[self.lives[crashers] <= 0]
+            self.done[out] = True
+            survivors = crashers[self.lives[crashers] > 0]
+            if survivors.size:
+                self.respawn(survivors)
+                self.invincible[survivors] = self.respawn_invincibility
+
+        return rewards, self.done.copy()
+
+    def greedy_actions(self):
+        """Baseline policy: turn towards the food along the longer axis"""
+        dx = self.food[:, 0] - self.heads[:, 0]
+        dy = self.food[:, 1] - self.heads[:, 1]
+        horizontal = np.where(dx > 0, RIGHT, LEFT)
+        vertical = np.where(dy > 0, DOWN, UP)
+        return np.where(np.abs(dx) >= np.abs(dy), horizontal, vertical)
+
+
+def evaluate(policy, num_boards=4096, steps=1000, seed=0, difficulty="Normal", game_mode="Classic"):
+    """Run a policy(batch) -> actions over many boards and summarize scores"""
+    import time
+
+    batch = SnakeBatch(num_boards, difficulty=difficulty, game_mode=game_mode, seed=seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step(policy(batch))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "boards": num_boards,
+        "steps": steps,
+        "board_moves_per_second": num_boards * steps / elapsed if elapsed else float("inf"),
+        "ms_per_step": elapsed / steps * 1000,
+        "mean_score": float(batch.scores.mean()),
+        "max_score": int(batch.scores.max()),
+        "finished": int(batch.done.sum())
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vectorized Snake policy evaluation")
+    parser.add_argument("--boards", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", default="Normal", choices=list(DIFFICULTY_SETTINGS))
+    parser.add_argument("--mode", default="Classic", choices=list(MODE_LIVES))
+    args = parser.parse_args()
+
+    stats = evaluate(SnakeBatch.greedy_actions, args.boards, args.steps, args.seed,
+                     args.difficulty, args.mode)
+    print(f"{stats['boards']} boards x {stats['steps']} steps: {stats['ms_per_step']:.2f} ms/step, "
+          f"{stats['board_moves_per_second']:,.0f} board moves/s, mean score {stats['mean_score']:.1f}, "
+          f"max {stats['max_score']}, {stats['finished']} finished")
@@ -4,10 +4,12 @@ Snake Classic - Classic snake game with modern twists
 """
 
 import pygame
-import random
 import sys
 import math
 
+from snake_engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+from text_cache import render_text
+
 # Initialize Pygame
 pygame.init()
 
@@ -32,293 +34,31 @@ GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = (SCREEN_HEIGHT - 100) // GRID_SIZE  # Leave space for UI
 
 class SnakeClassic:
-    def __init__(self):
+    def __init__(self, screen=None, clock=None):
         try:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            # A host can pass in a shared display surface and clock
+            if screen is None:
+                screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.screen = screen
             pygame.display.set_caption("Snake Classic")
-            self.clock = pygame.time.Clock()
+            self.clock = clock if clock is not None else pygame.time.Clock()
             self.font_large = pygame.font.Font(None, 48)
             self.font_medium = pygame.font.Font(None, 32)
             self.font_small = pygame.font.Font(None, 24)
             
             self.game_state = "menu"  # menu, playing, paused, game_over
-            self.difficulty = "Normal"  # Easy, Normal, Hard, Extreme
-            self.game_mode = "Classic"  # Classic, Arcade, Survival
-            
-            # Snake properties
-            self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-            self.direction = (1, 0)  # Moving right initially
-            self.next_direction = (1, 0)
-            
-            # Food and power-ups
-            self.food = self.generate_food()
-            self.special_food = None
-            self.special_food_timer = 0
-            
-            # Game stats
-            self.score = 0
-            self.high_score = 0
-            self.level = 1
-            self.speed = 8  # FPS for snake movement
-            self.lives = 3
-            
-            # Special effects
-            self.invincible = False
-            self.invincible_timer = 0
-            self.slow_motion = False
-            self.slow_motion_timer = 0
-            self.double_points = False
-            self.double_points_timer = 0
-            
-            # Obstacles (for advanced modes)
-            self.obstacles = []
-            
-            # Animation and timing
-            self.animation_time = 0
-            self.last_move_time = 0
-            self.move_delay = 1000 // self.speed  # milliseconds between moves
             
-            self.setup_difficulty()
+            # Rules live in a pygame-free, tick-based engine; this class draws
+            # it and feeds it input
+            self.engine = SnakeEngine(GRID_WIDTH, GRID_HEIGHT)
+            
+            # Animation
+            self.animation_time = 0
             
         except Exception as e:
             print(f"Error initializing Snake game: {e}")
             sys.exit(1)
     
-    def setup_difficulty(self):
-        """Set up game parameters based on difficulty"""
-        try:
-            difficulty_settings = {
-                "Easy": {"speed": 6, "obstacles": False, "power_ups": True},
-                "Normal": {"speed": 8, "obstacles": False, "power_ups": True},
-                "Hard": {"speed": 12, "obstacles": True, "power_ups": True},
-                "Extreme": {"speed": 16, "obstacles": True, "power_ups": False}
-            }
-            
-            settings = difficulty_settings.get(self.difficulty, difficulty_settings["Normal"])
-            self.speed = settings["speed"]
-            self.move_delay = 1000 // self.speed
-            
-            if settings["obstacles"] and self.game_mode != "Classic":
-                self.generate_obstacles()
-            else:
-                self.obstacles = []
-        except Exception as e:
-            print(f"Error setting up difficulty: {e}")
-            # Use default settings
-            self.speed = 8
-            self.move_delay = 125
-            self.obstacles = []
-    
-    def generate_food(self):
-        """Generate food at random position"""
-        try:
-            max_attempts = 100  # Prevent infinite loop
-            attempts = 0
-            
-            while attempts < max_attempts:
-                food_pos = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-                if (food_pos not in self.snake and 
-                    food_pos not in self.obstacles and
-                    (not self.special_food or food_pos != self.special_food)):
-                    return food_pos
-                attempts += 1
-            
-            # Fallback: return a position that's not in the snake
-            for x in range(GRID_WIDTH):
-                for y in range(GRID_HEIGHT):
-                    pos = (x, y)
-                    if pos not in self.snake:
-                        return pos
-            
-            # Ultimate fallback
-            return (0, 0)
-            
-        except Exception as e:
-            print(f"Error generating food: {e}")
-            return (5, 5)  # Safe fallback position
-    
-    def generate_special_food(self):
-        """Generate special food with power-up effects"""
-        try:
-            if random.random() < 0.3:  # 30% chance
-                max_attempts = 50
-                attempts = 0
-                
-                while attempts < max_attempts:
-                    special_pos = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-                    if (special_pos not in self.snake and 
-                        special_pos not in self.obstacles and
-                        special_pos != self.food):
-                        return special_pos
-                    attempts += 1
-            return None
-        except Exception as e:
-            print(f"Error generating special food: {e}")
-            return None
-    
-    def generate_obstacles(self):
-        """Generate obstacles for harder difficulties"""
-        try:
-            self.obstacles = []
-            num_obstacles = min(5, max(1, self.level))
-            
-            for _ in range(num_obstacles):
-                max_attempts = 50
-                attempts = 0
-                
-                while attempts < max_attempts:
-                    obstacle_pos = (random.randint(1, GRID_WIDTH - 2), random.randint(1, GRID_HEIGHT - 2))
-                    if (obstacle_pos not in self.snake and 
-                        obstacle_pos != self.food and
-                        obstacle_pos not in self.obstacles):
-                        self.obstacles.append(obstacle_pos)
-                        break
-                    attempts += 1
-        except Exception as e:
-            print(f"Error generating obstacles: {e}")
-            self.obstacles = []
-    
-    def move_snake(self):
-        """Move the snake and handle collisions"""
-        try:
-            # Update direction
-            self.direction = self.next_direction
-            
-            # Calculate new head position
-            head_x, head_y = self.snake[0]
-            new_head = (head_x + self.direction[0], head_y + self.direction[1])
-            
-            # Check wall collisions
-            if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or
-                new_head[1] < 0 or new_head[1] >= GRID_HEIGHT):
-                if not self.invincible:
-                    self.game_over()
-                    return
-                else:
-                    # Wrap around when invincible
-                    new_head = (new_head[0] % GRID_WIDTH, new_head[1] % GRID_HEIGHT)
-            
-            # Check self collision
-            if new_head in self.snake and not self.invincible:
-                self.game_over()
-                return
-            
-            # Check obstacle collision
-            if new_head in self.obstacles and not self.invincible:
-                self.game_over()
-                return
-            
-            # Add new head
-            self.snake.insert(0, new_head)
-            
-            # Check food collision
-            food_eaten = False
-            if new_head == self.food:
-                food_eaten = True
-                points = 10
-                if self.double_points:
-                    points *= 2
-                self.score += points
-                self.food = self.generate_food()
-                
-                # Level up every 100 points
-                new_level = (self.score // 100) + 1
-                if new_level > self.level:
-                    self.level = new_level
-                    self.speed = min(20, self.speed + 1)  # Increase speed
-                    self.move_delay = 1000 // self.speed
-                    if self.difficulty in ["Hard", "Extreme"]:
-                        self.generate_obstacles()
-            
-            # Check special food collision
-            if self.special_food and new_head == self.special_food:
-                food_eaten = True
-                self.activate_power_up()
-                self.special_food = None
-                self.special_food_timer = 0
-            
-            # Remove tail if no food eaten
-            if not food_eaten:
-                self.snake.pop()
-                
-        except Exception as e:
-            print(f"Error moving snake: {e}")
-            self.game_over()
-    
-    def activate_power_up(self):
-        """Activate a random power-up effect"""
-        try:
-            power_ups = ["invincible", "slow_motion", "double_points", "extra_life"]
-            power_up = random.choice(power_ups)
-            
-            if power_up == "invincible":
-                self.invincible = True
-                self.invincible_timer = 300  # 5 seconds at 60 FPS
-            elif power_up == "slow_motion":
-                self.slow_motion = True
-                self.slow_motion_timer = 300
-            elif power_up == "double_points":
-                self.double_points = True
-                self.double_points_timer = 600  # 10 seconds
-            elif power_up == "extra_life":
-                self.lives += 1
-            
-            # Add score bonus
-            bonus = 50
-            if self.double_points:
-                bonus *= 2
-            self.score += bonus
-            
-        except Exception as e:
-            print(f"Error activating power-up: {e}")
-    
-    def update_power_ups(self):
-        """Update power-up timers"""
-        try:
-            if self.invincible_timer > 0:
-                self.invincible_timer -= 1
-                if self.invincible_timer <= 0:
-                    self.invincible = False
-            
-            if self.slow_motion_timer > 0:
-                self.slow_motion_timer -= 1
-                if self.slow_motion_timer <= 0:
-                    self.slow_motion = False
-            
-            if self.double_points_timer > 0:
-                self.double_points_timer -= 1
-                if self.double_points_timer <= 0:
-                    self.double_points = False
-            
-            # Special food timer
-            if not self.special_food:
-                self.special_food_timer += 1
-                if self.special_food_timer > 600:  # 10 seconds
-                    self.special_food = self.generate_special_food()
-                    self.special_food_timer = 0
-                    
-        except Exception as e:
-            print(f"Error updating power-ups: {e}")
-    
-    def game_over(self):
-        """Handle game over"""
-        try:
-            self.lives -= 1
-            if self.lives <= 0:
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                self.game_state = "game_over"
-            else:
-                # Reset snake position but keep score
-                self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-                self.direction = (1, 0)
-                self.next_direction = (1, 0)
-                self.invincible = True
-                self.invincible_timer = 180  # 3 seconds of invincibility
-        except Exception as e:
-            print(f"Error in game over: {e}")
-            self.game_state = "game_over"
-    
     def draw_grid_object(self, pos, color, special_effect=None):
         """Draw an object on the grid"""
         try:
@@ -356,7 +96,7 @@ class SnakeClassic:
             
             # Title with snake-like animation
             title_text = "SNAKE CLASSIC"
-            title_surface = self.font_large.render(title_text, True, GREEN)
+            title_surface = render_text(self.font_large, title_text, True, GREEN)
             title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
             self.screen.blit(title_surface, title_rect)
             
@@ -374,9 +114,9 @@ class SnakeClassic:
             # Menu options
             menu_y = 250
             options = [
-                f"Difficulty: {self.difficulty}",
-                f"Mode: {self.game_mode}",
-                f"High Score: {self.high_score}",
+                f"Difficulty: {self.engine.difficulty}",
+                f"Mode: {self.engine.game_mode}",
+                f"High Score: {self.engine.high_score}",
                 "",
                 "Controls:",
                 "Arrow Keys - Move",
@@ -394,7 +134,7 @@ class SnakeClassic:
                     elif option.startswith("Controls:"):
                         color = BLUE
                     
-                    text_surface = self.font_small.render(option, True, color)
+                    text_surface = render_text(self.font_small, option, True, color)
                     text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, menu_y + i * 30))
                     self.screen.blit(text_surface, text_rect)
                 except:
@@ -409,7 +149,7 @@ class SnakeClassic:
             
             for i, instruction in enumerate(instruction_lines):
                 try:
-                    text_surface = self.font_small.render(instruction, True, GRAY)
+                    text_surface = render_text(self.font_small, instruction, True, GRAY)
                     text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, 500 + i * 25))
                     self.screen.blit(text_surface, text_rect)
                 except:
@@ -427,13 +167,13 @@ class SnakeClassic:
             pygame.draw.rect(self.screen, GRAY, (0, 0, SCREEN_WIDTH, 100))
             
             # Score and stats
-            score_text = f"Score: {self.score}"
-            level_text = f"Level: {self.level}"
-            lives_text = f"Lives: {self.lives}"
+            score_text = f"Score: {self.engine.score}"
+            level_text = f"Level: {self.engine.level}"
+            lives_text = f"Lives: {self.engine.lives}"
             
-            score_surface = self.font_medium.render(score_text, True, WHITE)
-            level_surface = self.font_medium.render(level_text, True, WHITE)
-            lives_surface = self.font_medium.render(lives_text, True, WHITE)
+            score_surface = render_text(self.font_medium, score_text, True, WHITE)
+            level_surface = render_text(self.font_medium, level_text, True, WHITE)
+            lives_surface = render_text(self.font_medium, lives_text, True, WHITE)
             
             self.screen.blit(score_surface, (20, 20))
             self.screen.blit(level_surface, (20, 50))
@@ -441,19 +181,19 @@ class SnakeClassic:
             
             # Power-up indicators
             power_up_x = 400
-            if self.invincible:
-                invincible_text = f"INVINCIBLE: {max(0, self.invincible_timer // 60)}s"
-                invincible_surface = self.font_small.render(invincible_text, True, YELLOW)
+            if self.engine.invincible:
+                invincible_text = f"INVINCIBLE: {max(0, self.engine.invincible_timer // 60)}s"
+                invincible_surface = render_text(self.font_small, invincible_text, True, YELLOW)
                 self.screen.blit(invincible_surface, (power_up_x, 20))
             
-            if self.slow_motion:
-                slow_text = f"SLOW-MO: {max(0, self.slow_motion_timer // 60)}s"
-                slow_surface = self.font_small.render(slow_text, True, BLUE)
+            if self.engine.slow_motion:
+                slow_text = f"SLOW-MO: {max(0, self.engine.slow_motion_timer // 60)}s"
+                slow_surface = render_text(self.font_small, slow_text, True, BLUE)
                 self.screen.blit(slow_surface, (power_up_x, 40))
             
-            if self.double_points:
-                double_text = f"2X POINTS: {max(0, self.double_points_timer // 60)}s"
-                double_surface = self.font_small.render(double_text, True, GREEN)
+            if self.engine.double_points:
+                double_text = f"2X POINTS: {max(0, self.engine.double_points_timer // 60)}s"
+                double_surface = render_text(self.font_small, double_text, True, GREEN)
                 self.screen.blit(double_surface, (power_up_x, 60))
             
             # Draw game area border
@@ -461,21 +201,21 @@ class SnakeClassic:
             pygame.draw.rect(self.screen, WHITE, game_area, 2)
             
             # Draw obstacles
-            for obstacle in self.obstacles:
+            for obstacle in self.engine.obstacles:
                 self.draw_grid_object(obstacle, GRAY)
             
             # Draw food
-            if self.food:
-                self.draw_grid_object(self.food, RED, "pulse")
+            if self.engine.food:
+                self.draw_grid_object(self.engine.food, RED, "pulse")
             
             # Draw special food
-            if self.special_food:
-                self.draw_grid_object(self.special_food, PURPLE, "glow")
+            if self.engine.special_food:
+                self.draw_grid_object(self.engine.special_food, PURPLE, "glow")
             
             # Draw snake
-            for i, segment in enumerate(self.snake):
+            for i, segment in enumerate(self.engine.snake):
                 if i == 0:  # Head
-                    color = YELLOW if self.invincible else GREEN
+                    color = YELLOW if self.engine.invincible else GREEN
                     self.draw_grid_object(segment, color)
                     # Draw eyes
                     try:
@@ -489,7 +229,7 @@ class SnakeClassic:
                     except:
                         pass
                 else:  # Body
-                    color = ORANGE if self.invincible else DARK_GREEN
+                    color = ORANGE if self.engine.invincible else DARK_GREEN
                     self.draw_grid_object(segment, color)
                     
         except Exception as e:
@@ -509,12 +249,12 @@ class SnakeClassic:
             
             # Pause text
             pause_text = "PAUSED"
-            pause_surface = self.font_large.render(pause_text, True, WHITE)
+            pause_surface = render_text(self.font_large, pause_text, True, WHITE)
             pause_rect = pause_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             self.screen.blit(pause_surface, pause_rect)
             
             instruction_text = "Press SPACE to resume"
-            instruction_surface = self.font_medium.render(instruction_text, True, GRAY)
+            instruction_surface = render_text(self.font_medium, instruction_text, True, GRAY)
             instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
             self.screen.blit(instruction_surface, instruction_rect)
             
@@ -528,43 +268,43 @@ class SnakeClassic:
             
             # Game Over text
             game_over_text = "GAME OVER"
-            game_over_surface = self.font_large.render(game_over_text, True, RED)
+            game_over_surface = render_text(self.font_large, game_over_text, True, RED)
             game_over_rect = game_over_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
             self.screen.blit(game_over_surface, game_over_rect)
             
             # Final stats
             stats = [
-                f"Final Score: {self.score}",
-                f"High Score: {self.high_score}",
-                f"Level Reached: {self.level}",
-                f"Snake Length: {len(self.snake)}"
+                f"Final Score: {self.engine.score}",
+                f"High Score: {self.engine.high_score}",
+                f"Level Reached: {self.engine.level}",
+                f"Snake Length: {len(self.engine.snake)}"
             ]
             
             for i, stat in enumerate(stats):
                 color = GREEN if "High Score" in stat else WHITE
-                stat_surface = self.font_medium.render(stat, True, color)
+                stat_surface = render_text(self.font_medium, stat, True, color)
                 stat_rect = stat_surface.get_rect(center=(SCREEN_WIDTH//2, 280 + i * 40))
                 self.screen.blit(stat_surface, stat_rect)
             
             # Performance rating
-            if self.score >= 500:
+            if self.engine.score >= 500:
                 rating = "Snake Master!"
-            elif self.score >= 300:
+            elif self.engine.score >= 300:
                 rating = "Excellent!"
-            elif self.score >= 150:
+            elif self.engine.score >= 150:
                 rating = "Good Job!"
-            elif self.score >= 50:
+            elif self.engine.score >= 50:
                 rating = "Not Bad!"
             else:
                 rating = "Keep Trying!"
             
-            rating_surface = self.font_medium.render(rating, True, YELLOW)
+            rating_surface = render_text(self.font_medium, rating, True, YELLOW)
             rating_rect = rating_surface.get_rect(center=(SCREEN_WIDTH//2, 450))
             self.screen.blit(rating_surface, rating_rect)
             
             # Restart options
             restart_text = "Press R to restart or ESC to quit"
-            restart_surface = self.font_small.render(restart_text, True, GRAY)
+            restart_surface = render_text(self.font_small, restart_text, True, GRAY)
             restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, 520))
             self.screen.blit(restart_surface, restart_rect)
             
@@ -590,14 +330,14 @@ class SnakeClassic:
                     elif self.game_state == "playing":
                         if event.key == pygame.K_SPACE:
                             self.game_state = "paused"
-                        elif event.key == pygame.K_UP and self.direction != (0, 1):
-                            self.next_direction = (0, -1)
-                        elif event.key == pygame.K_DOWN and self.direction != (0, -1):
-                            self.next_direction = (0, 1)
-                        elif event.key == pygame.K_LEFT and self.direction != (1, 0):
-                            self.next_direction = (-1, 0)
-                        elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-                            self.next_direction = (1, 0)
+                        elif event.key == pygame.K_UP:
+                            self.engine.turn(UP)
+                        elif event.key == pygame.K_DOWN:
+                            self.engine.turn(DOWN)
+                        elif event.key == pygame.K_LEFT:
+                            self.engine.turn(LEFT)
+                        elif event.key == pygame.K_RIGHT:
+                            self.engine.turn(RIGHT)
                     elif self.game_state == "paused":
                         if event.key == pygame.K_SPACE:
                             self.game_state = "playing"
@@ -613,9 +353,9 @@ class SnakeClassic:
         """Cycle through difficulty levels"""
         try:
             difficulties = ["Easy", "Normal", "Hard", "Extreme"]
-            current_index = difficulties.index(self.difficulty)
-            self.difficulty = difficulties[(current_index + 1) % len(difficulties)]
-            self.setup_difficulty()
+            current_index = difficulties.index(self.engine.difficulty)
+            self.engine.difficulty = difficulties[(current_index + 1) % len(difficulties)]
+            self.engine.setup_difficulty()
         except Exception as e:
             print(f"Error cycling difficulty: {e}")
     
@@ -623,49 +363,17 @@ class SnakeClassic:
         """Cycle through game modes"""
         try:
             modes = ["Classic", "Arcade", "Survival"]
-            current_index = modes.index(self.game_mode)
-            self.game_mode = modes[(current_index + 1) % len(modes)]
-            
-            # Adjust lives based on mode
-            if self.game_mode == "Classic":
-                self.lives = 3
-            elif self.game_mode == "Arcade":
-                self.lives = 5
-            elif self.game_mode == "Survival":
-                self.lives = 1
+            current_index = modes.index(self.engine.game_mode)
+            
+            # Also adjusts lives based on mode
+            self.engine.set_mode(modes[(current_index + 1) % len(modes)])
         except Exception as e:
             print(f"Error cycling mode: {e}")
     
     def start_game(self):
         """Start a new game"""
         try:
-            self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-            self.direction = (1, 0)
-            self.next_direction = (1, 0)
-            self.food = self.generate_food()
-            self.special_food = None
-            self.special_food_timer = 0
-            self.score = 0
-            self.level = 1
-            self.last_move_time = pygame.time.get_ticks()
-            
-            # Set lives based on mode
-            if self.game_mode == "Classic":
-                self.lives = 3
-            elif self.game_mode == "Arcade":
-                self.lives = 5
-            elif self.game_mode == "Survival":
-                self.lives = 1
-            
-            # Reset power-ups
-            self.invincible = False
-            self.invincible_timer = 0
-            self.slow_motion = False
-            self.slow_motion_timer = 0
-            self.double_points = False
-            self.double_points_timer = 0
-            
-            self.setup_difficulty()
+            self.engine.reset()
             self.game_state = "playing"
             
         except Exception as e:
@@ -681,18 +389,10 @@ class SnakeClassic:
             self.animation_time += 1
             
             if self.game_state == "playing":
-                self.update_power_ups()
-                
-                # Move snake based on timing
-                current_time = pygame.time.get_ticks()
-                move_delay = self.move_delay
-                
-                if self.slow_motion:
-                    move_delay *= 2  # Double the delay for slow motion
-                
-                if current_time - self.last_move_time >= move_delay:
-                    self.move_snake()
-                    self.last_move_time = current_time
+                # One engine tick per 60 FPS frame
+                _, done = self.engine.step()
+                if done:
+                    self.game_state = "game_over"
                     
         except Exception as e:
             print(f"Error updating game: {e}")
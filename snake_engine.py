@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Snake Engine - Pygame-free, tick-based rules for Snake Classic
+One tick is one 60 FPS frame; the snake moves whenever its move delay has
+elapsed. Randomness comes from a seeded RNG so runs are reproducible.
+"""
+
+import random
+from collections import deque
+
+# Default board, matching Snake Classic's 800x500 play area of 20px cells
+GRID_WIDTH = 40
+GRID_HEIGHT = 25
+
+FRAME_MS = 1000 / 60  # Simulated time per tick
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+
+DIFFICULTY_SETTINGS = {
+    "Easy": {"speed": 6, "obstacles": False, "power_ups": True},
+    "Normal": {"speed": 8, "obstacles": False, "power_ups": True},
+    "Hard": {"speed": 12, "obstacles": True, "power_ups": True},
+    "Extreme": {"speed": 16, "obstacles": True, "power_ups": False}
+}
+
+MODE_LIVES = {"Classic": 3, "Arcade": 5, "Survival": 1}
+
+POWER_UPS = ["invincible", "slow_motion", "double_points", "extra_life"]
+
+
+class FreeCellIndex:
+    """Set of free grid cells with O(1) add, discard and uniform choice
+
+    Cells live in a flat list; a position -> slot map lets a cell be removed
+    by swapping the last cell into its slot.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.slots = {pos: i for i, pos in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, pos):
+        return pos in self.slots
+
+    def add(self, pos):
+        if pos not in self.slots:
+            self.slots[pos] = len(self.cells)
+            self.cells.append(pos)
+
+    def discard(self, pos):
+        slot = self.slots.pop(pos, None)
+        if slot is None:
+            return
+        last = self.cells.pop()
+        if slot < len(self.cells):
+            self.cells[slot] = last
+            self.slots[last] = slot
+
+    def choice(self, rng=random):
+        """Return a uniformly random free cell, or None if the board is full"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeEngine:
+    """Snake rules: movement, food, power-ups, lives, levels and obstacles"""
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT,
+                 difficulty="Normal", game_mode="Classic", seed=None):
+        self.width = width
+        self.height = height
+        self.difficulty = difficulty  # Easy, Normal, Hard, Extreme
+        self.game_mode = game_mode  # Classic, Arcade, Survival
+        self.rng = random.Random(seed)
+        self.high_score = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new game, keeping the high score"""
+        self.reset_snake()
+        self.food = None
+        self.special_food = None
+        self.special_food_timer = 0
+        self.obstacles = set()
+        self.rebuild_free_cells()
+
+        self.score = 0
+        self.level = 1
+        self.lives = MODE_LIVES.get(self.game_mode, 3)
+        self.done = False
+
+        # Power-up timers count ticks
+        self.invincible = False
+        self.invincible_timer = 0
+        self.slow_motion = False
+        self.slow_motion_timer = 0
+        self.double_points = False
+        self.double_points_timer = 0
+
+        self.ticks = 0
+        self.last_move_time = 0
+
+        # Obstacles first, so food never lands on one
+        self.setup_difficulty()
+        self.food = self.generate_food()
+
+    def setup_difficulty(self):
+        """Set up speed and obstacles based on difficulty"""
+        settings = DIFFICULTY_SETTINGS.get(self.difficulty, DIFFICULTY_SETTINGS["Normal"])
+        self.speed = settings["speed"]
+        self.move_delay = 1000 // self.speed
+
+        if settings["obstacles"] and self.game_mode != "Classic":
+            self.generate_obstacles()
+        else:
+            self.clear_obstacles()
+
+    def set_mode(self, game_mode):
+        self.game_mode = game_mode
+        self.lives = MODE_LIVES.get(game_mode, 3)
+
+    # Board bookkeeping
+
+    def reset_snake(self):
+        """Place a new one-segment snake in the middle of the board"""
+        start = (self.width // 2, self.height // 2)
+        self.snake = deque([start])
+        # Counts rather than a set: while invincible the head may pass over the body
+        self.snake_cells = {start: 1}
+        self.direction = RIGHT
+        self.next_direction = RIGHT
+
+    def push_head(self, pos):
+        """Add a new head segment"""
+        self.snake.appendleft(pos)
+        self.snake_cells[pos] = self.snake_cells.get(pos, 0) + 1
+        self.free_cells.discard(pos)
+
+    def pop_tail(self):
+        """Remove the tail segment"""
+        tail = self.snake.pop()
+        count = self.snake_cells[tail] - 1
+        if count:
+            self.snake_cells[tail] = count
+        else:
+            del self.snake_cells[tail]
+            self.release_cell(tail)
+
+    def rebuild_free_cells(self):
+        """Recompute the free-cell index from scratch (new game or respawn)"""
+        taken = {self.food, self.special_food}
+        self.free_cells = FreeCellIndex(
+            (x, y) for x in range(self.width) for y in range(self.height)
+            if (x, y) not in self.snake_cells and (x, y) not in self.obstacles
+            and (x, y) not in taken
+        )
+
+    def release_cell(self, pos):
+        """Return a cell to the free index if nothing else occupies it"""
+        if (pos not in self.snake_cells and pos not in self.obstacles and
+                pos != self.food and pos != self.special_food):
+            self.free_cells.add(pos)
+
+    def generate_food(self):
+        """Take a random free cell for food"""
+        food_pos = self.free_cells.choice(self.rng)
+        if food_pos is not None:
+            self.free_cells.discard(food_pos)
+        return food_pos
+
+    def generate_special_food(self):
+        """Take a random free cell for special food (30% chance)"""
+        if self.rng.random() < 0.3:
+            return self.generate_food()
+        return None
+
+    def clear_obstacles(self):
+        """Remove all obstacles and free their cells"""
+        old_obstacles = self.obstacles
+        self.obstacles = set()
+        for pos in old_obstacles:
+            self.release_cell(pos)
+
+    def generate_obstacles(self):
+        """Generate obstacles for harder difficulties"""
+        self.clear_obstacles()
+        num_obstacles = min(5, max(1, self.level))
+
+        for _ in range(num_obstacles):
+            # Free cells are always valid; only the border is off limits
+            for _ in range(50):
+                obstacle_pos = self.free_cells.choice(self.rng)
+                if obstacle_pos is None:
+                    return
+                x, y = obstacle_pos
+                if 1 <= x <= self.width - 2 and 1 <= y <= self.height - 2:
+                    self.obstacles.add(obstacle_pos)
+                    self.free_cells.discard(obstacle_pos)
+                    break
+
+    # Rules
+
+    def turn(self, direction):
+        """Queue a direction change; reversing onto the body is ignored"""
+        if direction != (-self.direction[0], -self.direction[1]):
+            self.next_direction = direction
+
+    def step(self, action=None):
+        """Advance one tick, optionally turning first
+
+        Returns (reward, done) where reward is the score gained this tick.
+        """
+        if self.done:
+            return 0, True
+        if action is not None:
+            self.turn(action)
+
+        score_before = self.score
+        self.ticks += 1
+        self.update_power_ups()
+
+        now = self.ticks * FRAME_MS
+        move_delay = self.move_delay * 2 if self.slow_motion else self.move_delay
+        if now - self.last_move_time >= move_delay:
+            self.move_snake()
+            self.last_move_time = now
+
+        return self.score - score_before, self.done
+
+    def move_snake(self):
+        """Move the snake one cell and handle collisions"""
+        self.direction = self.next_direction
+
+        head_x, head_y = self.snake[0]
+        new_head = (head_x + self.direction[0], head_y + self.direction[1])
+
+        # Wall collisions; wrap around when invincible
+        if not (0 <= new_head[0] < self.width and 0 <= new_head[1] < self.height):
+            if not self.invincible:
+                self.lose_life()
+                return
+            new_head = (new_head[0] % self.width, new_head[1] % self.height)
+
+        # Self and obstacle collisions
+        if not self.invincible and (new_head in self.snake_cells or new_head in self.obstacles):
+            self.lose_life()
+            return
+
+        self.push_head(new_head)
+
+        food_eaten = False
+        if new_head == self.food:
+            food_eaten = True
+            points = 10
+            if self.double_points:
+                points *= 2
+            self.score += points
+            self.food = self.generate_food()
+
+            # Level up every 100 points
+            new_level = (self.score // 100) + 1
+            if new_level > self.level:
+                self.level = new_level
+                self.speed = min(20, self.speed + 1)
+                self.move_delay = 1000 // self.speed
+                if self.difficulty in ["Hard", "Extreme"]:
+                    self.generate_obstacles()
+
+        if self.special_food and new_head == self.special_food:
+            food_eaten = True
+            self.activate_power_up()
+            self.special_food = None
+            self.special_food_timer = 0
+
+        # Grow by keeping the tail when something was eaten
+        if not food_eaten:
+            self.pop_tail()
+
+    def activate_power_up(self):
+        """Activate a random power-up effect"""
+        power_up = self.rng.choice(POWER_UPS)
+
+        if power_up == "invincible":
+            self.invincible = True
+            self.invincible_timer = 300  # 5 seconds at 60 FPS
+        elif power_up == "slow_motion":
+            self.slow_motion = True
+            self.slow_motion_timer = 300
+        elif power_up == "double_points":
+            self.double_points = True
+            self.double_points_timer = 600  # 10 seconds
+        elif power_up == "extra_life":
+            self.lives += 1
+
+        bonus = 50
+        if self.double_points:
+            bonus *= 2
+        self.score += bonus
+
+    def update_power_ups(self):
+        """Count down power-up timers and spawn special food"""
+        if self.invincible_timer > 0:
+            self.invincible_timer -= 1
+            if self.invincible_timer <= 0:
+                self.invincible = False
+
+        if self.slow_motion_timer > 0:
+            self.slow_motion_timer -= 1
+            if self.slow_motion_timer <= 0:
+                self.slow_motion = False
+
+        if self.double_points_timer > 0:
+            self.double_points_timer -= 1
+            if self.double_points_timer <= 0:
+                self.double_points = False
+
+        if not self.special_food:
+            self.special_food_timer += 1
+            if self.special_food_timer > 600:  # 10 seconds
+                self.special_food = self.generate_special_food()
+                self.special_food_timer = 0
+
+    def lose_life(self):
+        """Lose a life, respawning the snake or ending the game"""
+        self.lives -= 1
+        if self.lives <= 0:
+            if self.score > self.high_score:
+                self.high_score = self.score
+            self.done = True
+        else:
+            # Reset snake position but keep score
+            self.reset_snake()
+            self.rebuild_free_cells()
+            self.invincible = True
+            self.invincible_timer = 180  # 3 seconds of invincibility
+
+
+def run_random_games(ticks=100000, seed=0, difficulty="Normal", game_mode="Classic"):
+    """Drive the engine with a random bot and report throughput"""
+    import time
+
+    engine = SnakeEngine(difficulty=difficulty, game_mode=game_mode, seed=seed)
+    bot = random.Random(seed)
+    scores = []
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        action = bot.choice(DIRECTIONS) if bot.random() < 0.1 else None
+        _, done = engine.step(action)
+        if done:
+            scores.append(engine.score)
+            engine.reset()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": ticks,
+        "ticks_per_second": ticks / elapsed if elapsed else float("inf"),
+        "games_finished": len(scores),
+        "mean_score": sum(scores) / len(scores) if scores else 0.0,
+        "max_score": max(scores) if scores else 0
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless Snake simulation")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", default="Normal", choices=list(DIFFICULTY_SETTINGS))
+    parser.add_argument("--mode", default="Classic", choices=list(MODE_LIVES))
+    args = parser.parse_args()
+
+    stats = run_random_games(args.ticks, args.seed, args.difficulty, args.mode)
+    print(f"{stats['ticks']} ticks at {stats['ticks_per_second']:,.0f} ticks/s, "
+          f"{stats['games_finished']} games, mean score {stats['mean_score']:.1f}, "
+          f"max score {stats['max_score']}")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Sound Synth - Procedural audio for Mystery Sound
+Every sound is built from noise, clicks and sine partials with NumPy, so
+the game ships no audio files. A sample is synthesized once and saved to
+~/.cache/thinkverse/ (override with THINKVERSE_CACHE_DIR) under a hash of
+its recipe parameters; later launches just load it. Requires numpy; the
+game falls back to visuals only without it or without an audio device.
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+CACHE_DIR = os.environ.get("THINKVERSE_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "thinkverse"))
+
+SAMPLE_RATE = 22050
+DURATION = 4.0      # Seconds; every recipe loops seamlessly at this length
+PEAK = 0.8          # Normalized peak level
+SYNTH_VERSION = 1   # Bump when a recipe function changes, to invalidate cached samples
+
+
+def band_noise(rng, n, sample_rate, low, high):
+    """White noise band-limited to low..high Hz
+
+    Filtering in the frequency domain makes the result periodic in n,
+    so looping it has no seam.
+    """
+    spectrum = np.fft.rfft(rng.standard_normal(n))
+    freqs = np.fft.rfftfreq(n, 1 / sample_rate)
+    spectrum[(freqs < low) | (freqs > high)] = 0
+    noise = np.fft.irfft(spectrum, n)
+    return noise / (np.abs(noise).max() or 1)
+
+
+def place(n, positions, amplitudes, kernel):
+    """Add kernel at each sample position, scaled, wrapping past the end"""
+    impulses = np.zeros(n)
+    np.add.at(impulses, positions % n, amplitudes)
+    out = np.convolve(impulses, kernel)
+    # Fold the tail back to the start so the loop stays seamless
+    out[:len(out) - n] += out[n:]
+    return out[:n]
+
+
+def decay(length, time_constant, sample_rate):
+    return np.exp(-np.arange(length) / (time_constant * sample_rate))
+
+
+def rain(rng, n, sample_rate, drops_per_second, drop_ms, hiss):
+    """Filtered noise bursts at random times over a soft hiss"""
+    drop_length = int(drop_ms / 1000 * sample_rate)
+    kernel = band_noise(rng, drop_length, sample_rate, 2000, 9000) * decay(drop_length, drop_ms / 4000, sample_rate)
+    count = int(drops_per_second * n / sample_rate)
+    drops = place(n, rng.integers(0, n, count), rng.uniform(0.2, 1.0, count), kernel)
+    return drops + hiss * band_noise(rng, n, sample_rate, 1000, 8000)
+
+
+def clock(rng, n, sample_rate, ticks_per_second, tick_hz, tock_hz):
+    """Alternating tick and tock clicks"""
+    click_length = int(0.02 * sample_rate)
+    t = np.arange(click_length) / sample_rate
+    envelope = decay(click_length, 0.002, sample_rate)
+    interval = int(sample_rate / ticks_per_second)
+    positions = np.arange(0, n, interval)
+    ticks = place(n, positions[::2], 1.0, np.sin(2 * np.pi * tick_hz * t) * envelope)
+    tocks = place(n, positions[1::2], 0.8, np.sin(2 * np.pi * tock_hz * t) * envelope)
+    return ticks + tocks + 0.05 * rng.standard_normal(n) * (np.abs(ticks + tocks) > 0.05)
+
+
+def ocean(rng, n, sample_rate, waves, low, high):
+    """Low noise swelling and fading like breaking waves"""
+    phase = np.arange(n) / n * waves
+    swell = (0.5 - 0.5 * np.cos(2 * np.pi * phase)) ** 2
+    return band_noise(rng, n, sample_rate, low, high) * (0.15 + 0.85 * swell)
+
+
+def fire(rng, n, sample_rate, crackles_per_second, rumble):
+    """Sharp crackles over a low roar"""
+    crackle_length = int(0.004 * sample_rate)
+    kernel = rng.standard_normal(crackle_length) * decay(crackle_length, 0.0008, sample_rate)
+    count = int(crackles_per_second * n / sample_rate)
+    amplitudes = rng.uniform(0.1, 1.0, count) ** 3  # Mostly small pops, a few loud ones
+    crackles = place(n, rng.integers(0, n, count), amplitudes, kernel)
+    return crackles + rumble * band_noise(rng, n, sample_rate, 40, 500)
+
+
+def bird(rng, n, sample_rate, phrases, low_hz, high_hz):
+    """Phrases of short rising and falling chirps"""
+    out = np.zeros(n)
+    phrase_length = n // phrases
+    for p in range(phrases):
+        start = p * phrase_length + int(rng.uniform(0, 0.2) * phrase_length)
+        for _ in range(int(rng.integers(3, 6))):
+            length = int(rng.uniform(0.05, 0.12) * sample_rate)
+            f0, f1 = rng.uniform(low_hz, high_hz, 2)
+            freq = np.linspace(f0, f1, length)
+            chirp = np.sin(2 * np.pi * np.cumsum(freq) / sample_rate) * np.hanning(length)
+            end = min(n, start + length)
+            out[start:end] += chirp[:end - start]
+            start = end + int(rng.uniform(0.02, 0.08) * sample_rate)
+            if start >= n:
+                break
+    return out
+
+
+def train(rng, n, sample_rate, chuffs_per_second, rumble):
+    """Rhythmic steam chuffs over a rumble"""
+    chuff_length = int(0.12 * sample_rate)
+    kernel = band_noise(rng, chuff_length, sample_rate, 150, 2500) * np.hanning(chuff_length)
+    positions = np.arange(0, n, int(sample_rate / chuffs_per_second))
+    accents = np.where(np.arange(len(positions)) % 4 == 0, 1.0, 0.6)
+    return place(n, positions, accents, kernel) + rumble * band_noise(rng, n, sample_rate, 30, 200)
+
+
+def wind(rng, n, sample_rate, gusts, low, high):
+    """Noise whose loudness rises and falls in uneven gusts"""
+    phase = np.arange(n) / n
+    envelope = (0.6 + 0.25 * np.sin(2 * np.pi * gusts * phase)
+                + 0.15 * np.sin(2 * np.pi * (gusts * 2 + 1) * phase + 1.3))
+    return band_noise(rng, n, sample_rate, low, high) * envelope
+
+
+def bell(rng, n, sample_rate, strikes_hz, partials, ring_seconds):
+    """Struck bell: inharmonic partials, the high ones dying away first"""
+    t = np.arange(n) / sample_rate
+    out = np.zeros(n)
+    strike_gap = n // len(strikes_hz)
+    for i, fundamental in enumerate(strikes_hz):
+        tone = np.zeros(n)
+        for ratio, level in partials:
+            tone += level * np.sin(2 * np.pi * fundamental * ratio * t) * np.exp(-t * ratio / ring_seconds)
+        out += np.roll(tone, i * strike_gap)
+    return out
+
+
+# Mystery Sound "pattern" -> (recipe, parameters); parameters are part of the cache key
+SOUND_RECIPES = {
+    "random_drops": (rain, {"drops_per_second": 60, "drop_ms": 25, "hiss": 0.15}),
+    "metronome": (clock, {"ticks_per_second": 2, "tick_hz": 3200, "tock_hz": 2400}),
+    "wave_cycle": (ocean, {"waves": 1, "low": 80, "high": 1500}),
+    "random_crackle": (fire, {"crackles_per_second": 40, "rumble": 0.2}),
+    "chirp_sequence": (bird, {"phrases": 2, "low_hz": 2500, "high_hz": 5000}),
+    "locomotive": (train, {"chuffs_per_second": 4, "rumble": 0.3}),
+    "wind_gusts": (wind, {"gusts": 2, "low": 150, "high": 1200}),
+    "bell_toll": (bell, {"strikes_hz": [660, 523],
+                         "partials": [[0.56, 1.0], [0.92, 0.7], [1.19, 0.6], [1.71, 0.4],
+                                      [2.0, 0.35], [2.74, 0.25], [3.0, 0.2], [3.76, 0.12]],
+                         "ring_seconds": 1.2})
+}
+
+
+def synthesize(pattern, sample_rate=SAMPLE_RATE, duration=DURATION, seed=0):
+    """Render a recipe to mono int16 samples"""
+    recipe, params = SOUND_RECIPES[pattern]
+    rng = np.random.default_rng(seed)
+    samples = recipe(rng, int(duration * sample_rate), sample_rate, **params)
+    samples *= PEAK / (np.abs(samples).max() or 1)
+    return (samples * 32767).astype(np.int16)
+
+
+def sample_key(pattern, sample_rate=SAMPLE_RATE, duration=DURATION, seed=0):
+    """Hash of everything that affects a sample's content"""
+    params = SOUND_RECIPES[pattern][1]
+    spec = json.dumps([SYNTH_VERSION, pattern, params, sample_rate, duration, seed], sort_keys=True)
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:16]
+
+
+def load_sample(pattern, sample_rate=SAMPLE_RATE, duration=DURATION, seed=0, cache_dir=CACHE_DIR):
+    """Load a sample from the disk cache, synthesizing and saving it on a miss"""
+    path = os.path.join(cache_dir, f"sound_{pattern}_{sample_key(pattern, sample_rate, duration, seed)}.npy")
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+
+    samples = synthesize(pattern, sample_rate, duration, seed)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, samples)
+        os.replace(temp_path, path)  # Atomic, so readers never see a partial file
+    except OSError as e:
+        print(f"Could not cache sound {pattern}: {e}")
+    return samples
+
+
+def mixer_format():
+    """(frequency, channels) of a usable 16-bit mixer, or None for no audio"""
+    if not HAS_NUMPY:
+        return None
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        frequency, size, channels = pygame.mixer.get_init()
+    except (pygame.error, TypeError) as e:
+        print(f"Audio unavailable, sounds are visual only: {e}")
+        return None
+    if size != -16:
+        print(f"Unsupported mixer sample format {size}, sounds are visual only")
+        return None
+    return frequency, channels
+
+
+class SampleBank:
+    """Loads or synthesizes samples on worker threads and hands out Sounds
+
+    Work starts for every pattern as soon as the bank is created; sound()
+    never blocks and returns None until that pattern is ready.
+    """
+
+    def __init__(self, patterns, frequency=SAMPLE_RATE, channels=1, workers=2, cache_dir=CACHE_DIR):
+        self.channels = channels
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sound-synth")
+        self.futures = {pattern: self.executor.submit(load_sample, pattern, frequency, cache_dir=cache_dir)
+                        for pattern in patterns if pattern in SOUND_RECIPES}
+        self.sounds = {}
+
+    def sound(self, pattern):
+        if pattern in self.sounds:
+            return self.sounds[pattern]
+        future = self.futures.get(pattern)
+        if future is None or not future.done():
+            return None
+
+        del self.futures[pattern]
+        try:
+            samples = future.result()
+            if self.channels > 1:
+                samples = np.repeat(samples[:, None], self.channels, axis=1)
+            sound = pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+        except Exception as e:
+            print(f"Could not load sound {pattern}: {e}")
+            sound = None
+        self.sounds[pattern] = sound
+        return sound
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_wav(path, samples, sample_rate):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Mystery Sound sample cache")
+    parser.add_argument("--patterns", nargs="*", default=list(SOUND_RECIPES), choices=list(SOUND_RECIPES))
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE, help="sample rate in Hz")
+    parser.add_argument("--export", help="also write each sample as a WAV file into this directory")
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("The synthesizer needs numpy: pip install numpy")
+        sys.exit(1)
+
+    for pattern in args.patterns:
+        start = time.perf_counter()
+        samples = load_sample(pattern, args.rate)
+        print(f"{pattern:15} {len(samples) / args.rate:.1f} s  {(time.perf_counter() - start) * 1000:6.1f} ms")
+        if args.export:
+            os.makedirs(args.export, exist_ok=True)
+            write_wav(os.path.join(args.export, f"{pattern}.wav"), samples, args.rate)
+
+
+if __name__ == "__main__":
+    main()
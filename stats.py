@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Stats - Small statistics helpers shared by the benchmark and game metrics
+"""
+
+import math
+
+
+def percentile(sorted_values, p, default=None):
+    """Nearest-rank p-th percentile (p in 0-100) of an already sorted list
+
+    The value at rank ceil(p/100 * n), so p50 of two samples is the lower
+    one and p99 of 100 samples is the 99th. Returns default when empty.
+    """
+    if not sorted_values:
+        return default
+    # Rounding first keeps float noise (e.g. 0.07 * 100) from bumping the rank
+    rank = math.ceil(round(p / 100 * len(sorted_values), 9))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
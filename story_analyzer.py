@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Story Analyzer - Static checks for AI Dungeon Quest stories
+Reports reachability from the start scene, broken choice links, unreachable
+scenes, cycles, endings and the maximum achievable score. The story is
+flattened once into index arrays that every check shares; all checks are
+linear in scenes + choices except the item tracking in max_score (see
+there). Exits with status 1 when a story has broken links or unreachable
+scenes, so it can gate new story content.
+"""
+
+import sys
+import json
+import time
+import heapq
+import argparse
+from array import array
+
+from dungeon_story import DEFAULT_STORY, load_story
+
+
+class StoryGraph:
+    """A story's choices as flat arrays, built in one walk over the scenes
+
+    The choices of scene i are edges offsets[i]..offsets[i + 1] - 1; edge e
+    leads to targets[e] and scores points[e]. requires, grants and removes
+    map an edge to a bitset over gating_items (items some choice requires),
+    and only hold edges that have one. dead_ends lists the scenes whose only
+    way on is back to the start (or nowhere).
+    """
+
+    def __init__(self, story):
+        self.start = story.start
+        self.ids = []
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.dead_ends = []
+        scores = {}
+        required_items = {}
+        granted_items = {}
+        removed_items = {}
+
+        for scene in story.scenes():
+            self.ids.append(scene.id)
+            if any(scene.rules):
+                edge = len(self.targets)
+                for rule in scene.rules:
+                    if rule:
+                        required, granted, removed, points = choice_summary(rule)
+                        if points:
+                            scores[edge] = points
+                        if required:
+                            required_items[edge] = required
+                        if granted:
+                            granted_items[edge] = granted
+                        if removed:
+                            removed_items[edge] = removed
+                    edge += 1
+            self.targets.extend(scene.targets)
+            self.offsets.append(len(self.targets))
+            if scene.targets.count(self.start) == len(scene.targets):
+                self.dead_ends.append(scene.index)
+
+        self.points = array("i", bytes(4 * len(self.targets)))
+        for edge, points in scores.items():
+            self.points[edge] = points
+        self.gating_items = sorted({item for items in required_items.values() for item in items})
+        item_bits = {item: 1 << i for i, item in enumerate(self.gating_items)}
+        self.requires = {edge: sum(item_bits[item] for item in set(items))
+                         for edge, items in required_items.items()}
+        self.grants = item_bitsets(granted_items, item_bits)
+        self.removes = item_bitsets(removed_items, item_bits)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def item_bitsets(edge_items, item_bits):
+    """{edge: bitset} of the gating items among each edge's items"""
+    bitsets = {}
+    for edge, items in edge_items.items():
+        bits = sum(item_bits[item] for item in set(items) if item in item_bits)
+        if bits:
+            bitsets[edge] = bits
+    return bitsets
+
+
+def strongly_connected_components(node_count, offsets, targets, roots=None, skip=-1):
+    """Iterative Tarjan over a CSR graph
+
+    Returns (component, order, bounds): the component of each node, the
+    visited nodes grouped by component, and where each group starts in
+    order (component c is order[bounds[c]:bounds[c + 1]]). Only nodes
+    reachable from roots (default: all nodes) are visited; the rest keep
+    component -1. Edges to negative targets or to skip are ignored.
+    Components are numbered in reverse topological order: every component
+    reachable from component c has a smaller number than c.
+    """
+    index = [-1] * node_count
+    lowlink = [0] * node_count
+    component = [-1] * node_count
+    next_edge = list(offsets)
+    stack = []
+    calls = []
+    order = []
+    bounds = [0]
+    counter = 0
+    count = 0
+
+    for root in (range(node_count) if roots is None else roots):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        calls.append(root)
+
+        while calls:
+            node = calls[-1]
+            edge = next_edge[node]
+            if edge < offsets[node + 1]:
+                next_edge[node] = edge + 1
+                target = targets[edge]
+                if target < 0 or target == skip:
+                    continue
+                if index[target] == -1:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    calls.append(target)
+                elif component[target] == -1 and index[target] < lowlink[node]:
+                    # Visited but unassigned means still on the stack
+                    lowlink[node] = index[target]
+                continue
+
+            calls.pop()
+            if lowlink[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    component[member] = count
+                    order.append(member)
+                    if member == node:
+                        break
+                bounds.append(len(order))
+                count += 1
+            if calls and lowlink[node] < lowlink[calls[-1]]:
+                lowlink[calls[-1]] = lowlink[node]
+
+    return component, order, bounds
+
+
+def restart_free_components(graph):
+    """Components of the scenes reachable from the start, restarts left out
+
+    Choices back to the start scene are restarts, otherwise every ending
+    would close a loop through the whole story. Leaving them out does not
+    change reachability, since the start is where the search begins.
+    """
+    return strongly_connected_components(len(graph), graph.offsets, graph.targets,
+                                         roots=[graph.start], skip=graph.start)
+
+
+def find_cycles(graph, components):
+    """Groups of reachable scenes that can loop without restarting"""
+    offsets, targets = graph.offsets, graph.targets
+    component, order, bounds = components
+    cycles = []
+    for c in range(len(bounds) - 1):
+        first, last = bounds[c], bounds[c + 1]
+        if last - first > 1:
+            cycles.append(order[first:last])
+        else:
+            node = order[first]
+            if node != graph.start and node in targets[offsets[node]:offsets[node + 1]]:
+                cycles.append([node])
+    return cycles
+
+
+def find_endings(graph, components, dangling):
+    """Reachable scenes whose only way on is back to the start (or nowhere)"""
+    component = components[0]
+    # Broken links are reported separately
+    return [node for node in graph.dead_ends
+            if component[node] >= 0 and node != graph.start and node not in dangling]
+
+
+def choice_summary(rule):
+    """(required items, items gained, items lost, score gained) of a choice rule
+
+    Only item conditions are modelled; health and score conditions are
+    treated as always met.
+    """
+    requires = rule.get("requires")
+    if not requires:
+        required = ()
+    elif isinstance(requires, str):
+        required = (requires,)
+    else:
+        required = requires.get("items", ())
+    effects = rule.get("effects")
+    if not effects:
+        return required, (), (), 0
+    return (required, effects.get("add_items", ()), effects.get("remove_items", ()),
+            effects.get("score", 0))
+
+
+def max_score(graph, components):
+    """Highest score a run can reach under the story's choice rules
+
+    A choice back to the start scene is a restart: it scores its points
+    and ends the run, as in find_cycles. Returns (score, loop) where score
+    is None and loop names a scoring move that can be repeated forever
+    when the score is unbounded.
+
+    Items can unlock choices, so a run's state is (scene, gating items
+    held). Only states a run can reach from the start through open choices
+    count, so a loop behind a lock that never opens is not unbounded. Held
+    items are only tracked where they can still matter, in components from
+    which some item-locked choice is reachable; everywhere else one state
+    per scene suffices, which keeps the search linear in scenes + choices
+    for stories without items. In the tracked region it visits every
+    (scene, held items) combination that a run can reach, which in the
+    worst case grows exponentially with the number of gating items.
+    """
+    offsets, targets, points, start = graph.offsets, graph.targets, graph.points, graph.start
+    requires, grants, removes = graph.requires, graph.grants, graph.removes
+    component, order, bounds = components
+    count = len(bounds) - 1
+
+    # Items each component can still use: locks on its own choices and downstream
+    need = [0] * count
+    for c in range(count if requires else 0):
+        mask = 0
+        for node in order[bounds[c]:bounds[c + 1]]:
+            first = offsets[node]
+            for edge, target in enumerate(targets[first:offsets[node + 1]], first):
+                if edge in requires:
+                    mask |= requires[edge]
+                if target != start:
+                    mask |= need[component[target]]
+        need[c] = mask
+
+    def held_after(edge, held):
+        """Items held after taking an edge: gains first, then losses"""
+        if edge in grants:
+            held |= grants[edge]
+        if edge in removes:
+            held &= ~removes[edge]
+        return held
+
+    # States a run can actually reach from the start, following only open
+    # choices; held items are cut down to what the target can still use.
+    # Held states are kept as one set per bitset rather than as millions of
+    # small containers.
+    reached = bytearray(len(graph))  # Scenes reached holding nothing
+    held_scenes = {}  # nonzero held bitset -> scenes reached holding it
+    holding = set()   # Scenes reached holding anything
+    if not requires:
+        # Nothing is ever locked
+        for node in order:
+            reached[node] = 1
+    pending = [start, 0] if requires else []  # Flat scene, held pairs still to visit
+    while pending:
+        held = pending.pop()
+        node = pending.pop()
+        if not held:
+            if reached[node]:
+                continue
+            reached[node] = 1
+        elif held not in held_scenes:
+            held_scenes[held] = set()
+        elif node in held_scenes[held]:
+            continue
+        if held:
+            held_scenes[held].add(node)
+            holding.add(node)
+        first = offsets[node]
+        for edge, target in enumerate(targets[first:offsets[node + 1]], first):
+            if target == start or edge in requires and requires[edge] & ~held:
+                continue
+            pending.append(target)
+            pending.append(held_after(edge, held) & need[component[target]])
+
+    def held_states(node):
+        """Nonzero held bitsets a run can reach node with"""
+        if node not in holding:
+            return []
+        return [held for held, scenes in held_scenes.items() if node in scenes]
+
+    value = [0] * len(graph)        # Best score from each scene holding nothing
+    held_value = {}                 # held -> {scene: best score from there}
+
+    def edge_value(edge, target, held):
+        """Score through an edge when it is taken holding held (not locked)"""
+        score = points[edge]
+        if target != start:
+            held = held_after(edge, held) & need[component[target]]
+            score += held_value[held][target] if held else value[target]
+        return score
+
+    for c in range(count):
+        group = order[bounds[c]:bounds[c + 1]]
+        if not need[c]:
+            # Nothing locked here or downstream: every scene in the group can
+            # reach every other, so they share one value
+            if not reached[group[0]]:
+                continue  # Only behind choices that never open
+            best = 0
+            losing = False
+            for node in group:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if target == start:
+                        score = points[edge]
+                    elif component[target] == c:
+                        if points[edge] > 0:
+                            return None, (graph.ids[node], graph.ids[target])
+                        if points[edge] < 0 and target != node:
+                            losing = True
+                        continue
+                    else:
+                        score = points[edge] + value[target]
+                    if score > best:
+                        best = score
+            if not losing:
+                for node in group:
+                    value[node] = best
+                continue
+
+            # Moving around the loop costs points, so each scene has its own value
+            local = {node: i for i, node in enumerate(group)}
+            exits = []
+            inside = []
+            for i, node in enumerate(group):
+                best = 0
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if target != start and component[target] == c:
+                        inside.append((i, points[edge], local[target]))
+                        continue
+                    score = points[edge] + (value[target] if target != start else 0)
+                    if score > best:
+                        best = score
+                exits.append(best)
+            for node, best in zip(group, settle_loop(exits, inside)):
+                value[node] = best
+            continue
+
+        if len(group) == 1:
+            node = group[0]
+            first, last = offsets[node], offsets[node + 1]
+            if node == start or node not in targets[first:last]:
+                # A single scene without a self-loop: each held state only
+                # depends on scenes further on
+                for held in ([0] if reached[node] else []) + held_states(node):
+                    best = 0
+                    for edge, target in enumerate(targets[first:last], first):
+                        if edge in requires and requires[edge] & ~held:
+                            continue  # Locked
+                        score = points[edge]
+                        if target != start:
+                            new_held = held
+                            if edge in grants:
+                                new_held |= grants[edge]
+                            if edge in removes:
+                                new_held &= ~removes[edge]
+                            new_held &= need[component[target]]
+                            score += held_value[new_held][target] if new_held else value[target]
+                        if score > best:
+                            best = score
+                    if held:
+                        held_value.setdefault(held, {})[node] = best
+                    else:
+                        value[node] = best
+                continue
+
+        # Items matter here: solve the (scene, held) states of this group
+        states = [(node, 0) for node in group if reached[node]]
+        states += [(node, held) for node in group for held in held_states(node)]
+        local = {state: i for i, state in enumerate(states)}
+        local_offsets = array("i", [0])
+        local_targets = array("i")
+        exits = []     # Per state: best score through a choice that leaves the group
+        internal = []  # Per state: [(edge, local target state)] within the group
+        for node, held in states:
+            best_exit = 0
+            inside = []
+            first = offsets[node]
+            for edge, target in enumerate(targets[first:offsets[node + 1]], first):
+                if edge in requires and requires[edge] & ~held:
+                    continue  # Locked
+                if target != start and component[target] == c:
+                    new_held = held_after(edge, held) & need[c]
+                    inside.append((edge, local[(target, new_held)]))
+                    local_targets.append(local[(target, new_held)])
+                else:
+                    score = edge_value(edge, target, held)
+                    if score > best_exit:
+                        best_exit = score
+            local_offsets.append(len(local_targets))
+            exits.append(best_exit)
+            internal.append(inside)
+
+        local_component, local_order, local_bounds = strongly_connected_components(
+            len(states), local_offsets, local_targets)
+        for i, inside in enumerate(internal):
+            for edge, j in inside:
+                if points[edge] > 0 and local_component[i] == local_component[j]:
+                    return None, (graph.ids[states[i][0]], graph.ids[states[j][0]])
+
+        # Local components also come out sink-first
+        state_best = [0] * len(states)
+        for lc in range(len(local_bounds) - 1):
+            group_states = local_order[local_bounds[lc]:local_bounds[lc + 1]]
+            group_exits = []
+            inside = []
+            for i in group_states:
+                best = exits[i]
+                for edge, j in internal[i]:
+                    if local_component[j] != lc:
+                        score = points[edge] + state_best[j]
+                        if score > best:
+                            best = score
+                    elif j != i:
+                        inside.append((i, points[edge], j))
+                group_exits.append(best)
+            if any(lost < 0 for _, lost, _ in inside):
+                # Local positions, for settle_loop
+                position = {i: k for k, i in enumerate(group_states)}
+                inside = [(position[i], lost, position[j]) for i, lost, j in inside]
+                group_best = settle_loop(group_exits, inside)
+            else:
+                group_best = [max(group_exits)] * len(group_states)
+            for i, best in zip(group_states, group_best):
+                state_best[i] = best
+        for i, (node, held) in enumerate(states):
+            if held:
+                held_value.setdefault(held, {})[node] = state_best[i]
+            else:
+                value[node] = state_best[i]
+
+    return value[start], None
+
+
+def settle_loop(exits, inside):
+    """Best score from each scene of a loop whose choices never gain points
+
+    exits[i] is the best score scene i can get by leaving the loop and
+    inside holds the loop's own choices as (i, points, j) with points <= 0.
+    As in Dijkstra's algorithm, scenes are settled from the highest score
+    down, so each is final when it comes off the heap.
+    """
+    into = [[] for _ in exits]
+    for i, lost, j in inside:
+        into[j].append((i, lost))
+    best = list(exits)
+    heap = [(-score, i) for i, score in enumerate(best)]
+    heapq.heapify(heap)
+    settled = bytearray(len(best))
+    while heap:
+        score, j = heapq.heappop(heap)
+        if settled[j]:
+            continue
+        settled[j] = 1
+        for i, lost in into[j]:
+            if not settled[i] and lost - score > best[i]:
+                best[i] = lost - score
+                heapq.heappush(heap, (-best[i], i))
+    return best
+
+
+def analyze(story):
+    """Run every check and return a JSON-friendly report"""
+    graph = StoryGraph(story)
+    components = restart_free_components(graph)
+    component = components[0]
+    scene_ids = graph.ids
+
+    dangling = [{"scene": scene_ids[scene_index], "choice": choice_number + 1, "target": target_id}
+                for scene_index, links in sorted(story.dangling.items())
+                for choice_number, target_id in links]
+    unreachable = [scene_ids[i] for i, c in enumerate(component) if c < 0]
+    cycles = find_cycles(graph, components)
+    endings = find_endings(graph, components, story.dangling)
+    score, loop = max_score(graph, components)
+
+    return {
+        "scenes": len(story),
+        "start": scene_ids[story.start],
+        "reachable": len(story) - len(unreachable),
+        "dangling_links": dangling,
+        "unreachable_scenes": unreachable,
+        "cycles": [[scene_ids[i] for i in group] for group in cycles],
+        "endings": [scene_ids[i] for i in endings],
+        "max_score": score,
+        "score_loop": list(loop) if loop else None
+    }
+
+
+def print_report(report, limit):
+    def sample(items):
+        shown = ", ".join(str(item) for item in items[:limit])
+        return shown + (f", ... ({len(items) - limit} more)" if len(items) > limit else "")
+
+    print(f"Scenes: {report['scenes']} ({report['reachable']} reachable from '{report['start']}')")
+
+    links = [f"{d['scene']}#{d['choice']} -> {d['target']}" for d in report["dangling_links"]]
+    print(f"Dangling links: {len(links)}")
+    if links:
+        print(f"    {sample(links)}")
+
+    print(f"Unreachable scenes: {len(report['unreachable_scenes'])}")
+    if report["unreachable_scenes"]:
+        print(f"    {sample(report['unreachable_scenes'])}")
+
+    print(f"Cycles (not counting restarts): {len(report['cycles'])}")
+    for group in report["cycles"][:limit]:
+        print(f"    {sample(group)}")
+
+    print(f"Endings: {len(report['endings'])}")
+    if report["endings"]:
+        print(f"    {sample(report['endings'])}")
+
+    if report["max_score"] is None:
+        source, target = report["score_loop"]
+        print(f"Max score: unbounded (points for {source} -> {target} can be collected in a loop)")
+    else:
+        print(f"Max score: {report['max_score']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check an AI Dungeon Quest story for structural problems")
+    parser.add_argument("story", nargs="?", default=DEFAULT_STORY,
+                        help="story JSON file or compiled story directory")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    parser.add_argument("--limit", type=int, default=10, help="examples to list per finding")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        story = load_story(args.story, warn=False)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not load story: {e}")
+        sys.exit(2)
+    loaded = time.perf_counter()
+    report = analyze(story)
+    finished = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.limit)
+        print(f"Loaded in {(loaded - start) * 1000:.0f} ms, analyzed in {(finished - loaded) * 1000:.0f} ms")
+
+    if report["dangling_links"] or report["unreachable_scenes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Story Generator - Pluggable scene generation for AI Dungeon Quest
+A generator turns a missing choice target into a scene. ScenePrefetcher
+runs generation on worker threads as soon as a scene is shown, so picking
+a choice never waits on the generator.
+"""
+
+import abc
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from stats import percentile
+
+
+class StoryGenerator(abc.ABC):
+    """Interface for scene generators
+
+    generate() may be slow (a model call, a network request); it always
+    runs on a worker thread and must not touch pygame. A subclass that
+    does not implement it cannot be instantiated.
+    """
+
+    @abc.abstractmethod
+    def generate(self, scene_id, parent_text, choice_label):
+        """Return {"text": str, "choices": [{"text": str, "target": scene id}]}"""
+
+
+class TemplateGenerator(StoryGenerator):
+    """Local generator that fills sentence templates
+
+    Output depends only on the seed and scene id, so a generated story is
+    the same every time it is played.
+    """
+
+    PLACES = ["a collapsed observatory", "a flooded server vault", "a garden of glass trees",
+              "a silent train platform", "a cavern lit by fungus", "a library of humming crystals",
+              "a rusted drone hangar", "a bridge over a bottomless rift"]
+    DETAILS = ["Faint music echoes from somewhere below.", "The air smells of ozone and rain.",
+               "Footprints in the dust lead further in.", "A broken robot twitches in the corner.",
+               "Symbols on the wall pulse when you come close.", "Something large shifts in the dark."]
+    ACTIONS = ["Follow the footprints", "Climb toward the light", "Search the debris",
+               "Call out into the darkness", "Touch the glowing symbols", "Go back the way you came",
+               "Repair the broken machine", "Listen at the sealed door"]
+
+    def __init__(self, seed=0, start_id="start", restart_chance=0.1):
+        self.seed = seed
+        self.start_id = start_id
+        self.restart_chance = restart_chance
+
+    def generate(self, scene_id, parent_text, choice_label):
+        rng = random.Random(f"{self.seed}:{scene_id}")
+        action = choice_label[0].lower() + choice_label[1:] if choice_label else "press on"
+        text = (f"You {action.rstrip('.')} and find yourself in {rng.choice(self.PLACES)}. "
+                f"{rng.choice(self.DETAILS)} {rng.choice(self.DETAILS)}")
+
+        if rng.random() < self.restart_chance:
+            choices = [{"text": "Wake up in the clearing", "target": self.start_id}]
+        else:
+            choices = [{"text": label, "target": f"{scene_id}/{i + 1}"}
+                       for i, label in enumerate(rng.sample(self.ACTIONS, 3))]
+        return {"text": text, "choices": choices}
+
+
+class ScenePrefetcher:
+    """Generates scenes in the background and hands out the finished ones"""
+
+    def __init__(self, generator, workers=2):
+        self.generator = generator
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="story-gen")
+        self.futures = {}
+        self.failed = set()  # Scene ids whose generation raised; never retried
+        self.lock = threading.Lock()  # Guards latencies, written by workers
+        self.latencies = []
+        self.requests = 0
+        self.hits = 0
+        self.failures = 0
+
+    def timed_generate(self, scene_id, parent_text, choice_label):
+        start = time.perf_counter()
+        try:
+            return self.generator.generate(scene_id, parent_text, choice_label)
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - start)
+
+    def prefetch(self, scene_id, parent_text, choice_label):
+        """Start generating a scene unless it is already queued, done or failed"""
+        if scene_id not in self.futures and scene_id not in self.failed:
+            self.futures[scene_id] = self.executor.submit(
+                self.timed_generate, scene_id, parent_text, choice_label)
+
+    def take(self, scene_id, parent_text="", choice_label="", count=True):
+        """Return the generated scene data if ready, else None (and queue it)
+
+        Also returns None once generation has failed for scene_id; check
+        has_failed() to tell that apart from "not ready yet". Pass
+        count=False when polling for a scene that already missed, so the
+        hit rate only reflects choices made.
+        """
+        if count:
+            self.requests += 1
+        if scene_id in self.failed:
+            return None
+        future = self.futures.get(scene_id)
+        if future is None:
+            self.prefetch(scene_id, parent_text, choice_label)
+            return None
+        if not future.done():
+            return None
+
+        del self.futures[scene_id]
+        try:
+            data = future.result()
+        except Exception as e:
+            print(f"Scene generation failed for {scene_id}: {e}")
+            self.failures += 1
+            self.failed.add(scene_id)
+            return None
+        if count:
+            self.hits += 1
+        return data
+
+    def has_failed(self, scene_id):
+        return scene_id in self.failed
+
+    def metrics(self):
+        """Prefetch hit rate and generation latency"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.requests if self.requests else 0.0,
+            "generated": len(latencies),
+            "failures": self.failures,
+            "mean_latency_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "p95_latency_ms": percentile(latencies, 95, 0.0) * 1000,
+            "max_latency_ms": latencies[-1] * 1000 if latencies else 0.0
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,61 @@
+from dungeon_story import Story, compile_scenes
+from story_analyzer import analyze
+
+
+def make_story(scenes):
+    title, start, compiled, dangling = compile_scenes({"start": "start", "scenes": scenes}, warn=False)
+    story = Story(title, start, len(compiled), len(compiled), dangling=dangling)
+    story.chunks[0] = compiled
+    return story
+
+
+def choice(target, **rule):
+    return dict({"text": target, "target": target}, **rule)
+
+
+def test_locked_positive_loop_is_not_unbounded():
+    # The loop scores forever, but its door needs a key nobody hands out
+    story = make_story({
+        "start": {"text": "", "choices": [choice("hall", effects={"score": 5}),
+                                          choice("vault", requires={"items": ["Key"]})]},
+        "hall": {"text": "", "choices": [choice("start")]},
+        "vault": {"text": "", "choices": [choice("treasure", effects={"score": 10})]},
+        "treasure": {"text": "", "choices": [choice("vault", effects={"score": 10})]},
+    })
+    report = analyze(story)
+    assert report["max_score"] == 5
+    assert report["score_loop"] is None
+
+
+def test_unlocked_positive_loop_is_unbounded():
+    story = make_story({
+        "start": {"text": "", "choices": [choice("shed", effects={"add_items": ["Key"]})]},
+        "shed": {"text": "", "choices": [choice("vault", requires={"items": ["Key"]})]},
+        "vault": {"text": "", "choices": [choice("treasure", effects={"score": 10})]},
+        "treasure": {"text": "", "choices": [choice("vault")]},
+    })
+    report = analyze(story)
+    assert report["max_score"] is None
+    assert report["score_loop"] == ["vault", "treasure"]
+
+
+def test_points_lost_inside_a_loop_count():
+    # Reaching the exit from "pit" costs 2 of the 3 points it pays
+    story = make_story({
+        "start": {"text": "", "choices": [choice("pit")]},
+        "ledge": {"text": "", "choices": [choice("start", effects={"score": 3}), choice("pit")]},
+        "pit": {"text": "", "choices": [choice("ledge", effects={"score": -2})]},
+    })
+    assert analyze(story)["max_score"] == 1
+
+
+def test_removed_items_no_longer_unlock():
+    # The key is used up before the door that needs it
+    story = make_story({
+        "start": {"text": "", "choices": [choice("gate", effects={"add_items": ["Key"]})]},
+        "gate": {"text": "", "choices": [choice("hall", effects={"remove_items": ["Key"]})]},
+        "hall": {"text": "", "choices": [choice("vault", requires={"items": ["Key"]},
+                                                effects={"score": 100})]},
+        "vault": {"text": "", "choices": []},
+    })
+    assert analyze(story)["max_score"] == 0
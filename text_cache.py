@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Text Cache - Shared LRU cache of rendered text surfaces
+Static strings are rasterized once; only text that changes gets re-rendered
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """Bounded LRU cache of font.render() results
+
+    Surfaces are shared between callers, so they must be treated as
+    read-only: copy a surface before changing its alpha or pixels.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Return the rendered surface for text, rendering it on a miss"""
+        key = (font, text, antialias, color)
+        surface = self.entries.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict least recently used
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries
+        }
+
+
+# Shared by every game so identical strings are only rasterized once
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Render text through the shared cache"""
+    return text_cache.render(font, text, antialias, color)
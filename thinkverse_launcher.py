@@ -9,8 +9,13 @@ import sys
 import subprocess
 import os
 import math
+import argparse
+import importlib
 from pathlib import Path
 
+from warm_launch import WarmLauncher
+from text_cache import render_text
+
 # Initialize Pygame
 pygame.init()
 
@@ -31,7 +36,7 @@ PURPLE = (155, 89, 182)
 ORANGE = (230, 126, 34)
 
 class GameLauncher:
-    def __init__(self):
+    def __init__(self, warm_launch=False, host_mode=False):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("ThinkVerse - Game Launcher")
         self.clock = pygame.time.Clock()
@@ -43,11 +48,18 @@ class GameLauncher:
         self.font_small = pygame.font.Font(None, 22)
         self.font_tiny = pygame.font.Font(None, 18)
         
+        # The title glow is translucent, so it gets its own surface instead
+        # of a shared one from the text cache
+        self.title_glow = self.font_title.render("ThinkVerse", True, LIGHT_BLUE)
+        self.title_glow.set_alpha(30)
+        
         # Game list with their corresponding script files and colors
         self.games = [
             {
                 "name": "Code Breaker", 
                 "file": "code_breaker.py", 
+                "module": "code_breaker",
+                "class": "CodeBreaker",
                 "desc": "Logic puzzle - guess the secret code with hints",
                 "category": "Puzzle",
                 "color": BLUE
@@ -55,6 +67,8 @@ class GameLauncher:
             {
                 "name": "AI Dungeon Quest", 
                 "file": "ai_dungeon_quest.py", 
+                "module": "ai_dungeon_quest",
+                "class": "AIDungeonQuest",
                 "desc": "Text adventure with branching story choices",
                 "category": "Adventure",
                 "color": PURPLE
@@ -62,6 +76,8 @@ class GameLauncher:
             {
                 "name": "Memory Matrix", 
                 "file": "memory_matrix.py", 
+                "module": "memory_matrix",
+                "class": "MemoryMatrix",
                 "desc": "Remember and recall number patterns",
                 "category": "Memory",
                 "color": GREEN
@@ -69,6 +85,8 @@ class GameLauncher:
             {
                 "name": "Mystery Sound", 
                 "file": "mystery_sound.py", 
+                "module": "mystery_sound",
+                "class": "MysterySound",
                 "desc": "Guess objects from visual sound clues",
                 "category": "Audio",
                 "color": ORANGE
@@ -76,6 +94,8 @@ class GameLauncher:
             {
                 "name": "Escape 404", 
                 "file": "escape_404.py", 
+                "module": "escape_404",
+                "class": "Escape404",
                 "desc": "Digital escape room with coding puzzles",
                 "category": "Puzzle",
                 "color": RED
@@ -83,6 +103,8 @@ class GameLauncher:
             {
                 "name": "Quantum Dice", 
                 "file": "quantum_dice.py", 
+                "module": "quantum_dice",
+                "class": "QuantumDice",
                 "desc": "Strategic dice with probability choices",
                 "category": "Strategy",
                 "color": DARK_BLUE
@@ -90,6 +112,8 @@ class GameLauncher:
             {
                 "name": "Quiz Master", 
                 "file": "quiz_master.py", 
+                "module": "quiz_master",
+                "class": "QuizMaster",
                 "desc": "Test your knowledge with trivia questions",
                 "category": "Trivia",
                 "color": PURPLE
@@ -97,6 +121,8 @@ class GameLauncher:
             {
                 "name": "Snake Classic", 
                 "file": "snake_classic.py", 
+                "module": "snake_classic",
+                "class": "SnakeClassic",
                 "desc": "Classic snake game with modern twists",
                 "category": "Arcade",
                 "color": GREEN
@@ -112,16 +138,52 @@ class GameLauncher:
         for i in range(len(self.games)):
             self.hover_animation[i] = 0
         
-    def draw_background(self):
-        """Draw animated background"""
-        # Gradient background
-        for y in range(SCREEN_HEIGHT):
-            ratio = y / SCREEN_HEIGHT
+        # Background layers: gradient baked once, particle sprites pooled by size
+        self.background = None
+        self.particle_sprites = {}
+        
+        # Optional fork-server that keeps pygame warm between launches
+        self.warm_launcher = None
+        if warm_launch:
+            self.warm_launcher = WarmLauncher()
+            if not self.warm_launcher.start():
+                print("Warm launch unavailable, falling back to normal launches")
+                self.warm_launcher = None
+        
+        # In host mode games run as scenes inside this window and interpreter
+        self.host_mode = host_mode
+        self.scenes = {}  # game index -> game instance, created on first launch
+        self.active_scene = None
+        
+    def build_background(self, size):
+        """Bake the vertical gradient into a surface of the given size"""
+        width, height = size
+        background = pygame.Surface((width, height))
+        for y in range(height):
+            ratio = y / height
             r = int(44 + (52 - 44) * ratio)
             g = int(62 + (73 - 62) * ratio)
             b = int(80 + (94 - 80) * ratio)
             color = (r, g, b)
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
+            pygame.draw.line(background, color, (0, y), (width, y))
+        return background
+    
+    def get_particle_sprite(self, side):
+        """Return the pooled particle sprite for a given side length"""
+        sprite = self.particle_sprites.get(side)
+        if sprite is None:
+            sprite = pygame.Surface((side, side))
+            sprite.fill(LIGHT_BLUE)
+            self.particle_sprites[side] = sprite
+        return sprite
+    
+    def draw_background(self):
+        """Draw animated background"""
+        # Gradient background, rebuilt only when the window size changes
+        screen_size = self.screen.get_size()
+        if self.background is None or self.background.get_size() != screen_size:
+            self.background = self.build_background(screen_size)
+        self.screen.blit(self.background, (0, 0))
         
         # Animated particles
         for i in range(20):
@@ -130,10 +192,9 @@ class GameLauncher:
             size = 2 + math.sin(self.animation_time * 0.02 + i) * 1
             alpha = int(100 + math.sin(self.animation_time * 0.015 + i) * 50)
             
-            # Create surface for alpha blending
-            particle_surf = pygame.Surface((size * 2, size * 2))
+            # Sprites are shared per size, so set alpha right before blitting
+            particle_surf = self.get_particle_sprite(int(size * 2))
             particle_surf.set_alpha(alpha)
-            particle_surf.fill(LIGHT_BLUE)
             self.screen.blit(particle_surf, (x, y))
     
     def draw_header(self):
@@ -143,19 +204,17 @@ class GameLauncher:
         
         # Glow effect
         for offset in range(3, 0, -1):
-            glow_surface = self.font_title.render(title_text, True, LIGHT_BLUE)
-            glow_rect = glow_surface.get_rect(center=(SCREEN_WIDTH//2 + offset, 80 + offset))
-            glow_surface.set_alpha(30)
-            self.screen.blit(glow_surface, glow_rect)
+            glow_rect = self.title_glow.get_rect(center=(SCREEN_WIDTH//2 + offset, 80 + offset))
+            self.screen.blit(self.title_glow, glow_rect)
         
         # Main title
-        title_surface = self.font_title.render(title_text, True, WHITE)
+        title_surface = render_text(self.font_title, title_text, True, WHITE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 80))
         self.screen.blit(title_surface, title_rect)
         
         # Subtitle
         subtitle_text = "Game Collection"
-        subtitle_surface = self.font_medium.render(subtitle_text, True, LIGHT_GRAY)
+        subtitle_surface = render_text(self.font_medium, subtitle_text, True, LIGHT_GRAY)
         subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH//2, 120))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
@@ -276,13 +335,13 @@ class GameLauncher:
         
         # Game name
         name_color = WHITE if index == self.selected_game else BLACK
-        name_surface = self.font_medium.render(game["name"], True, name_color)
+        name_surface = render_text(self.font_medium, game["name"], True, name_color)
         name_rect = name_surface.get_rect(center=(x + width//2, card_y + 80))
         self.screen.blit(name_surface, name_rect)
         
         # Game category
         category_color = LIGHT_GRAY if index == self.selected_game else GRAY
-        category_surface = self.font_small.render(game["category"], True, category_color)
+        category_surface = render_text(self.font_small, game["category"], True, category_color)
         category_rect = category_surface.get_rect(center=(x + width//2, card_y + 105))
         self.screen.blit(category_surface, category_rect)
         
@@ -290,13 +349,13 @@ class GameLauncher:
         desc_lines = self.wrap_text(game["desc"], width - 20, self.font_tiny)
         desc_color = LIGHT_GRAY if index == self.selected_game else DARK_GRAY
         for i, line in enumerate(desc_lines[:2]):  # Max 2 lines
-            desc_surface = self.font_tiny.render(line, True, desc_color)
+            desc_surface = render_text(self.font_tiny, line, True, desc_color)
             desc_rect = desc_surface.get_rect(center=(x + width//2, card_y + 130 + i * 16))
             self.screen.blit(desc_surface, desc_rect)
         
         # Game number
         number_text = str(index + 1)
-        number_surface = self.font_small.render(number_text, True, WHITE if index == self.selected_game else game["color"])
+        number_surface = render_text(self.font_small, number_text, True, WHITE if index == self.selected_game else game["color"])
         number_rect = pygame.Rect(x + width - 25, card_y + 5, 20, 20)
         pygame.draw.circle(self.screen, game["color"] if index == self.selected_game else LIGHT_GRAY, 
                           (x + width - 15, card_y + 15), 12)
@@ -365,7 +424,7 @@ class GameLauncher:
             color = WHITE if i == 0 else LIGHT_GRAY
             font = self.font_small if i == 0 else self.font_tiny
             
-            instruction_surface = font.render(instruction, True, color)
+            instruction_surface = render_text(font, instruction, True, color)
             instruction_rect = instruction_surface.get_rect(center=(SCREEN_WIDTH//2, footer_y + 25 + i * 25))
             self.screen.blit(instruction_surface, instruction_rect)
     
@@ -392,17 +451,17 @@ class GameLauncher:
                         (panel_x, panel_y, panel_width, panel_height), 2)
         
         # Selected game title
-        title_surface = self.font_medium.render("Selected Game", True, WHITE)
+        title_surface = render_text(self.font_medium, "Selected Game", True, WHITE)
         self.screen.blit(title_surface, (panel_x + 10, panel_y + 10))
         
         # Game name
-        name_surface = self.font_large.render(selected_game["name"], True, selected_game["color"])
+        name_surface = render_text(self.font_large, selected_game["name"], True, selected_game["color"])
         self.screen.blit(name_surface, (panel_x + 10, panel_y + 35))
         
         # Full description
         desc_lines = self.wrap_text(selected_game["desc"], panel_width - 20, self.font_small)
         for i, line in enumerate(desc_lines[:3]):  # Max 3 lines
-            desc_surface = self.font_small.render(line, True, LIGHT_GRAY)
+            desc_surface = render_text(self.font_small, line, True, LIGHT_GRAY)
             self.screen.blit(desc_surface, (panel_x + 10, panel_y + 70 + i * 18))
     
     def draw_menu(self):
@@ -441,14 +500,69 @@ class GameLauncher:
                         self.selected_game = game_num
                         self.launch_game()
     
+    def enter_scene(self, index):
+        """Start or resume a game as a scene in the launcher window"""
+        game = self.games[index]
+        scene = self.scenes.get(index)
+        
+        if scene is None:
+            try:
+                # Import lazily so only games that are actually played get loaded
+                module = importlib.import_module(game["module"])
+                game_size = (module.SCREEN_WIDTH, module.SCREEN_HEIGHT)
+                surface = self.screen.subsurface(pygame.Rect((0, 0), game_size))
+                scene = getattr(module, game["class"])(screen=surface, clock=self.clock)
+            except Exception as e:
+                print(f"Error loading game: {e}")
+                pygame.display.set_caption("ThinkVerse - Game Launcher")
+                return
+            self.scenes[index] = scene
+        
+        self.screen.fill(BLACK)
+        pygame.display.set_caption(game["name"])
+        self.active_scene = scene
+        print(f"Entered: {game['name']}")
+    
+    def leave_scene(self):
+        """Return from the active scene to the launcher menu"""
+        self.active_scene = None
+        pygame.display.set_caption("ThinkVerse - Game Launcher")
+    
+    def update_scene(self):
+        """Drive one frame of the active scene"""
+        scene = self.active_scene
+        
+        # Closing the window quits the launcher, not just the game
+        if pygame.event.peek(pygame.QUIT):
+            self.running = False
+            return
+        
+        # Games return False on ESC, which leaves the scene
+        if not scene.handle_events():
+            self.leave_scene()
+            return
+        
+        if hasattr(scene, "update"):
+            scene.update()
+        
+        if hasattr(scene, "draw"):
+            scene.draw()
+        else:
+            scene.draw_game()
+    
     def launch_game(self):
+        if self.host_mode:
+            self.enter_scene(self.selected_game)
+            return
+        
         game_file = self.games[self.selected_game]['file']
         game_path = Path(__file__).parent / game_file
         
         if game_path.exists():
             try:
-                # Launch the game as a separate process
-                subprocess.Popen([sys.executable, str(game_path)])
+                # Prefer the warm fork-server, otherwise start a fresh interpreter
+                if not (self.warm_launcher and self.warm_launcher.launch(game_path)):
+                    subprocess.Popen([sys.executable, str(game_path)])
                 print(f"Launched: {self.games[self.selected_game]['name']}")
             except Exception as e:
                 print(f"Error launching game: {e}")
@@ -458,13 +572,29 @@ class GameLauncher:
     def run(self):
         while self.running:
             self.animation_time += 1
-            self.handle_events()
-            self.draw_menu()
+            if self.active_scene is not None:
+                self.update_scene()
+            else:
+                self.handle_events()
+                self.draw_menu()
             self.clock.tick(60)
         
+        # Hosted games never reach their own run() cleanup
+        for scene in self.scenes.values():
+            if hasattr(scene, "close"):
+                scene.close()
+        if self.warm_launcher:
+            self.warm_launcher.stop()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    launcher = GameLauncher()
+    parser = argparse.ArgumentParser(description="ThinkVerse Game Launcher")
+    parser.add_argument("--warm", action="store_true",
+                        help="launch games from a pre-forked helper process")
+    parser.add_argument("--host", action="store_true",
+                        help="run games as scenes inside the launcher window")
+    args = parser.parse_args()
+    
+    launcher = GameLauncher(warm_launch=args.warm, host_mode=args.host)
     launcher.run()
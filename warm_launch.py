@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Warm Launch - Pre-forked helper process for near-instant game launches
+The helper keeps Python and pygame imported and forks a child per launch
+"""
+
+import os
+import sys
+import time
+import runpy
+import signal
+import subprocess
+import threading
+
+# Modules the games import, loaded once in the helper so children skip them
+PRELOAD_MODULES = ["pygame", "random", "math", "time", "textwrap"]
+
+
+class WarmLauncher:
+    """Launcher-side handle for the fork-server helper process"""
+
+    def __init__(self):
+        self.process = None
+        self.report_fd = None
+        self.next_request = 0
+        self.pending = {}  # request id -> (game path, monotonic time it was requested)
+        self.latencies = []  # (game path, seconds to first frame)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_supported():
+        """Forking is only available on POSIX platforms"""
+        return hasattr(os, "fork")
+
+    def start(self):
+        """Spawn the helper and start listening for launch reports"""
+        if not self.is_supported():
+            return False
+
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), str(write_fd)],
+                stdin=subprocess.PIPE,
+                pass_fds=(write_fd,),
+                text=True
+            )
+        except Exception as e:
+            print(f"Error starting warm launcher: {e}")
+            os.close(read_fd)
+            return False
+        finally:
+            os.close(write_fd)
+
+        self.report_fd = read_fd
+        reader = threading.Thread(target=self.read_reports, daemon=True)
+        reader.start()
+        return True
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def launch(self, game_path):
+        """Ask the helper to fork a child running game_path"""
+        if not self.is_running():
+            return False
+
+        game_path = str(game_path)
+        # Each request gets its own id, so two quick launches of one game both report
+        with self.lock:
+            request_id = self.next_request
+            self.next_request += 1
+            self.pending[request_id] = (game_path, time.monotonic())
+        try:
+            self.process.stdin.write(f"{request_id} {game_path}\n")
+            self.process.stdin.flush()
+            return True
+        except Exception as e:
+            print(f"Error sending launch request: {e}")
+            with self.lock:
+                self.pending.pop(request_id, None)
+            return False
+
+    def read_reports(self):
+        """Log the time from launch request to each game's first frame"""
+        with os.fdopen(self.report_fd, "r") as reports:
+            for line in reports:
+                try:
+                    pid, first_frame_time, request_id, game_path = line.rstrip("\n").split(" ", 3)
+                    first_frame_time = float(first_frame_time)
+                    request_id = int(request_id)
+                except ValueError:
+                    continue
+
+                with self.lock:
+                    request = self.pending.pop(request_id, None)
+                if request is None:
+                    continue
+
+                game_path, requested = request
+                latency = first_frame_time - requested
+                self.latencies.append((game_path, latency))
+                print(f"Warm launch of {os.path.basename(game_path)} (pid {pid}): "
+                      f"first frame after {latency * 1000:.1f} ms")
+
+    def stop(self):
+        """Shut down the helper; running games are left alone"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+        self.process = None
+
+
+def report_first_frame(report_fd, request_id, game_path):
+    """Wrap pygame.display.flip so the first flip reports its timestamp"""
+    import pygame
+
+    original_flip = pygame.display.flip
+
+    def flip():
+        pygame.display.flip = original_flip
+        original_flip()
+        message = f"{os.getpid()} {time.monotonic()} {request_id} {game_path}\n"
+        try:
+            os.write(report_fd, message.encode())
+        except OSError:
+            pass
+
+    pygame.display.flip = flip
+
+
+def run_child(report_fd, request_id, game_path):
+    """Body of a forked child: run the game script as __main__"""
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.setsid()
+    sys.stdin.close()
+    sys.argv = [game_path]
+    sys.path[0] = os.path.dirname(game_path)
+
+    exit_code = 0
+    try:
+        report_first_frame(report_fd, request_id, game_path)
+        runpy.run_path(game_path, run_name="__main__")
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 0
+    except Exception as e:
+        print(f"Error running {game_path}: {e}")
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+def serve(report_fd):
+    """Helper main loop: fork one child per "request id, game path" line on stdin"""
+    for module_name in PRELOAD_MODULES:
+        __import__(module_name)
+
+    # Font loading is safe to do before forking; the display is not
+    import pygame
+    pygame.font.init()
+
+    # Let the kernel reap finished games
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    for line in sys.stdin:
+        request_id, _, game_path = line.strip().partition(" ")
+        if not game_path:
+            continue
+        if not os.path.exists(game_path):
+            print(f"Game file not found: {game_path}")
+            continue
+
+        try:
+            pid = os.fork()
+        except OSError as e:
+            print(f"Error forking game: {e}")
+            continue
+
+        if pid == 0:
+            run_child(report_fd, request_id, game_path)
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]))